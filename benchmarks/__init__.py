@@ -0,0 +1,5 @@
+"""Benchmarks for libtvdb.
+
+Run an individual benchmark with `python -m benchmarks.<name>` from the
+repository root.
+"""
@@ -0,0 +1,58 @@
+"""Measure how much compressed responses save against the local mock server.
+
+The client is run with and without content encoding negotiation, and the
+decoded and on-the-wire response sizes are reported from its metrics along
+with the time taken. On localhost the time mostly shows the cost of
+decompressing; the byte counts show what would be saved on a real network.
+
+    python -m benchmarks.bench_compression
+"""
+
+import argparse
+import time
+
+from benchmarks.mock_server import MockTVDBServer
+from libtvdb import MetricsRegistry, TVDBClient
+from libtvdb.compression import available_encodings
+
+SERIES_ID = 900001
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description="Compressed transfer benchmark")
+    parser.add_argument("--repeat", type=int, default=5)
+    arguments = parser.parse_args()
+
+    print(f"Decoders available: {', '.join(available_encodings())}")
+
+    with MockTVDBServer() as server:
+        for name, accept_encoding in (("identity", ()), ("negotiated", None)):
+            metrics = MetricsRegistry()
+            client = TVDBClient(
+                api_key="benchmark",
+                base_url=server.base_url,
+                metrics=metrics,
+                accept_encoding=accept_encoding,
+            )
+            client.authenticate()
+            metrics.reset()
+
+            started = time.perf_counter()
+            for _ in range(arguments.repeat):
+                client.show_info(SERIES_ID)
+                client.episodes_from_show_id(SERIES_ID)
+            elapsed = (time.perf_counter() - started) / arguments.repeat
+
+            snapshot = metrics.snapshot()
+            decoded = sum(snapshot["bytes_received"].values()) // arguments.repeat
+            wire = sum(snapshot["wire_bytes_received"].values()) // arguments.repeat
+
+            print(
+                f"  {name:<12} {elapsed * 1000:8.1f} ms  {decoded:9,d} bytes decoded  "
+                f"{wire:9,d} bytes on the wire  ({decoded / wire:.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Measure end-to-end client throughput against the local mock server.
+
+Each scenario runs the real client over HTTP against `MockTVDBServer` with
+a fixed simulated latency, so the results show how much the client's
+concurrency options help when the network is the bottleneck.
+
+    python -m benchmarks.bench_end_to_end
+    python -m benchmarks.bench_end_to_end --latency 0.05 --episodes 200
+"""
+
+import argparse
+import os
+import time
+from collections.abc import Callable
+from typing import Any
+
+from benchmarks.mock_server import Faults, MockTVDBServer
+from libtvdb import TVDBClient
+
+SERIES_ID = 900001
+
+
+def _scenarios(
+    client: TVDBClient, episode_count: int, show_count: int
+) -> dict[str, tuple[Callable[[], Any], int]]:
+    episode_ids = list(range(1, episode_count + 1))
+    show_ids = list(range(1, show_count + 1))
+    processes = os.cpu_count() or 1
+
+    return {
+        "show_info": (lambda: client.show_info(SERIES_ID), 1),
+        "episodes_from_show_id (1 worker)": (
+            lambda: client.episodes_from_show_id(SERIES_ID, max_workers=1),
+            1,
+        ),
+        "episodes_from_show_id (4 workers)": (
+            lambda: client.episodes_from_show_id(SERIES_ID, max_workers=4),
+            1,
+        ),
+        "episode_by_id (sequential)": (
+            lambda: [client.episode_by_id(identifier) for identifier in episode_ids],
+            episode_count,
+        ),
+        "episodes_by_id_many (8 workers)": (
+            lambda: list(client.episodes_by_id_many(episode_ids, max_workers=8)),
+            episode_count,
+        ),
+        "shows_by_id_many (8 workers)": (
+            lambda: list(client.shows_by_id_many(show_ids, max_workers=8, processes=0)),
+            show_count,
+        ),
+        f"shows_by_id_many ({processes} processes)": (
+            lambda: list(client.shows_by_id_many(show_ids, max_workers=8, processes=processes)),
+            show_count,
+        ),
+    }
+
+
+def main() -> None:
+    """Run every scenario and print the results."""
+    parser = argparse.ArgumentParser(description="End-to-end client benchmark")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds per request")
+    parser.add_argument("--episodes", type=int, default=50, help="Episodes to look up by ID")
+    parser.add_argument("--shows", type=int, default=40, help="Shows to look up by ID")
+    parser.add_argument("--repeat", type=int, default=3)
+    arguments = parser.parse_args()
+
+    with MockTVDBServer(faults=Faults(latency=arguments.latency)) as server:
+        client = TVDBClient(api_key="benchmark", base_url=server.base_url)
+        client.authenticate()
+
+        print(f"Mock server latency {arguments.latency * 1000:.0f} ms, best of {arguments.repeat}:")
+
+        for name, (function, calls) in _scenarios(
+            client, arguments.episodes, arguments.shows
+        ).items():
+            requests_before = server.request_count
+            best = float("inf")
+
+            for _ in range(arguments.repeat):
+                started = time.perf_counter()
+                function()
+                best = min(best, time.perf_counter() - started)
+
+            requests_per_run = (server.request_count - requests_before) // arguments.repeat
+            print(
+                f"  {name:<36} {best * 1000:9.1f} ms  {calls / best:8.1f} calls/s  "
+                f"{requests_per_run:4d} requests"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Measure how long importing libtvdb takes in a fresh interpreter.
+
+Each statement runs in a new Python process, and the time taken by the
+interpreter on its own is subtracted, so the numbers are the cost of the
+import as seen by a CLI tool or a serverless cold start.
+
+    python -m benchmarks.bench_import
+"""
+
+import statistics
+import subprocess
+import sys
+
+RUNS = 15
+
+STATEMENTS = {
+    "import libtvdb": "import libtvdb",
+    "from libtvdb import TVDBClient": "from libtvdb import TVDBClient",
+    "create a client": "import libtvdb; libtvdb.TVDBClient(api_key='key')",
+    "import libtvdb.model": "import libtvdb.model",
+    "import requests (reference)": "import requests",
+}
+
+
+def _time(statement: str) -> float:
+    script = (
+        "import time\n"
+        "started = time.perf_counter()\n"
+        f"{statement}\n"
+        "print(time.perf_counter() - started)\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], check=True, capture_output=True, text=True
+    ).stdout
+    return float(output)
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    print(f"Median of {RUNS} fresh interpreters:")
+
+    for name, statement in STATEMENTS.items():
+        median = statistics.median(_time(statement) for _ in range(RUNS))
+        print(f"  {name:<32} {median * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
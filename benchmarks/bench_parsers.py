@@ -0,0 +1,79 @@
+"""Benchmark the date parsers against the previous implementations.
+
+The workload mirrors deserializing a long running show's episode list: every
+episode has an `aired` date and a `lastUpdated` timestamp, and most of the
+timestamps come from a few bulk edits so they repeat across episodes.
+
+    python -m benchmarks.bench_parsers
+"""
+
+import datetime
+import random
+import timeit
+
+from libtvdb.model.parsers import date_parser, datetime_parser
+from libtvdb.utilities import DATETIME_FORMAT_STRING
+
+EPISODE_COUNT = 5000
+REPEAT = 5
+
+
+def _reference_parse_date(input_string: str) -> datetime.date:
+    """The split and int() based parser that parse_date used to be."""
+    components = input_string.split("-")
+    for component in components:
+        _ = int(component)
+    return datetime.date(year=int(components[0]), month=int(components[1]), day=int(components[2]))
+
+
+def _reference_parse_datetime(input_string: str) -> datetime.datetime:
+    """The strptime based parser that parse_datetime used to be."""
+    return datetime.datetime.strptime(input_string, DATETIME_FORMAT_STRING)
+
+
+def _workload() -> tuple[list[str], list[str]]:
+    generator = random.Random(1234)
+    first_aired = datetime.date(1963, 11, 23)
+    bulk_edits = [
+        datetime.datetime(2020, 1, 1) + datetime.timedelta(seconds=generator.randrange(10**8))
+        for _ in range(50)
+    ]
+
+    aired = [
+        (first_aired + datetime.timedelta(days=7 * index)).isoformat()
+        for index in range(EPISODE_COUNT)
+    ]
+    updated = [
+        generator.choice(bulk_edits).strftime(DATETIME_FORMAT_STRING) for _ in range(EPISODE_COUNT)
+    ]
+    return aired, updated
+
+
+def _best(function, values: list[str]) -> float:
+    return min(
+        timeit.repeat(lambda: [function(value) for value in values], number=1, repeat=REPEAT)
+    )
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    aired, updated = _workload()
+
+    rows = [
+        ("date (reference)", _best(_reference_parse_date, aired)),
+        ("date (date_parser)", _best(date_parser, aired)),
+        ("datetime (reference)", _best(_reference_parse_datetime, updated)),
+        ("datetime (datetime_parser)", _best(datetime_parser, updated)),
+    ]
+
+    print(f"Parsing {EPISODE_COUNT} episodes, best of {REPEAT}:")
+    for name, seconds in rows:
+        per_item = seconds / EPISODE_COUNT * 1e9
+        print(f"  {name:<28} {seconds * 1000:8.2f} ms  {per_item:8.0f} ns/episode")
+
+    print(f"  date speedup:     {rows[0][1] / rows[1][1]:.1f}x")
+    print(f"  datetime speedup: {rows[2][1] / rows[3][1]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
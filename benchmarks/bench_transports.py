@@ -0,0 +1,73 @@
+"""Compare the transports at different levels of concurrency.
+
+Each transport looks up the same episodes with `episodes_by_id_many`
+against the local mock server, and the throughput and number of
+connections the server saw are reported for each worker count. The
+HTTP/2 transport is included when httpx is installed.
+
+The mock server only speaks plain HTTP/1.1, so the HTTP/2 transport falls
+back to HTTP/1.1 here; the protocol each transport actually used is shown.
+
+    python -m benchmarks.bench_transports
+    python -m benchmarks.bench_transports --latency 0.05 --workers 1 8 32
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+
+from benchmarks.mock_server import Faults, MockTVDBServer
+from libtvdb import TVDBClient, http2
+from libtvdb.transport import RequestsTransport, Transport, Urllib3Transport
+
+
+def _transports(max_connections: int) -> dict[str, Callable[[], Transport]]:
+    transports: dict[str, Callable[[], Transport]] = {
+        "requests": RequestsTransport,
+        "urllib3": lambda: Urllib3Transport(max_connections=max_connections),
+    }
+
+    if http2.is_available():
+        transports["httpx"] = lambda: http2.HttpxTransport(max_connections=max_connections)
+
+    return transports
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description="Transport concurrency benchmark")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds per request")
+    parser.add_argument("--episodes", type=int, default=100, help="Episodes to look up")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16])
+    arguments = parser.parse_args()
+
+    episode_ids = list(range(1, arguments.episodes + 1))
+
+    print(f"Mock server latency {arguments.latency * 1000:.0f} ms, {arguments.episodes} episodes:")
+
+    for name, create in _transports(max(arguments.workers)).items():
+        for workers in arguments.workers:
+            with MockTVDBServer(faults=Faults(latency=arguments.latency)) as server:
+                transport = create()
+                client = TVDBClient(
+                    api_key="benchmark", base_url=server.base_url, transport=transport
+                )
+                client.authenticate()
+                connections_before = server.connection_count
+
+                started = time.perf_counter()
+                list(client.episodes_by_id_many(episode_ids, max_workers=workers))
+                elapsed = time.perf_counter() - started
+
+                connections = server.connection_count - connections_before
+                transport.close()
+
+            versions = getattr(transport, "http_versions", {"HTTP/1.1": 0})
+            print(
+                f"  {name:<9} {workers:3d} workers  {arguments.episodes / elapsed:8.1f} calls/s  "
+                f"{connections:3d} connections  {', '.join(versions)}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+"""Generate the anonymized payloads used by the benchmark suite.
+
+The payloads have the shape, field set and rough size distribution of real
+TVDB v4 responses for a long running show, but every name, overview, URL and
+ID is made up. The output is deterministic, so regenerating the fixtures
+doesn't change the benchmark inputs.
+
+    python -m benchmarks.generate_fixtures
+"""
+
+import datetime
+import json
+import pathlib
+import random
+
+FIXTURES = pathlib.Path(__file__).parent / "fixtures"
+
+SERIES_ID = 900001
+SEASON_COUNT = 12
+EPISODES_PER_SEASON = 24
+EPISODE_PAGE_SIZE = 100
+CHARACTER_COUNT = 80
+ARTWORK_COUNT = 60
+SEARCH_RESULT_COUNT = 50
+
+LANGUAGES = ["eng", "deu", "fra", "spa", "ita", "jpn", "por", "rus", "nld", "swe"]
+WORDS = [
+    "alpha",
+    "bravo",
+    "charlie",
+    "delta",
+    "echo",
+    "foxtrot",
+    "golf",
+    "hotel",
+    "india",
+    "juliet",
+    "kilo",
+    "lima",
+    "mike",
+    "november",
+    "oscar",
+    "papa",
+    "quebec",
+    "romeo",
+    "sierra",
+    "tango",
+    "uniform",
+    "victor",
+    "whiskey",
+    "xray",
+    "yankee",
+    "zulu",
+]
+
+
+def _words(generator: random.Random, minimum: int, maximum: int) -> str:
+    return " ".join(generator.choice(WORDS) for _ in range(generator.randint(minimum, maximum)))
+
+
+def _title(generator: random.Random) -> str:
+    return _words(generator, 1, 4).title()
+
+
+def _timestamp(generator: random.Random) -> str:
+    moment = datetime.datetime(2018, 1, 1) + datetime.timedelta(
+        seconds=generator.randrange(7 * 365 * 24 * 3600)
+    )
+    return moment.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _remote_ids(generator: random.Random) -> list[dict]:
+    return [
+        {"id": f"tt{generator.randrange(10**7):07d}", "type": 2, "sourceName": "IMDB"},
+        {"id": str(generator.randrange(10**6)), "type": 12, "sourceName": "TheMovieDB.com"},
+    ]
+
+
+def _company_type() -> dict:
+    return {"companyTypeId": 1, "companyTypeName": "Network"}
+
+
+def _company(generator: random.Random, identifier: int) -> dict:
+    name = _title(generator)
+    return {
+        "id": identifier,
+        "name": name,
+        "slug": name.lower().replace(" ", "-"),
+        "nameTranslations": generator.sample(LANGUAGES, 2),
+        "overviewTranslations": [],
+        "aliases": [],
+        "country": "gbr",
+        "primaryCompanyType": 1,
+        "activeDate": "1936-11-02",
+        "inactiveDate": None,
+        "companyType": _company_type(),
+        "parentCompany": {"id": None, "name": None, "relation": {"id": None, "typeName": None}},
+        "tagOptions": None,
+    }
+
+
+def _season_type() -> dict:
+    return {"id": 1, "name": "Aired Order", "type": "official", "alternateName": None}
+
+
+def _season(generator: random.Random, number: int) -> dict:
+    return {
+        "id": 700000 + number,
+        "seriesId": SERIES_ID,
+        "type": _season_type(),
+        "number": number,
+        "nameTranslations": generator.sample(LANGUAGES, 3),
+        "overviewTranslations": generator.sample(LANGUAGES, 2),
+        "image": f"https://artworks.example.com/banners/seasons/{700000 + number}.jpg",
+        "imageType": 7,
+        "companies": {"studio": None, "network": None, "production": None},
+        "lastUpdated": _timestamp(generator),
+    }
+
+
+def _character(generator: random.Random, identifier: int) -> dict:
+    return {
+        "id": identifier,
+        "name": _title(generator),
+        "peopleId": 300000 + identifier,
+        "seriesId": SERIES_ID,
+        "series": None,
+        "movie": None,
+        "movieId": None,
+        "episodeId": None,
+        "type": generator.choice([1, 3, 4]),
+        "image": f"https://artworks.example.com/banners/actors/{identifier}.jpg",
+        "sort": identifier % 10,
+        "isFeatured": generator.random() < 0.2,
+        "url": f"https://example.com/character/{identifier}",
+        "nameTranslations": None,
+        "overviewTranslations": None,
+        "aliases": None,
+        "peopleType": generator.choice(["Actor", "Guest Star", "Director", "Writer"]),
+        "personName": _title(generator),
+        "tagOptions": None,
+        "personImgURL": f"https://artworks.example.com/person/{300000 + identifier}.jpg",
+    }
+
+
+def _artwork(generator: random.Random, identifier: int) -> dict:
+    return {
+        "id": identifier,
+        "image": f"https://artworks.example.com/banners/{identifier}.jpg",
+        "thumbnail": f"https://artworks.example.com/banners/{identifier}_t.jpg",
+        "language": generator.choice(LANGUAGES + [None]),
+        "type": generator.choice([1, 2, 3, 5, 7]),
+        "score": generator.randrange(100000),
+        "width": 1920,
+        "height": 1080,
+        "includesText": generator.random() < 0.5,
+        "thumbnailWidth": 640,
+        "thumbnailHeight": 360,
+        "updatedAt": generator.randrange(1500000000, 1700000000),
+        "status": {"id": 1, "name": None},
+        "tagOptions": None,
+        "seriesId": SERIES_ID,
+        "peopleId": None,
+        "seasonId": None,
+        "episodeId": None,
+        "seriesPeopleId": None,
+        "networkId": None,
+        "movieId": None,
+    }
+
+
+def _episode(generator: random.Random, season_number: int, number: int) -> dict:
+    absolute_number = (season_number - 1) * EPISODES_PER_SEASON + number
+    aired = datetime.date(2005, 3, 26) + datetime.timedelta(days=7 * absolute_number)
+    return {
+        "id": 8000000 + absolute_number,
+        "seriesId": SERIES_ID,
+        "name": _title(generator),
+        "aired": aired.isoformat(),
+        "runtime": generator.choice([45, 50, 60]),
+        "nameTranslations": generator.sample(LANGUAGES, 4),
+        "overview": _words(generator, 20, 60).capitalize() + ".",
+        "overviewTranslations": generator.sample(LANGUAGES, 3),
+        "image": f"https://artworks.example.com/banners/episodes/{8000000 + absolute_number}.jpg",
+        "imageType": 11,
+        "isMovie": 0,
+        "seasons": None,
+        "number": number,
+        "absoluteNumber": absolute_number,
+        "seasonNumber": season_number,
+        "lastUpdated": _timestamp(generator),
+        "finaleType": "season" if number == EPISODES_PER_SEASON else None,
+        "airsBeforeSeason": None,
+        "airsBeforeEpisode": None,
+        "airsAfterSeason": None,
+        "year": str(aired.year),
+    }
+
+
+def _episodes(generator: random.Random) -> list[dict]:
+    return [
+        _episode(generator, season_number, number)
+        for season_number in range(1, SEASON_COUNT + 1)
+        for number in range(1, EPISODES_PER_SEASON + 1)
+    ]
+
+
+def _series_extended(generator: random.Random) -> dict:
+    network = _company(generator, 40)
+    return {
+        "id": SERIES_ID,
+        "name": "Example Series",
+        "slug": "example-series",
+        "image": f"https://artworks.example.com/banners/posters/{SERIES_ID}-1.jpg",
+        "nameTranslations": LANGUAGES,
+        "overviewTranslations": LANGUAGES,
+        "aliases": [{"language": language, "name": _title(generator)} for language in LANGUAGES],
+        "firstAired": "2005-03-26",
+        "lastAired": "2022-12-10",
+        "nextAired": "",
+        "score": 812345,
+        "status": {"id": 2, "name": "Ended", "recordType": "series", "keepUpdated": False},
+        "originalCountry": "gbr",
+        "originalLanguage": "eng",
+        "defaultSeasonType": 1,
+        "isOrderRandomized": False,
+        "lastUpdated": _timestamp(generator),
+        "averageRuntime": 50,
+        "episodes": None,
+        "overview": _words(generator, 60, 120).capitalize() + ".",
+        "year": "2005",
+        "artworks": [_artwork(generator, 60000000 + index) for index in range(ARTWORK_COUNT)],
+        "companies": [network] + [_company(generator, 100 + index) for index in range(4)],
+        "originalNetwork": network,
+        "latestNetwork": network,
+        "genres": [
+            {"id": 3, "name": "Adventure", "slug": "adventure"},
+            {"id": 4, "name": "Drama", "slug": "drama"},
+            {"id": 17, "name": "Science Fiction", "slug": "science-fiction"},
+        ],
+        "trailers": [
+            {
+                "id": 5000 + index,
+                "name": _title(generator),
+                "url": f"https://video.example.com/watch?v={index}",
+                "language": "eng",
+                "runtime": 120,
+            }
+            for index in range(3)
+        ],
+        "lists": [
+            {
+                "id": 9000 + index,
+                "name": _title(generator),
+                "overview": _words(generator, 5, 20),
+                "url": f"list-{index}",
+                "isOfficial": False,
+                "nameTranslations": ["eng"],
+                "overviewTranslations": ["eng"],
+                "aliases": [],
+                "score": 10,
+                "image": "",
+                "imageIsFallback": False,
+                "remoteIds": None,
+                "tags": None,
+            }
+            for index in range(5)
+        ],
+        "remoteIds": _remote_ids(generator),
+        "characters": [_character(generator, 50000 + index) for index in range(CHARACTER_COUNT)],
+        "airsDays": {
+            "sunday": False,
+            "monday": False,
+            "tuesday": False,
+            "wednesday": False,
+            "thursday": False,
+            "friday": False,
+            "saturday": True,
+        },
+        "airsTime": "19:00",
+        "seasons": [_season(generator, number) for number in range(SEASON_COUNT + 1)],
+        "tags": [
+            {
+                "id": 1000 + index,
+                "tag": 40,
+                "tagName": "Setting",
+                "name": _title(generator),
+                "helpText": None,
+            }
+            for index in range(10)
+        ],
+        "contentRatings": [
+            {
+                "id": 1,
+                "name": "PG",
+                "country": "gbr",
+                "description": None,
+                "contentType": "",
+                "order": 0,
+                "fullname": None,
+            }
+        ],
+        "seasonTypes": [_season_type()],
+    }
+
+
+def _search_result(generator: random.Random, index: int) -> dict:
+    name = f"Example Series {_title(generator)}"
+    return {
+        "objectID": f"series-{SERIES_ID + index}",
+        "aliases": [_title(generator) for _ in range(generator.randint(0, 3))],
+        "country": "gbr",
+        "id": f"series-{SERIES_ID + index}",
+        "image_url": f"https://artworks.example.com/banners/posters/{SERIES_ID + index}.jpg",
+        "name": name,
+        "first_air_time": f"{1960 + index}-01-01",
+        "overview": _words(generator, 20, 80).capitalize() + ".",
+        "primary_language": "eng",
+        "primary_type": "series",
+        "status": generator.choice(["Continuing", "Ended"]),
+        "type": "series",
+        "tvdb_id": str(SERIES_ID + index),
+        "year": str(1960 + index),
+        "slug": name.lower().replace(" ", "-"),
+        "overviews": {language: _words(generator, 20, 40) for language in LANGUAGES[:3]},
+        "translations": dict.fromkeys(LANGUAGES[:3], name),
+        "network": "Example Network",
+        "remote_ids": _remote_ids(generator),
+        "thumbnail": f"https://artworks.example.com/banners/posters/{SERIES_ID + index}_t.jpg",
+    }
+
+
+def _write(name: str, payload: dict) -> None:
+    path = FIXTURES / name
+    path.write_text(json.dumps(payload, separators=(",", ":")) + "\n", encoding="utf-8")
+    print(f"Wrote {path} ({path.stat().st_size} bytes)")
+
+
+def main() -> None:
+    """Write every fixture."""
+    generator = random.Random(4242)
+    FIXTURES.mkdir(exist_ok=True)
+
+    _write("series_extended.json", {"status": "success", "data": _series_extended(generator)})
+
+    episodes = _episodes(generator)
+    page_count = -(-len(episodes) // EPISODE_PAGE_SIZE)
+    base = f"https://api4.thetvdb.com/v4/series/{SERIES_ID}/episodes/default"
+
+    for page in range(page_count):
+        start = page * EPISODE_PAGE_SIZE
+        _write(
+            f"episodes_page_{page}.json",
+            {
+                "status": "success",
+                "data": {
+                    "series": None,
+                    "episodes": episodes[start : start + EPISODE_PAGE_SIZE],
+                },
+                "links": {
+                    "prev": f"{base}?page={page - 1}" if page > 0 else None,
+                    "self": f"{base}?page={page}",
+                    "next": f"{base}?page={page + 1}" if page + 1 < page_count else None,
+                    "total_items": len(episodes),
+                    "page_size": EPISODE_PAGE_SIZE,
+                },
+            },
+        )
+
+    _write(
+        "search_results.json",
+        {
+            "status": "success",
+            "data": [_search_result(generator, index) for index in range(SEARCH_RESULT_COUNT)],
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,463 @@
+"""A local stand-in for the TVDB v4 API.
+
+The server answers the endpoints the client uses from the benchmark
+fixtures, with the requested IDs substituted in, so tests and benchmarks can
+run end to end without credentials or network access. Latency, random
+server errors and rate limiting (429 responses) can be switched on by
+passing `Faults` to see how the client behaves under load. Responses are
+gzipped for clients that accept it, as the real API does, unless `compress`
+is off.
+
+    with MockTVDBServer(faults=Faults(latency=0.02)) as server:
+        client = TVDBClient(api_key="anything", base_url=server.base_url)
+        episodes = client.episodes_from_show_id(1234, max_workers=4)
+
+It can also be run on its own:
+
+    python -m benchmarks.mock_server --port 8080 --latency 0.05
+"""
+
+import argparse
+import copy
+import gzip
+import json
+import random
+import re
+import threading
+import time
+import urllib.parse
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from benchmarks.generate_fixtures import FIXTURES
+
+TOKEN = "mock-token"
+
+_SEARCH = re.compile(r"^/v4/search$")
+_SERIES = re.compile(r"^/v4/series/(\d+)(/extended)?$")
+_SERIES_EPISODES = re.compile(r"^/v4/series/(\d+)/episodes/default$")
+_EPISODE = re.compile(r"^/v4/episodes/(\d+)(/extended)?$")
+
+# Answers a request from the match of its path and its query string
+_Route = Callable[[re.Match[str], dict[str, list[str]]], tuple[int, Any]]
+
+
+class Faults:
+    """The delays and failures a `MockTVDBServer` adds to its responses."""
+
+    latency: float
+    jitter: float
+    error_rate: float
+    rate_limit: float | None
+    seed: int
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: float | None = None,
+        seed: int = 0,
+    ) -> None:
+        """Create a new set of faults. By default there are none.
+
+        Args:
+            latency: Seconds to wait before answering each request
+            jitter: Extra random delay of up to this many seconds per request
+            error_rate: Fraction of requests to fail with a 500
+            rate_limit: Requests per second to allow before answering 429 (default: no limit)
+            seed: Seed for the jitter and error injection
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.seed = seed
+
+
+class MockTVDBServer:
+    """An in-process HTTP server that behaves like the TVDB v4 API.
+
+    Any numeric series or episode ID is accepted except those listed in
+    `missing_ids`, which return the API's not found error. Extended show
+    records honour `short=true` (no characters, artworks or trailers) and
+    `meta=episodes` (every episode inline).
+    """
+
+    def __init__(
+        self,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        faults: Faults | None = None,
+        page_size: int = 100,
+        missing_ids: set[int] | None = None,
+        compress: bool = True,
+    ) -> None:
+        """Create a new server. It doesn't listen until `start` is called.
+
+        Args:
+            host: The address to listen on
+            port: The port to listen on (default: any free port)
+            faults: Delays and failures to add to responses (default: none)
+            page_size: Episodes per page of the episode list
+            missing_ids: Series and episode IDs to answer with a 404
+            compress: Gzip responses for clients that send Accept-Encoding: gzip
+        """
+        self.host = host
+        self.port = port
+        self.faults = faults or Faults()
+        self.page_size = page_size
+        self.missing_ids = missing_ids or set()
+        self.compress = compress
+        self.request_count = 0
+        self.connection_count = 0
+        self.bytes_sent = 0
+        self.status_counts: dict[int, int] = {}
+
+        self._random = random.Random(self.faults.seed)
+        self._lock = threading.Lock()
+        self._tokens = self.faults.rate_limit or 0.0
+        self._tokens_updated = time.monotonic()
+        self._server: _Server | None = None
+        self._thread: threading.Thread | None = None
+
+        self._series = _load("series_extended.json")["data"]
+        self._search = _load("search_results.json")["data"]
+        self._episodes = [
+            episode
+            for path in sorted(FIXTURES.glob("episodes_page_*.json"))
+            for episode in _load(path.name)["data"]["episodes"]
+        ]
+        self._routes: list[tuple[re.Pattern[str], _Route]] = [
+            (_SEARCH, self._search_results),
+            (_SERIES_EPISODES, self._episode_page),
+            (_SERIES, self._show),
+            (_EPISODE, self._episode),
+        ]
+
+    @property
+    def base_url(self) -> str:
+        """The URL to pass as the client's `base_url`."""
+        if self._server is None:
+            raise RuntimeError("The server has not been started")
+        return f"http://{self.host}:{self._server.server_address[1]}/v4"
+
+    def start(self) -> "MockTVDBServer":
+        """Start listening on a background thread.
+
+        Returns:
+            The server, for chaining
+        """
+        server = self
+
+        class Handler(_Handler):
+            """Handler bound to this server."""
+
+            mock = server
+
+        self._server = _Server((self.host, self.port), Handler)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and wait for it to shut down."""
+        if self._server is None:
+            return
+
+        self._server.shutdown()
+        self._server.server_close()
+
+        if self._thread is not None:
+            self._thread.join()
+
+        self._server = None
+        self._thread = None
+
+    def __enter__(self) -> "MockTVDBServer":
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    # Request handling
+
+    def _admit(self) -> tuple[int | None, float]:
+        """Apply the injected faults to a request.
+
+        Returns:
+            The error status to answer with (None to serve the request
+            normally) and the delay before answering
+        """
+        faults = self.faults
+
+        with self._lock:
+            self.request_count += 1
+            delay = faults.latency + (
+                self._random.uniform(0, faults.jitter) if faults.jitter else 0.0
+            )
+
+            if faults.rate_limit is not None:
+                now = time.monotonic()
+                self._tokens = min(
+                    faults.rate_limit,
+                    self._tokens + (now - self._tokens_updated) * faults.rate_limit,
+                )
+                self._tokens_updated = now
+
+                if self._tokens < 1:
+                    return 429, 0.0
+
+                self._tokens -= 1
+
+            if faults.error_rate and self._random.random() < faults.error_rate:
+                return 500, delay
+
+        return None, delay
+
+    def _connected(self) -> None:
+        with self._lock:
+            self.connection_count += 1
+
+    def _count(self, status: int, size: int) -> None:
+        with self._lock:
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+            self.bytes_sent += size
+
+    def route(self, method: str, url: str, body: Any, authorization: str | None) -> tuple[int, Any]:
+        """Work out the response to a request.
+
+        Args:
+            method: The HTTP method
+            url: The request path and query
+            body: The decoded JSON body, if any
+            authorization: The Authorization header, if any
+
+        Returns:
+            The status code and JSON body to respond with
+        """
+        parsed = urllib.parse.urlsplit(url)
+        query = urllib.parse.parse_qs(parsed.query)
+        path = parsed.path.rstrip("/")
+
+        if method == "POST" and path == "/v4/login":
+            if not isinstance(body, dict) or not body.get("apikey"):
+                return 401, {"status": "failure", "message": "Unauthorized", "data": None}
+            return 200, {"status": "success", "data": {"token": TOKEN}}
+
+        if method != "GET":
+            return 405, {"Error": "Method not allowed"}
+
+        if authorization != f"Bearer {TOKEN}":
+            return 401, {"Error": "Unauthorized"}
+
+        for pattern, handler in self._routes:
+            if match := pattern.match(path):
+                return handler(match, query)
+
+        return 404, {"Error": "Resource not found"}
+
+    def _search_results(self, _: re.Match[str], query: dict[str, list[str]]) -> tuple[int, Any]:
+        words = query.get("query", [""])[0].lower().split()
+        results = [
+            result
+            for result in self._search
+            if all(word in result["name"].lower() for word in words)
+        ]
+        return 200, {"status": "success", "data": results}
+
+    def _series_episodes(self, series_id: int, start: int, end: int) -> list[dict[str, Any]]:
+        episodes = copy.deepcopy(self._episodes[start:end])
+
+        for episode in episodes:
+            episode["seriesId"] = series_id
+
+        return episodes
+
+    def _show(self, match: re.Match[str], query: dict[str, list[str]]) -> tuple[int, Any]:
+        series_id = int(match.group(1))
+        extended = match.group(2) is not None
+
+        if series_id in self.missing_ids:
+            return 404, {"Error": "Resource not found"}
+
+        show = copy.deepcopy(self._series)
+        show["id"] = series_id
+
+        if not extended:
+            for key in ("artworks", "characters", "companies", "seasons", "trailers", "lists"):
+                show[key] = None
+        elif query.get("short") == ["true"]:
+            for key in ("artworks", "characters", "trailers"):
+                show[key] = None
+
+        if extended and "episodes" in query.get("meta", []):
+            show["episodes"] = self._series_episodes(series_id, 0, len(self._episodes))
+
+        return 200, {"status": "success", "data": show}
+
+    def _episode(self, match: re.Match[str], _: dict[str, list[str]]) -> tuple[int, Any]:
+        episode_id = int(match.group(1))
+
+        if episode_id in self.missing_ids:
+            return 404, {"Error": "Resource not found"}
+
+        episode = copy.deepcopy(self._episodes[episode_id % len(self._episodes)])
+        episode["id"] = episode_id
+
+        return 200, {"status": "success", "data": episode}
+
+    def _episode_page(self, match: re.Match[str], query: dict[str, list[str]]) -> tuple[int, Any]:
+        series_id = int(match.group(1))
+
+        if series_id in self.missing_ids:
+            return 404, {"Error": "Resource not found"}
+
+        page = int(query.get("page", ["0"])[0])
+        start = page * self.page_size
+        episodes = self._series_episodes(series_id, start, start + self.page_size)
+
+        base = f"{self.base_url}/series/{series_id}/episodes/default"
+        has_next = start + self.page_size < len(self._episodes)
+
+        return 200, {
+            "status": "success",
+            "data": {"series": None, "episodes": episodes},
+            "links": {
+                "prev": f"{base}?page={page - 1}" if page > 0 else None,
+                "self": f"{base}?page={page}",
+                "next": f"{base}?page={page + 1}" if has_next else None,
+                "total_items": len(self._episodes),
+                "page_size": self.page_size,
+            },
+        }
+
+
+class _Server(ThreadingHTTPServer):
+    """A threading server with room for many clients connecting at once."""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Request handler that defers to the owning `MockTVDBServer`."""
+
+    mock: MockTVDBServer
+    protocol_version = "HTTP/1.1"
+    # The headers and body are written separately, which stalls kept-alive
+    # connections on delayed ACKs unless Nagle's algorithm is off
+    disable_nagle_algorithm = True
+
+    def setup(self) -> None:
+        """Count each new connection."""
+        super().setup()
+        self.mock._connected()  # pylint: disable=protected-access
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Handle a GET request."""
+        self._handle("GET", None)
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        """Handle a POST request."""
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+
+        try:
+            body = json.loads(raw) if raw else None
+        except json.JSONDecodeError:
+            body = None
+
+        self._handle("POST", body)
+
+    def _handle(self, method: str, body: Any) -> None:
+        fault, delay = self.mock._admit()  # pylint: disable=protected-access
+        headers = {}
+
+        time.sleep(delay)
+
+        if fault is not None:
+            status = fault
+            if status == 429:
+                headers["Retry-After"] = "1"
+                payload: Any = {"Error": "Too many requests"}
+            else:
+                payload = {"Error": "Internal server error"}
+        else:
+            status, payload = self.mock.route(
+                method, self.path, body, self.headers.get("Authorization")
+            )
+
+        encoded = json.dumps(payload).encode("utf-8")
+
+        if self.mock.compress and _accepts_gzip(self.headers.get("Accept-Encoding")):
+            encoded = gzip.compress(encoded, compresslevel=6)
+            headers["Content-Encoding"] = "gzip"
+
+        self.mock._count(status, len(encoded))  # pylint: disable=protected-access
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 # pylint: disable=W0622
+        """Keep the request log quiet."""
+
+
+def _accepts_gzip(accept_encoding: str | None) -> bool:
+    for coding in (accept_encoding or "").split(","):
+        name, _, parameters = coding.partition(";")
+        if name.strip().lower() == "gzip":
+            return parameters.replace(" ", "") not in ("q=0", "q=0.0")
+    return False
+
+
+def _load(name: str) -> Any:
+    with open(FIXTURES / name, encoding="utf-8") as fixture_file:
+        return json.load(fixture_file)
+
+
+def main() -> None:
+    """Run the server in the foreground."""
+    parser = argparse.ArgumentParser(description="Serve a mock TVDB v4 API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=None)
+    parser.add_argument("--no-compress", action="store_true", help="Never gzip responses")
+    arguments = parser.parse_args()
+
+    server = MockTVDBServer(
+        host=arguments.host,
+        port=arguments.port,
+        faults=Faults(
+            latency=arguments.latency,
+            jitter=arguments.jitter,
+            error_rate=arguments.error_rate,
+            rate_limit=arguments.rate_limit,
+        ),
+        compress=not arguments.no_compress,
+    ).start()
+
+    print(f"Serving on {server.base_url}")
+
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""Benchmark deserialization, parsing and pagination against a stored baseline.
+
+Each benchmark is timed (best of several runs) and its peak allocation is
+measured with tracemalloc. The results are compared to `baseline.json` and
+the run fails if any benchmark is slower or allocates more than the
+baseline by more than the tolerance.
+
+    python -m benchmarks.suite                   # Compare against the baseline
+    python -m benchmarks.suite --save-baseline   # Record a new baseline
+
+Timings depend on the machine, so record the baseline on the machine the
+comparisons will run on.
+"""
+
+import argparse
+import json
+import pathlib
+import sys
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+from unittest.mock import Mock, patch
+
+import deserialize
+
+from benchmarks.bench_parsers import _workload
+from libtvdb import TVDBClient
+from libtvdb.model import Episode, EpisodeCollection, Show
+from libtvdb.model.parsers import date_parser, datetime_parser
+
+BENCHMARKS = pathlib.Path(__file__).parent
+FIXTURES = BENCHMARKS / "fixtures"
+BASELINE = BENCHMARKS / "baseline.json"
+
+REPEAT = 7
+DEFAULT_TOLERANCE = 0.25
+
+
+def load_fixture(name: str) -> Any:
+    """Load a JSON fixture recorded from the API.
+
+    Args:
+        name: The file name in the fixtures directory
+
+    Returns:
+        The decoded response
+    """
+    with open(FIXTURES / name, encoding="utf-8") as fixture_file:
+        return json.load(fixture_file)
+
+
+def episode_pages() -> list[dict[str, Any]]:
+    """Load every recorded page of a show's episodes, in order."""
+    return [load_fixture(path.name) for path in sorted(FIXTURES.glob("episodes_page_*.json"))]
+
+
+def get_paged_benchmark(pages: list[dict[str, Any]]) -> Callable[[], Any]:
+    """Build the pagination benchmark, which fetches the pages through `get_paged`.
+
+    Args:
+        pages: The pages to serve, as returned by `episode_pages`
+
+    Returns:
+        A function that fetches every page and returns the combined episodes
+    """
+    responses = {}
+
+    for page in pages:
+        response = Mock(status_code=200)
+        response.json.return_value = page
+        responses[page["links"]["self"]] = response
+
+    # The first request is made without a page parameter
+    responses[pages[0]["links"]["self"].split("?")[0]] = responses[pages[0]["links"]["self"]]
+
+    client = TVDBClient(api_key="benchmark")
+    client.auth_token = "benchmark"
+    path = pages[0]["links"]["self"].split("/v4/")[1].split("?")[0]
+
+    def fetch_pages() -> Any:
+        with patch("requests.get", side_effect=lambda url, **_: responses[url]):
+            return client.get_paged(path, timeout=10, key="episodes")
+
+    return fetch_pages
+
+
+def _benchmarks() -> dict[str, tuple[Callable[[], Any], int]]:
+    """Build the benchmarks, returning each function with the number of items it processes."""
+    show_data = load_fixture("series_extended.json")["data"]
+    search_data = load_fixture("search_results.json")["data"]
+    pages = episode_pages()
+    episode_data = [episode for page in pages for episode in page["data"]["episodes"]]
+    aired, updated = _workload()
+    show = deserialize.deserialize(Show, show_data, throw_on_unhandled=True)
+    show_bytes = show.to_bytes()
+    episodes_bytes = EpisodeCollection(
+        deserialize.deserialize(Episode, item, throw_on_unhandled=True) for item in episode_data
+    ).to_bytes()
+
+    return {
+        "deserialize_show_extended": (
+            lambda: deserialize.deserialize(Show, show_data, throw_on_unhandled=True),
+            1,
+        ),
+        "deserialize_search_results": (
+            lambda: [
+                deserialize.deserialize(Show, item, throw_on_unhandled=True) for item in search_data
+            ],
+            len(search_data),
+        ),
+        "deserialize_episodes": (
+            lambda: [
+                deserialize.deserialize(Episode, item, throw_on_unhandled=True)
+                for item in episode_data
+            ],
+            len(episode_data),
+        ),
+        "date_parser": (lambda: [date_parser(value) for value in aired], len(aired)),
+        "datetime_parser": (lambda: [datetime_parser(value) for value in updated], len(updated)),
+        "get_paged_aggregation": (get_paged_benchmark(pages), len(episode_data)),
+        "show_to_bytes": (show.to_bytes, 1),
+        "show_from_bytes": (lambda: Show.from_bytes(show_bytes), 1),
+        "episodes_from_bytes": (
+            lambda: EpisodeCollection.from_bytes(episodes_bytes),
+            len(episode_data),
+        ),
+    }
+
+
+def _measure(function: Callable[[], Any]) -> dict[str, float]:
+    function()  # Warm up caches so every run measures the same work
+
+    seconds = min(timeit.repeat(function, number=1, repeat=REPEAT))
+
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"seconds": seconds, "peak_bytes": peak}
+
+
+def run(selected: list[str] | None = None) -> dict[str, dict[str, float]]:
+    """Run the benchmarks.
+
+    Args:
+        selected: Names of the benchmarks to run, or None for all of them
+
+    Returns:
+        The results for each benchmark
+    """
+    results = {}
+
+    for name, (function, items) in _benchmarks().items():
+        if selected and name not in selected:
+            continue
+
+        result = _measure(function)
+        result["items_per_second"] = items / result["seconds"]
+        results[name] = result
+
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+) -> list[str]:
+    """Find the benchmarks that have regressed against the baseline.
+
+    Args:
+        results: The results of this run
+        baseline: The stored baseline results
+        tolerance: Allowed fractional increase in time and peak allocation
+
+    Returns:
+        A description of each regression
+    """
+    regressions = []
+
+    for name, result in results.items():
+        expected = baseline.get(name)
+
+        if expected is None:
+            continue
+
+        for metric in ("seconds", "peak_bytes"):
+            limit = expected[metric] * (1 + tolerance)
+            if result[metric] > limit:
+                change = result[metric] / expected[metric] - 1
+                regressions.append(
+                    f"{name}: {metric} {result[metric]:.6g} vs baseline "
+                    f"{expected[metric]:.6g} (+{change:.0%})"
+                )
+
+    return regressions
+
+
+def main() -> int:
+    """Run the suite from the command line.
+
+    Returns:
+        The process exit code
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("benchmarks", nargs="*", help="Only run these benchmarks")
+    parser.add_argument("--save-baseline", action="store_true", help="Store results as baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    arguments = parser.parse_args()
+
+    results = run(arguments.benchmarks)
+    baseline = json.loads(BASELINE.read_text(encoding="utf-8")) if BASELINE.exists() else {}
+
+    print(f"{'benchmark':<28} {'ms':>9} {'items/s':>11} {'peak KiB':>9} {'vs baseline':>12}")
+    for name, result in results.items():
+        expected = baseline.get(name)
+        change = f"{result['seconds'] / expected['seconds'] - 1:+.0%}" if expected else "-"
+        print(
+            f"{name:<28} {result['seconds'] * 1000:9.2f} {result['items_per_second']:11.0f} "
+            f"{result['peak_bytes'] / 1024:9.1f} {change:>12}"
+        )
+
+    if arguments.save_baseline:
+        baseline.update(results)
+        BASELINE.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"Saved baseline to {BASELINE}")
+        return 0
+
+    regressions = compare(results, baseline, arguments.tolerance)
+
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,468 @@
+"""Downloading artwork images into a content-addressed disk cache.
+
+Each downloaded file is stored once under the SHA-256 of its contents, so
+the same image used by several artworks only takes up space once. A small
+reference file per artwork records which contents belong to it and the
+artwork's `updated_at`, and the image is only downloaded again once that
+changes.
+
+Downloads are streamed to a partial file first. If one is interrupted, the
+next attempt asks the server for the rest with a `Range` request rather than
+starting again. The partial file is locked while it is written, with `fcntl`
+where it is available, so processes sharing a cache don't download the same
+image at once.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import urllib.parse
+from collections.abc import Iterable, Iterator
+from typing import IO, TYPE_CHECKING, Any
+
+from libtvdb.bulk import BulkResult, bounded_map, unique
+from libtvdb.exceptions import DownloadException, NotFoundException
+from libtvdb.model import Artwork
+from libtvdb.utilities import Log
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    import urllib3
+
+_CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+
+
+def _variant(thumbnail: bool) -> str:
+    return "thumbnail" if thumbnail else "image"
+
+
+def _lock_file(file: IO[bytes], *, blocking: bool = True) -> bool:
+    """Take an exclusive lock on an open file, shared with other processes.
+
+    Without `fcntl` this does nothing and always succeeds.
+
+    Returns:
+        False if the file is locked elsewhere and blocking is False, otherwise True
+    """
+    if fcntl is None:
+        return True
+
+    try:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+    except BlockingIOError:
+        return False
+
+    return True
+
+
+@contextlib.contextmanager
+def _locked(path: str) -> Iterator[None]:
+    """Hold an exclusive lock on a file, creating it if needed.
+
+    The file may be moved or removed by whoever held the lock before, so the
+    lock is taken again until it is held on the file that is at the path.
+    """
+    while True:
+        with open(path, "ab") as locked_file:
+            _lock_file(locked_file)
+
+            try:
+                current = os.path.samestat(os.fstat(locked_file.fileno()), os.stat(path))
+            except FileNotFoundError:
+                current = False
+
+            if current:
+                yield
+                return
+
+
+def _url(artwork: Artwork, thumbnail: bool) -> str:
+    url = artwork.thumbnail if thumbnail else artwork.image
+
+    if not url:
+        raise ValueError(f"{artwork} has no {_variant(thumbnail)} URL")
+
+    return url
+
+
+class ArtworkCache:
+    """Artwork images stored on disk, addressed by their contents.
+
+    The directory holds `objects/` with the files themselves, `refs/` with
+    the reference for each artwork image or thumbnail, and `partial/` with
+    downloads in progress. It can be shared between processes on platforms
+    with `fcntl`; elsewhere only the threads of one process are coordinated.
+    """
+
+    path: str
+
+    def __init__(self, path: str) -> None:
+        """Open a cache, creating its directory if needed.
+
+        Args:
+            path: The directory to store the cache in
+        """
+        self.path = path
+
+        for directory in ("objects", "refs", "partial"):
+            os.makedirs(os.path.join(path, directory), exist_ok=True)
+
+    def _name(self, artwork: Artwork, thumbnail: bool) -> str:
+        return f"{urllib.parse.quote(str(artwork.identifier), safe='')}-{_variant(thumbnail)}"
+
+    def _ref_path(self, artwork: Artwork, thumbnail: bool) -> str:
+        return os.path.join(self.path, "refs", f"{self._name(artwork, thumbnail)}.json")
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.path, "objects", digest[:2], digest)
+
+    def partial_path(self, artwork: Artwork, *, thumbnail: bool = False) -> str:
+        """Get where an unfinished download of an artwork is kept.
+
+        The path includes `updated_at`, so a partial download of an older
+        version of the image is never resumed.
+
+        Args:
+            artwork: The artwork
+            thumbnail: True for the thumbnail, False for the full image
+
+        Returns:
+            The path of the partial file, which may not exist
+        """
+        name = f"{self._name(artwork, thumbnail)}-{artwork.updated_at}.part"
+        return os.path.join(self.path, "partial", name)
+
+    def get_path(self, artwork: Artwork, *, thumbnail: bool = False) -> str | None:
+        """Get the cached file for an artwork, if it is up to date.
+
+        Args:
+            artwork: The artwork
+            thumbnail: True for the thumbnail, False for the full image
+
+        Returns:
+            The path of the file, or None if it isn't cached or the artwork has been updated
+        """
+        try:
+            with open(self._ref_path(artwork, thumbnail), encoding="utf-8") as ref_file:
+                ref = json.load(ref_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        if ref.get("updated_at") != artwork.updated_at:
+            return None
+
+        object_path = self._object_path(ref["digest"])
+        return object_path if os.path.exists(object_path) else None
+
+    def get(self, artwork: Artwork, *, thumbnail: bool = False) -> bytes | None:
+        """Read a cached artwork image.
+
+        Args:
+            artwork: The artwork
+            thumbnail: True for the thumbnail, False for the full image
+
+        Returns:
+            The image, or None if it isn't cached or the artwork has been updated
+        """
+        object_path = self.get_path(artwork, thumbnail=thumbnail)
+
+        if object_path is None:
+            return None
+
+        with open(object_path, "rb") as image_file:
+            return image_file.read()
+
+    def add_file(self, artwork: Artwork, file_path: str, *, thumbnail: bool = False) -> str:
+        """Move a downloaded file into the cache as an artwork's image.
+
+        Args:
+            artwork: The artwork the file belongs to
+            file_path: The downloaded file, which is moved or removed
+            thumbnail: True for the thumbnail, False for the full image
+
+        Returns:
+            The path of the cached file
+        """
+        digest = hashlib.sha256()
+
+        with open(file_path, "rb") as downloaded:
+            for chunk in iter(lambda: downloaded.read(1024 * 1024), b""):
+                digest.update(chunk)
+
+        object_path = self._object_path(digest.hexdigest())
+
+        if os.path.exists(object_path):
+            os.remove(file_path)
+        else:
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            os.replace(file_path, object_path)
+
+        ref = {
+            "digest": digest.hexdigest(),
+            "updated_at": artwork.updated_at,
+            "url": _url(artwork, thumbnail),
+        }
+        ref_path = self._ref_path(artwork, thumbnail)
+        temporary_path = f"{ref_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        with open(temporary_path, "w", encoding="utf-8") as ref_file:
+            json.dump(ref, ref_file)
+
+        os.replace(temporary_path, ref_path)
+        return object_path
+
+    def prune(self, *, partial_max_age: float = 24 * 60 * 60) -> int:
+        """Delete stored files that no artwork refers to any more.
+
+        Partial downloads that haven't been written to for `partial_max_age`
+        are deleted too, unless a download of them is still in progress.
+
+        Args:
+            partial_max_age: Seconds after which an unfinished download is abandoned
+
+        Returns:
+            The number of files deleted
+        """
+        referenced = set()
+
+        for entry in os.scandir(os.path.join(self.path, "refs")):
+            with (
+                contextlib.suppress(OSError, json.JSONDecodeError, KeyError),
+                open(entry.path, encoding="utf-8") as ref_file,
+            ):
+                referenced.add(json.load(ref_file)["digest"])
+
+        deleted = 0
+
+        for directory in os.scandir(os.path.join(self.path, "objects")):
+            for entry in os.scandir(directory.path):
+                if entry.name not in referenced:
+                    os.remove(entry.path)
+                    deleted += 1
+
+        cutoff = time.time() - partial_max_age
+
+        for entry in os.scandir(os.path.join(self.path, "partial")):
+            with contextlib.suppress(FileNotFoundError):
+                if entry.stat().st_mtime >= cutoff:
+                    continue
+
+                with open(entry.path, "ab") as partial_file:
+                    if _lock_file(partial_file, blocking=False):
+                        os.remove(entry.path)
+                        deleted += 1
+
+        return deleted
+
+
+class ArtworkDownloader:
+    """Downloads artwork images into an `ArtworkCache`.
+
+    Requests go through one urllib3 connection pool with at most
+    `max_workers` connections per host, and images that are already cached
+    for the artwork's current `updated_at` aren't requested at all.
+    """
+
+    cache: ArtworkCache
+    max_workers: int
+    timeout: float
+    chunk_size: int
+    pool: "urllib3.PoolManager"
+
+    def __init__(
+        self,
+        cache: ArtworkCache,
+        *,
+        max_workers: int = 8,
+        timeout: float = 30.0,
+        chunk_size: int = 64 * 1024,
+        pool: "urllib3.PoolManager | None" = None,
+    ) -> None:
+        """Create a new downloader.
+
+        Args:
+            cache: The cache to store images in
+            max_workers: Maximum number of concurrent downloads
+            timeout: Timeout in seconds for connecting and for each read
+            chunk_size: Bytes to read from the connection at a time
+            pool: The pool to send requests with (default: a new PoolManager)
+
+        Raises:
+            ValueError: If max_workers is less than 1
+        """
+        import urllib3  # pylint: disable=import-outside-toplevel
+
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        self.cache = cache
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.pool = pool or urllib3.PoolManager(maxsize=max_workers, block=True)
+        self._lock = threading.Lock()
+        # The lock for each download in progress and how many threads are using it
+        self._download_locks: dict[str, tuple[threading.Lock, int]] = {}
+
+    @contextlib.contextmanager
+    def _download_lock(self, partial_path: str) -> Iterator[None]:
+        """Hold the locks for a download, against other threads and other processes."""
+        with self._lock:
+            lock, users = self._download_locks.get(partial_path, (threading.Lock(), 0))
+            self._download_locks[partial_path] = (lock, users + 1)
+
+        try:
+            with lock, _locked(partial_path):
+                yield
+        finally:
+            with self._lock:
+                lock, users = self._download_locks[partial_path]
+
+                if users == 1:
+                    del self._download_locks[partial_path]
+                else:
+                    self._download_locks[partial_path] = (lock, users - 1)
+
+    def download(self, artwork: Artwork, *, thumbnail: bool = False) -> str:
+        """Get the path of an artwork image, downloading it if it isn't cached.
+
+        Args:
+            artwork: The artwork
+            thumbnail: True for the thumbnail, False for the full image
+
+        Returns:
+            The path of the cached file
+
+        Raises:
+            ValueError: If the artwork has no URL for the image
+            NotFoundException: If the image doesn't exist
+            DownloadException: If the download failed or was cut short
+        """
+        cached = self.cache.get_path(artwork, thumbnail=thumbnail)
+
+        if cached is not None:
+            return cached
+
+        url = _url(artwork, thumbnail)
+        partial_path = self.cache.partial_path(artwork, thumbnail=thumbnail)
+
+        with self._download_lock(partial_path):
+            # Another thread or process may have finished the download while this one waited
+            cached = self.cache.get_path(artwork, thumbnail=thumbnail)
+
+            if cached is not None:
+                os.remove(partial_path)
+                return cached
+
+            self._fetch(url, partial_path)
+            return self.cache.add_file(artwork, partial_path, thumbnail=thumbnail)
+
+    def download_many(
+        self, artworks: Iterable[Artwork], *, thumbnail: bool = False
+    ) -> Iterator[BulkResult[Artwork, str]]:
+        """Download many artwork images concurrently.
+
+        Args:
+            artworks: The artworks
+            thumbnail: True for the thumbnails, False for the full images
+
+        Returns:
+            The cached path or error for each distinct artwork, in completion order
+        """
+        return bounded_map(
+            lambda artwork: self.download(artwork, thumbnail=thumbnail),
+            unique(artworks),
+            max_workers=self.max_workers,
+        )
+
+    def _fetch(self, url: str, partial_path: str) -> None:
+        """Download a URL to a partial file, resuming from what it already holds."""
+        import urllib3  # pylint: disable=import-outside-toplevel
+
+        offset = os.path.getsize(partial_path)
+        # The offsets are into the bytes as stored, so the body must not be re-encoded
+        headers = {"Accept-Encoding": "identity"}
+
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+
+        try:
+            response = self.pool.request(
+                "GET",
+                url,
+                headers=headers,
+                preload_content=False,
+                retries=False,
+                timeout=urllib3.Timeout(connect=self.timeout, read=self.timeout),
+            )
+        except urllib3.exceptions.HTTPError as ex:
+            raise DownloadException(f"Failed to download {url}: {ex}") from ex
+
+        try:
+            if response.status == 416 and offset:
+                # The partial file doesn't match what the server has, so start again. It
+                # is emptied rather than removed, as the lock is held on it.
+                Log.warning("Cannot resume %s, downloading it again", url)
+                os.truncate(partial_path, 0)
+                response.drain_conn()
+                self._fetch(url, partial_path)
+                return
+
+            mode, expected = self._resume_mode(response, url, offset)
+            received = 0
+
+            with open(partial_path, mode) as partial_file:
+                for chunk in response.stream(self.chunk_size, decode_content=False):
+                    partial_file.write(chunk)
+                    received += len(chunk)
+        except (urllib3.exceptions.HTTPError, OSError) as ex:
+            raise DownloadException(f"Download of {url} was interrupted: {ex}") from ex
+        finally:
+            response.release_conn()
+
+        size = os.path.getsize(partial_path)
+
+        if expected is not None and size != expected:
+            raise DownloadException(f"Download of {url} stopped at {size} of {expected} bytes")
+
+        Log.debug("Downloaded %s bytes of %s, %s were already stored", received, url, offset)
+
+    @staticmethod
+    def _resume_mode(response: Any, url: str, offset: int) -> tuple[str, int | None]:
+        """Check a response and get the file mode to write it with and the full size."""
+        if response.status == 404:
+            raise NotFoundException(f"Could not find {url}")
+
+        if response.status == 206 and offset:
+            match = _CONTENT_RANGE.fullmatch(response.headers.get("Content-Range", ""))
+
+            if match is None or int(match.group(1)) != offset:
+                raise DownloadException(f"Unexpected range in the response for {url}")
+
+            total = match.group(3)
+            return "ab", None if total == "*" else int(total)
+
+        if response.status == 200:
+            # Either nothing was stored or the server ignored the range
+            length = response.headers.get("Content-Length")
+            return "wb", int(length) if length and length.isdigit() else None
+
+        raise DownloadException(f"Unexpected status code downloading {url}: {response.status}")
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        self.pool.clear()
+
+    def __enter__(self) -> "ArtworkDownloader":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
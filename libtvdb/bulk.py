@@ -0,0 +1,125 @@
+"""Helpers for running many API lookups concurrently."""
+
+import concurrent.futures
+from collections.abc import Callable, Iterable, Iterator
+from typing import Generic, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class BulkResult(Generic[K, V]):
+    """The outcome of a single lookup within a bulk operation.
+
+    Exactly one of `value` and `error` is set.
+    """
+
+    identifier: K
+    value: V | None
+    error: Exception | None
+
+    def __init__(
+        self,
+        identifier: K,
+        *,
+        value: V | None = None,
+        error: Exception | None = None,
+    ) -> None:
+        self.identifier = identifier
+        self.value = value
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        """Check if the lookup succeeded."""
+        return self.error is None
+
+    def __str__(self) -> str:
+        return f"BulkResult<{self.identifier} - {'ok' if self.ok else 'failed'}>"
+
+    def __repr__(self) -> str:
+        if self.ok:
+            return f"BulkResult<{self.identifier} - {self.value!r}>"
+        return f"BulkResult<{self.identifier} - {self.error!r}>"
+
+
+def unique(items: Iterable[K]) -> Iterator[K]:
+    """Yield each item the first time it is seen, preserving order.
+
+    Args:
+        items: The items to deduplicate
+
+    Returns:
+        An iterator over the distinct items
+    """
+    seen: set[K] = set()
+
+    for item in items:
+        if item in seen:
+            continue
+        seen.add(item)
+        yield item
+
+
+def bounded_map(
+    function: Callable[[K], V],
+    items: Iterable[K],
+    *,
+    max_workers: int,
+) -> Iterator[BulkResult[K, V]]:
+    """Run `function` over `items` on a thread pool, yielding results as they complete.
+
+    The input is consumed lazily and at most `2 * max_workers` calls are in
+    flight at any time, so very large (or unbounded) inputs don't get queued
+    up front. Exceptions raised by `function` are captured on the result for
+    that item rather than stopping the iteration.
+
+    Args:
+        function: The function to call for each item
+        items: The items to process
+        max_workers: The maximum number of concurrent calls
+
+    Returns:
+        An iterator of results in completion order
+
+    Raises:
+        ValueError: If max_workers is less than 1
+    """
+
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+
+    iterator = iter(items)
+    max_in_flight = max_workers * 2
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: dict[concurrent.futures.Future[V], K] = {}
+
+        def submit_next() -> bool:
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return False
+            pending[executor.submit(function, item)] = item
+            return True
+
+        while len(pending) < max_in_flight and submit_next():
+            pass
+
+        while pending:
+            done, _ = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+
+            for future in done:
+                item = pending.pop(future)
+                error = future.exception()
+
+                if error is None:
+                    yield BulkResult(item, value=future.result())
+                elif isinstance(error, Exception):
+                    yield BulkResult(item, error=error)
+                else:
+                    raise error
+
+                submit_next()
@@ -0,0 +1,279 @@
+"""Record requests to disk and replay them later, without a network."""
+
+import base64
+import gzip
+import json
+import os
+import threading
+import time
+from collections.abc import Mapping
+from typing import Any, ClassVar
+
+from libtvdb.compression import encoded_size
+from libtvdb.exceptions import CassetteMissException
+from libtvdb.transport import RequestsTransport, Response, Transport, TransportResponse
+
+_RECORDED_HEADERS = ("content-type", "retry-after")
+_REDACTED_TOKEN = "recorded-token"
+
+
+class Cassette:
+    """A gzipped JSON file of recorded request/response pairs.
+
+    Requests are identified by method and URL only. The login request body
+    is not stored and the token in its response is replaced, so a cassette
+    contains no credentials. Bodies are stored decoded, along with the size
+    they took on the wire so that compression savings can be replayed too.
+    """
+
+    VERSION: ClassVar[int] = 1
+
+    path: str | os.PathLike[str]
+    interactions: list[dict[str, Any]]
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """Open a cassette, loading any interactions already recorded to it.
+
+        Args:
+            path: The cassette file
+
+        Raises:
+            ValueError: If the file was written by an incompatible version
+        """
+        self.path = path
+        self.interactions = []
+
+        if not os.path.exists(path):
+            return
+
+        with gzip.open(path, "rt", encoding="utf-8") as cassette_file:
+            data = json.load(cassette_file)
+
+        if data.get("version") != Cassette.VERSION:
+            raise ValueError(f"Unsupported cassette version: {data.get('version')}")
+
+        self.interactions = data["interactions"]
+
+    def __len__(self) -> int:
+        return len(self.interactions)
+
+    def record(
+        self, method: str, url: str, response: Response, *, elapsed: float
+    ) -> dict[str, Any]:
+        """Add a request and its response to the cassette.
+
+        Args:
+            method: The HTTP method
+            url: The full URL
+            response: The response that was received
+            elapsed: Seconds taken to receive the response
+
+        Returns:
+            The stored interaction
+        """
+        content = response.content
+
+        if url.rstrip("/").endswith("/login"):
+            content = _redact_token(content)
+
+        interaction: dict[str, Any] = {
+            "method": method,
+            "url": url,
+            "status": response.status_code,
+            "headers": {
+                name.lower(): value
+                for name, value in response.headers.items()
+                if name.lower() in _RECORDED_HEADERS
+            },
+            "elapsed": round(elapsed, 6),
+        }
+
+        wire_bytes = encoded_size(response)
+        if wire_bytes is not None:
+            interaction["wire_bytes"] = wire_bytes
+
+        try:
+            interaction["body"] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            interaction["body_base64"] = base64.b64encode(content).decode("ascii")
+
+        self.interactions.append(interaction)
+        return interaction
+
+    def save(self) -> None:
+        """Write the cassette to disk."""
+        payload = {"version": Cassette.VERSION, "interactions": self.interactions}
+        temporary_path = f"{os.fspath(self.path)}.tmp"
+
+        with gzip.open(temporary_path, "wt", encoding="utf-8") as cassette_file:
+            json.dump(payload, cassette_file, separators=(",", ":"))
+
+        os.replace(temporary_path, self.path)
+
+    @staticmethod
+    def response_for(interaction: Mapping[str, Any]) -> TransportResponse:
+        """Rebuild the response stored in an interaction.
+
+        Args:
+            interaction: An interaction from `interactions`
+
+        Returns:
+            The recorded response
+        """
+        if "body_base64" in interaction:
+            content = base64.b64decode(interaction["body_base64"])
+        else:
+            content = interaction["body"].encode("utf-8")
+
+        return TransportResponse(
+            interaction["status"],
+            content,
+            headers=interaction["headers"],
+            url=interaction["url"],
+            wire_bytes=interaction.get("wire_bytes"),
+        )
+
+
+def _redact_token(content: bytes) -> bytes:
+    try:
+        data = json.loads(content)
+        data["data"]["token"] = _REDACTED_TOKEN
+    except (ValueError, KeyError, TypeError):
+        return content
+
+    return json.dumps(data).encode("utf-8")
+
+
+class CassetteTransport(Transport):
+    """A transport that records to, or replays from, a `Cassette`.
+
+    When recording, requests go through `record_from` and every response is
+    added to the cassette, which is saved on `close`. When replaying, each
+    request is answered with the next recorded response for the same method
+    and URL (repeating the last one once they run out), and a request that
+    was never recorded raises `CassetteMissException`.
+
+    Replayed responses arrive after `latency` seconds, or after the time the
+    original request took if `replay_recorded_latency` is set, so timings are
+    reproducible without depending on the network.
+    """
+
+    cassette: Cassette
+    record_from: Transport | None
+    latency: float
+    replay_recorded_latency: bool
+
+    def __init__(
+        self,
+        cassette: Cassette | str | os.PathLike[str],
+        *,
+        record_from: Transport | None = None,
+        latency: float = 0.0,
+        replay_recorded_latency: bool = False,
+    ) -> None:
+        """Create a new cassette transport.
+
+        Args:
+            cassette: The cassette, or the path to one
+            record_from: Transport to send requests through and record (default: replay)
+            latency: Seconds to wait before returning each replayed response
+            replay_recorded_latency: Wait for as long as the recorded request took instead
+        """
+        self.cassette = cassette if isinstance(cassette, Cassette) else Cassette(cassette)
+        self.record_from = record_from
+        self.latency = latency
+        self.replay_recorded_latency = replay_recorded_latency
+        self._lock = threading.Lock()
+        self._replay: dict[tuple[str, str], list[dict[str, Any]]] = {}
+        self._positions: dict[tuple[str, str], int] = {}
+
+        if record_from is not None:
+            self.cassette.interactions = []
+
+        for interaction in self.cassette.interactions:
+            key = (interaction["method"], interaction["url"])
+            self._replay.setdefault(key, []).append(interaction)
+
+    @classmethod
+    def recording(cls, cassette: Cassette | str | os.PathLike[str]) -> "CassetteTransport":
+        """Create a transport that records requests made with `requests`.
+
+        Args:
+            cassette: The cassette, or the path to one
+
+        Returns:
+            The recording transport
+        """
+        return cls(cassette, record_from=RequestsTransport())
+
+    @property
+    def is_recording(self) -> bool:
+        """True if requests are being sent and recorded rather than replayed."""
+        return self.record_from is not None
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Mapping[str, str],
+        timeout: float,
+        json_body: Any = None,
+    ) -> Response:
+        """Record or replay a request.
+
+        Args:
+            method: The HTTP method
+            url: The full URL
+            headers: The request headers
+            timeout: Request timeout in seconds
+            json_body: A value to send as the JSON request body, if any
+
+        Returns:
+            The live or recorded response
+
+        Raises:
+            CassetteMissException: If replaying and the request wasn't recorded
+        """
+        if self.record_from is not None:
+            started = time.perf_counter()
+            response = self.record_from.send(
+                method, url, headers=headers, timeout=timeout, json_body=json_body
+            )
+            elapsed = time.perf_counter() - started
+
+            with self._lock:
+                self.cassette.record(method, url, response, elapsed=elapsed)
+
+            return response
+
+        key = (method, url)
+
+        with self._lock:
+            recorded = self._replay.get(key)
+
+            if not recorded:
+                raise CassetteMissException(f"No recorded response for {method} {url}")
+
+            position = self._positions.get(key, 0)
+            interaction = recorded[min(position, len(recorded) - 1)]
+            self._positions[key] = position + 1
+
+        delay = interaction["elapsed"] if self.replay_recorded_latency else self.latency
+
+        if delay > 0:
+            time.sleep(delay)
+
+        return Cassette.response_for(interaction)
+
+    def close(self) -> None:
+        """Save the cassette if recording."""
+        if self.record_from is not None:
+            self.cassette.save()
+            self.record_from.close()
+
+    def __enter__(self) -> "CassetteTransport":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
@@ -0,0 +1,983 @@
+"""The TVDB API client classes."""
+
+import json
+import time
+import urllib.parse
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any, TypeVar
+
+import deserialize
+
+from libtvdb.bulk import BulkResult, bounded_map, unique
+from libtvdb.client_base import ShowDetail, _TVDBClientBase
+from libtvdb.compression import encoded_size
+from libtvdb.exceptions import NotFoundException, TVDBAuthenticationException
+from libtvdb.instrumentation import RequestRecord, RequestRecorder, timing_model_build
+from libtvdb.model import (
+    EntityUpdate,
+    Episode,
+    EpisodeCollection,
+    RemoteIDSearchResult,
+    Show,
+)
+from libtvdb.processes import DeserializationPool, worker_count
+from libtvdb.remote_ids import RemoteIDTarget, series_id
+from libtvdb.tracing import propagate, span
+from libtvdb.transport import Response
+from libtvdb.utilities import Log
+
+V = TypeVar("V")
+
+
+class TVDBClient(_TVDBClientBase):
+    """The main client wrapper around the TVDB API.
+
+    Instantiate a new one of these to use a new authentication session.
+    """
+
+    def authenticate(self) -> None:
+        """Authenticate the client with the API.
+
+        This will exit early if already authenticated. All API calls requiring
+        authentication will call this method automatically.
+
+        Raises:
+            TVDBAuthenticationException: If authentication fails or times out
+        """
+
+        if self.auth_token is not None:
+            Log.debug("Already authenticated, skipping")
+            return
+
+        with span("authenticate"):
+            Log.info("Authenticating...")
+
+            login_body = {
+                "apikey": self.api_key,
+            }
+
+            if self.pin is not None:
+                login_body["pin"] = self.pin
+
+            with self._recording() as recorder:
+                response = self._post_login(login_body, recorder=recorder)
+
+            if not (
+                _TVDBClientBase.Constants.SUCCESS_STATUS_MIN
+                <= response.status_code
+                < _TVDBClientBase.Constants.SUCCESS_STATUS_MAX
+            ):
+                Log.error("Authentication failed with status code: %s", response.status_code)
+                raise TVDBAuthenticationException(
+                    f"Authentication failed with status code: {response.status_code}"
+                )
+
+            content = response.json()
+            token = content.get("data", {}).get("token")
+
+            if token is None:
+                Log.error("Failed to get token from login request")
+                raise TVDBAuthenticationException("Failed to get token from login request")
+
+            self.auth_token = token
+
+            Log.info("Authenticated successfully")
+
+    def _post_login(
+        self, login_body: dict[str, str], *, recorder: RequestRecorder | None
+    ) -> Response:
+        """Send the login request, retrying if it times out.
+
+        Args:
+            login_body: The credentials to send
+            recorder: Recorder to add a timing record to, if any
+
+        Returns:
+            The login response
+
+        Raises:
+            TVDBAuthenticationException: If every attempt times out
+        """
+        url = self._expand_url("login")
+        record = None
+
+        if recorder is not None:
+            record = RequestRecord("POST", url)
+            record.bytes_sent = len(json.dumps(login_body))
+            recorder.add(record)
+
+        started = time.perf_counter()
+
+        for i in range(_TVDBClientBase.Constants.MAX_AUTH_RETRY_COUNT):
+            if record is not None:
+                record.retries = i
+
+            try:
+                response = self.transport.send(
+                    "POST",
+                    url,
+                    headers=self._construct_headers(),
+                    timeout=_TVDBClientBase.Constants.AUTH_TIMEOUT,
+                    json_body=login_body,
+                )
+
+                # Since we authenticated successfully, we can break out of the
+                # retry loop
+                break
+            except self.transport.timeout_exceptions as ex:
+                will_retry = i < (_TVDBClientBase.Constants.MAX_AUTH_RETRY_COUNT - 1)
+                if will_retry:
+                    Log.warning("Authentication timed out, but will retry.")
+                else:
+                    Log.error("Authentication timed out maximum number of times.")
+
+                    if record is not None:
+                        record.network = time.perf_counter() - started
+                        record.error = ex
+
+                    raise TVDBAuthenticationException(
+                        "Authentication timed out maximum number of times."
+                    ) from ex
+
+        if record is not None:
+            record.network = time.perf_counter() - started
+            record.set_response(response)
+
+        return response
+
+    def get(self, url_path: str, *, timeout: float) -> Any:
+        """Execute a GET request to the TVDB API.
+
+        Args:
+            url_path: The API endpoint path
+            timeout: Request timeout in seconds
+
+        Returns:
+            The data from the API response
+
+        Raises:
+            ValueError: If url_path is invalid
+            NotFoundException: If the resource is not found
+            TVDBException: For other API errors
+        """
+
+        if not url_path:
+            raise ValueError("An invalid URL path was supplied")
+
+        with self._recording() as recorder:
+            auth_started = time.perf_counter()
+            self.authenticate()
+            auth_wait = time.perf_counter() - auth_started
+
+            url = self._expand_url(url_path)
+            content = self._get_page(url, timeout=timeout, recorder=recorder, auth_wait=auth_wait)
+
+            if recorder is not None:
+                recorder.set_source(url)
+
+        return content["data"]
+
+    def _get_page(
+        self,
+        url: str,
+        *,
+        timeout: float,
+        recorder: RequestRecorder | None = None,
+        auth_wait: float = 0.0,
+        page: int = 0,
+    ) -> Any:
+        """Fetch a single page of data.
+
+        Args:
+            url: The full URL of the page
+            timeout: Request timeout in seconds
+            recorder: Recorder to add a timing record to, if any
+            auth_wait: Time spent authenticating before this request, for the record
+            page: The page number, for tracing
+
+        Returns:
+            The decoded JSON content of the page
+
+        Raises:
+            NotFoundException: If the resource is not found
+            TVDBException: For other API errors
+        """
+
+        Log.info("GET: %s", url)
+
+        record = None
+
+        if recorder is not None:
+            record = RequestRecord("GET", url)
+            record.auth_wait = auth_wait
+            recorder.add(record)
+
+        with span("get_page", {"url.full": url, "libtvdb.page": page}) as current_span:
+            try:
+                started = time.perf_counter()
+                response = self.transport.send(
+                    "GET", url, headers=self._construct_headers(), timeout=timeout
+                )
+                network = time.perf_counter() - started
+
+                if record is not None:
+                    record.network = network
+                    record.set_response(response)
+
+                if current_span is not None and current_span.is_recording():
+                    current_span.set_attribute("http.response.status_code", response.status_code)
+                    current_span.set_attribute("libtvdb.payload_size", len(response.content))
+
+                    wire_bytes = encoded_size(response)
+                    if wire_bytes is not None:
+                        current_span.set_attribute("http.response.body.size", wire_bytes)
+
+                TVDBClient._check_errors(response)
+
+                started = time.perf_counter()
+                content = response.json()
+
+                if record is not None:
+                    record.json_decode = time.perf_counter() - started
+            except Exception as ex:
+                if record is not None:
+                    record.error = ex
+                raise
+
+        if content.get("data") is None:
+            raise NotFoundException(f"Could not get data for path: {url}")
+
+        return content
+
+    @staticmethod
+    def _remaining_page_urls(links: dict[str, Any]) -> list[str] | None:
+        """Work out the URLs of every page after the first one.
+
+        Args:
+            links: The links section of the first page
+
+        Returns:
+            The page URLs, or None if the page count can't be determined
+        """
+
+        total_items = links.get("total_items")
+        page_size = links.get("page_size")
+        next_url = links.get("next")
+
+        if not total_items or not page_size or not next_url:
+            return None
+
+        parsed = urllib.parse.urlsplit(next_url)
+        query = urllib.parse.parse_qs(parsed.query)
+
+        if "page" not in query:
+            return None
+
+        first_page = int(query["page"][0])
+        page_count = -(-int(total_items) // int(page_size))
+
+        urls = []
+
+        for page in range(first_page, page_count):
+            query["page"] = [str(page)]
+            urls.append(
+                urllib.parse.urlunsplit(
+                    parsed._replace(query=urllib.parse.urlencode(query, doseq=True))
+                )
+            )
+
+        return urls
+
+    def get_paged(
+        self,
+        url_path: str,
+        *,
+        timeout: float,
+        key: str | None = None,
+        max_workers: int = 1,
+    ) -> list[Any]:
+        """Execute a GET request for paginated data.
+
+        With more than one worker, the first page is used to work out how many
+        pages there are and the rest are fetched concurrently. If the API
+        doesn't report the item count, or the last of those pages links to
+        another, the remaining pages are fetched one at a time.
+
+        Args:
+            url_path: The API endpoint path
+            timeout: Request timeout in seconds
+            key: Optional key to extract from each page's data
+            max_workers: Maximum number of pages to fetch at once (default: 1)
+
+        Returns:
+            Combined list of all paginated results
+
+        Raises:
+            ValueError: If url_path is invalid
+            NotFoundException: If the resource is not found
+            TVDBException: For other API errors
+        """
+
+        if not url_path:
+            raise ValueError("An invalid URL path was supplied")
+
+        with self._recording() as recorder:
+            auth_started = time.perf_counter()
+            self.authenticate()
+            auth_wait = time.perf_counter() - auth_started
+
+            return self._get_all_pages(
+                self._expand_url(url_path),
+                timeout=timeout,
+                key=key,
+                max_workers=max_workers,
+                recorder=recorder,
+                auth_wait=auth_wait,
+            )
+
+    def _get_all_pages(
+        self,
+        url: str,
+        *,
+        timeout: float,
+        key: str | None,
+        max_workers: int,
+        recorder: RequestRecorder | None,
+        auth_wait: float,
+    ) -> list[Any]:
+        """Fetch and combine every page of a paginated request.
+
+        Args:
+            url: The full URL of the first page
+            timeout: Request timeout in seconds
+            key: Optional key to extract from each page's data
+            max_workers: Maximum number of pages to fetch at once
+            recorder: Recorder to add timing records to, if any
+            auth_wait: Time spent authenticating before the first request
+
+        Returns:
+            Combined list of all paginated results
+        """
+
+        all_results: list[Any] = []
+
+        def add_page(content: Any) -> None:
+            if key is None:
+                all_results.extend(content["data"])
+            else:
+                all_results.extend(content["data"][key])
+
+        content: Any = self._get_page(url, timeout=timeout, recorder=recorder, auth_wait=auth_wait)
+        add_page(content)
+
+        links = content.get("links")
+        page_number = 0
+
+        if max_workers > 1 and links is not None and links.get("next"):
+            page_urls = TVDBClient._remaining_page_urls(links)
+
+            if page_urls is not None:
+                Log.debug("Fetching %s more pages concurrently", len(page_urls))
+
+                page_numbers = {page_url: number for number, page_url in enumerate(page_urls, 1)}
+
+                pages = {
+                    result.identifier: result
+                    for result in bounded_map(
+                        propagate(
+                            lambda page_url: self._get_page(
+                                page_url,
+                                timeout=timeout,
+                                recorder=recorder,
+                                page=page_numbers[page_url],
+                            )
+                        ),
+                        page_urls,
+                        max_workers=max_workers,
+                    )
+                }
+
+                for page_url in page_urls:
+                    page = pages[page_url]
+                    if page.error is not None:
+                        raise page.error
+                    content = page.value
+                    add_page(content)
+                    links = content.get("links")
+                    url = page_url
+
+                # If the item count was wrong, page on from the last page that was fetched
+                page_number = len(page_urls)
+
+        while links is not None and links.get("next"):
+            Log.debug("Fetching next page")
+            page_number += 1
+            url = links["next"]
+            content = self._get_page(url, timeout=timeout, recorder=recorder, page=page_number)
+            add_page(content)
+            links = content.get("links")
+
+        if recorder is not None:
+            recorder.set_source(url)
+
+        return all_results
+
+    def search_show(self, show_name: str, *, timeout: float | None = None) -> list[Show]:
+        """Search for shows matching the name supplied.
+
+        Args:
+            show_name: The name of the show to search for
+            timeout: Request timeout in seconds (default: 10.0)
+
+        Returns:
+            List of matching shows, empty list if no matches or invalid input
+        """
+        if timeout is None:
+            timeout = _TVDBClientBase.Constants.DEFAULT_TIMEOUT
+
+        if not show_name:
+            return []
+
+        encoded_name = urllib.parse.quote(show_name)
+
+        Log.info("Searching for show: %s", show_name)
+
+        with self._recording() as recorder, span("search_show", {"libtvdb.query": show_name}):
+            shows_data = self.get(f"search?type=series&query={encoded_name}", timeout=timeout)
+
+            with timing_model_build(recorder), span("deserialize"):
+                return [self._deserialize_show(show_data) for show_data in shows_data]
+
+    def show_info(
+        self,
+        show_identifier: int,
+        *,
+        detail: ShowDetail = ShowDetail.EXTENDED,
+        timeout: float | None = None,
+        refresh: bool = False,
+    ) -> Show | None:
+        """Get the full information for the show with the given identifier.
+
+        Fields that aren't part of the requested level of detail are left as
+        None. Only full (`ShowDetail.EXTENDED`) records are read from or
+        written to the mirror.
+
+        Args:
+            show_identifier: The TVDB ID of the show
+            detail: How much information to fetch (default: everything)
+            timeout: Request timeout in seconds (default: 10.0)
+            refresh: Fetch from the API even if the mirror has a fresh copy, and store the result
+
+        Returns:
+            Show object with detailed information
+
+        Raises:
+            NotFoundException: If the show is not found
+            TVDBException: For other API errors
+        """
+        return self._show_info(show_identifier, detail=detail, timeout=timeout, refresh=refresh)
+
+    def _show_info(
+        self,
+        show_identifier: int,
+        *,
+        detail: ShowDetail,
+        timeout: float | None,
+        refresh: bool = False,
+        pool: DeserializationPool | None = None,
+    ) -> Show:
+        """Get a show, as `show_info` does.
+
+        Args:
+            show_identifier: The TVDB ID of the show
+            detail: How much information to fetch
+            timeout: Request timeout in seconds (default: 10.0)
+            refresh: Skip reading the mirror
+            pool: Worker processes to deserialize the show in (default: this process)
+
+        Returns:
+            Show object with detailed information
+        """
+        if timeout is None:
+            timeout = _TVDBClientBase.Constants.DEFAULT_TIMEOUT
+
+        use_mirror = self.mirror is not None and detail == ShowDetail.EXTENDED
+
+        if self.mirror is not None and use_mirror and not refresh:
+            mirrored_show = self.mirror.show(show_identifier)
+            self._observe_cache("mirror", hit=mirrored_show is not None)
+            if mirrored_show is not None:
+                Log.debug("Using mirrored data for show: %s", show_identifier)
+                self.remote_id_index.add_show(mirrored_show)
+                return mirrored_show
+
+        Log.info("Fetching %s data for show: %s", detail.value, show_identifier)
+
+        with (
+            self._recording() as recorder,
+            span("show_info", {"tvdb.series_id": show_identifier, "libtvdb.detail": detail.name}),
+        ):
+            show_data = self.get(detail.path(show_identifier), timeout=timeout)
+
+            with timing_model_build(recorder), span("deserialize"):
+                show = self._deserialize_show(show_data, pool)
+
+        if self.mirror is not None and use_mirror:
+            self.mirror.store_show(show)
+
+        return show
+
+    def episodes_from_show_id(
+        self,
+        show_identifier: int | str,
+        timeout: float | None = None,
+        *,
+        max_workers: int = 1,
+        refresh: bool = False,
+    ) -> EpisodeCollection:
+        """Get the episodes in the given show.
+
+        Args:
+            show_identifier: The TVDB ID of the show
+            timeout: Request timeout in seconds (default: 10.0)
+            max_workers: Maximum number of pages to fetch at once (default: 1)
+            refresh: Fetch from the API even if the mirror has a fresh copy, and store the result
+
+        Returns:
+            List of episodes for the show, with lookup indexes
+
+        Raises:
+            NotFoundException: If the show is not found
+            TVDBException: For other API errors
+        """
+        if timeout is None:
+            timeout = _TVDBClientBase.Constants.DEFAULT_TIMEOUT
+
+        if self.mirror is not None and not refresh:
+            mirrored_episodes = self.mirror.episodes_for_show(show_identifier)
+            self._observe_cache("mirror", hit=mirrored_episodes is not None)
+            if mirrored_episodes is not None:
+                Log.debug("Using mirrored episodes for show id: %s", show_identifier)
+                for mirrored_episode in mirrored_episodes:
+                    self.remote_id_index.add_episode(mirrored_episode)
+                return EpisodeCollection(mirrored_episodes)
+
+        Log.info("Fetching episodes for show id: %s", show_identifier)
+
+        with (
+            self._recording() as recorder,
+            span("episodes_from_show_id", {"tvdb.series_id": show_identifier}),
+        ):
+            episode_data = self.get_paged(
+                f"series/{show_identifier}/episodes/default",
+                timeout=timeout,
+                key="episodes",
+                max_workers=max_workers,
+            )
+
+            with timing_model_build(recorder), span("deserialize"):
+                episodes = EpisodeCollection(
+                    self._deserialize_episode(episode_data_item)
+                    for episode_data_item in episode_data
+                )
+
+        if self.mirror is not None:
+            self.mirror.store_episodes(episodes, series_id=int(show_identifier))
+
+        return episodes
+
+    def episodes_from_show(self, show: Show, timeout: float | None = None) -> EpisodeCollection:
+        """Get the episodes in the given show.
+
+        Args:
+            show: The Show object
+            timeout: Request timeout in seconds (default: 10.0)
+
+        Returns:
+            List of episodes for the show, with lookup indexes
+
+        Raises:
+            ValueError: If the show does not have a tvdb_id
+            NotFoundException: If the show is not found
+            TVDBException: For other API errors
+        """
+        if show.tvdb_id is None:
+            raise ValueError("Show must have a tvdb_id")
+        return self.episodes_from_show_id(show.tvdb_id, timeout=timeout)
+
+    def episode_by_id(self, episode_identifier: int, timeout: float | None = None) -> Episode:
+        """Get the episode information from its ID.
+
+        Args:
+            episode_identifier: The TVDB ID of the episode
+            timeout: Request timeout in seconds (default: 10.0)
+
+        Returns:
+            Episode object with detailed information
+
+        Raises:
+            NotFoundException: If the episode is not found
+            TVDBException: For other API errors
+        """
+        return self._episode_by_id(episode_identifier, timeout=timeout)
+
+    def _episode_by_id(
+        self,
+        episode_identifier: int,
+        *,
+        timeout: float | None,
+        pool: DeserializationPool | None = None,
+    ) -> Episode:
+        """Get an episode, as `episode_by_id` does.
+
+        Args:
+            episode_identifier: The TVDB ID of the episode
+            timeout: Request timeout in seconds (default: 10.0)
+            pool: Worker processes to deserialize the episode in (default: this process)
+
+        Returns:
+            Episode object with detailed information
+        """
+        if timeout is None:
+            timeout = _TVDBClientBase.Constants.DEFAULT_TIMEOUT
+
+        Log.info("Fetching info for episode id: %s", episode_identifier)
+
+        with (
+            self._recording() as recorder,
+            span("episode_by_id", {"tvdb.episode_id": episode_identifier}),
+        ):
+            episode_data = self.get(f"episodes/{episode_identifier}/extended", timeout=timeout)
+
+            with timing_model_build(recorder), span("deserialize"):
+                return self._deserialize_episode(episode_data, pool)
+
+    def shows_by_id_many(
+        self,
+        show_identifiers: Iterable[int],
+        *,
+        detail: ShowDetail = ShowDetail.EXTENDED,
+        max_workers: int | None = None,
+        timeout: float | None = None,
+        processes: int | None = None,
+        refresh: bool = False,
+    ) -> Iterator[BulkResult[int, Show]]:
+        """Get the information for many shows concurrently.
+
+        This works like `episodes_by_id_many`. Building a show is expensive
+        enough that large batches are deserialized in worker processes, so
+        that every core can be used while the requests are in flight.
+
+        Args:
+            show_identifiers: The TVDB IDs of the shows
+            detail: How much information to fetch (default: everything)
+            max_workers: Maximum number of concurrent requests (default: 8)
+            timeout: Request timeout in seconds for each request (default: 10.0)
+            processes: Number of processes to deserialize in, or 0 for this process.
+                By default processes are used for a list of at least
+                `Constants.PROCESS_POOL_MIN_SHOWS` IDs on a machine with more than one core.
+            refresh: Fetch every show from the API even if the mirror has a fresh copy
+
+        Returns:
+            Results for each distinct show ID, in completion order
+
+        Raises:
+            ValueError: If max_workers is less than 1 or processes is negative
+            TVDBAuthenticationException: If authentication fails
+        """
+        workers = worker_count(
+            show_identifiers, processes, threshold=_TVDBClientBase.Constants.PROCESS_POOL_MIN_SHOWS
+        )
+
+        return self._bulk(
+            lambda identifier, pool: self._show_info(
+                identifier, detail=detail, timeout=timeout, refresh=refresh, pool=pool
+            ),
+            show_identifiers,
+            max_workers=max_workers,
+            processes=workers,
+        )
+
+    def episodes_by_id_many(
+        self,
+        episode_identifiers: Iterable[int],
+        *,
+        max_workers: int | None = None,
+        timeout: float | None = None,
+        processes: int | None = None,
+    ) -> Iterator[BulkResult[int, Episode]]:
+        """Get the episode information for many episode IDs concurrently.
+
+        Repeated IDs are only fetched once. Results are yielded as soon as each
+        request completes, so they will not be in the same order as the input.
+        A failed lookup does not stop the iteration; the exception is reported
+        on the result for that ID instead.
+
+        Args:
+            episode_identifiers: The TVDB IDs of the episodes
+            max_workers: Maximum number of concurrent requests (default: 8)
+            timeout: Request timeout in seconds for each request (default: 10.0)
+            processes: Number of processes to deserialize in, or 0 for this process.
+                By default processes are used for a list of at least
+                `Constants.PROCESS_POOL_MIN_EPISODES` IDs on a machine with more than one core.
+
+        Returns:
+            Results for each distinct episode ID, in completion order
+
+        Raises:
+            ValueError: If max_workers is less than 1 or processes is negative
+            TVDBAuthenticationException: If authentication fails
+        """
+        workers = worker_count(
+            episode_identifiers,
+            processes,
+            threshold=_TVDBClientBase.Constants.PROCESS_POOL_MIN_EPISODES,
+        )
+
+        return self._bulk(
+            lambda identifier, pool: (
+                self.episode_by_id(identifier, timeout=timeout)
+                if pool is None
+                else self._episode_by_id(identifier, timeout=timeout, pool=pool)
+            ),
+            episode_identifiers,
+            max_workers=max_workers,
+            processes=workers,
+        )
+
+    def _bulk(
+        self,
+        lookup: Callable[[int, DeserializationPool | None], V],
+        identifiers: Iterable[int],
+        *,
+        max_workers: int | None,
+        processes: int,
+    ) -> Iterator[BulkResult[int, V]]:
+        """Run a lookup for many IDs concurrently.
+
+        Args:
+            lookup: Fetches and builds the record for an ID, given the pool to build it in
+            identifiers: The IDs to look up
+            max_workers: Maximum number of concurrent requests (default: 8)
+            processes: Number of processes to deserialize in, or 0 for this process
+
+        Returns:
+            Results for each distinct ID, in completion order
+
+        Raises:
+            ValueError: If max_workers is less than 1
+            TVDBAuthenticationException: If authentication fails
+        """
+        if max_workers is None:
+            max_workers = _TVDBClientBase.Constants.DEFAULT_MAX_WORKERS
+
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        # Authenticate up front so that the workers don't all race to log in
+        self.authenticate()
+
+        if processes == 0:
+            Log.info("Fetching in bulk with %s workers", max_workers)
+            return bounded_map(
+                propagate(lambda identifier: lookup(identifier, None)),
+                unique(identifiers),
+                max_workers=max_workers,
+            )
+
+        Log.info(
+            "Fetching in bulk with %s workers, deserializing in %s processes",
+            max_workers,
+            processes,
+        )
+        return self._bulk_in_processes(lookup, identifiers, max_workers, processes)
+
+    @staticmethod
+    def _bulk_in_processes(
+        lookup: Callable[[int, DeserializationPool | None], V],
+        identifiers: Iterable[int],
+        max_workers: int,
+        processes: int,
+    ) -> Iterator[BulkResult[int, V]]:
+        # A generator, so that the pool lasts until the results have been consumed
+        with DeserializationPool(processes) as pool:
+            yield from bounded_map(
+                propagate(lambda identifier: lookup(identifier, pool)),
+                unique(identifiers),
+                max_workers=max_workers,
+            )
+
+    def updates(
+        self, since: int, *, entity_type: str | None = None, timeout: float | None = None
+    ) -> list[EntityUpdate]:
+        """Get the records that have changed since the given time.
+
+        Args:
+            since: Unix timestamp to get changes from
+            entity_type: Optional entity type to filter on (e.g. "series", "episodes")
+            timeout: Request timeout in seconds (default: 10.0)
+
+        Returns:
+            List of updates since the given time
+
+        Raises:
+            NotFoundException: If the updates could not be retrieved
+            TVDBException: For other API errors
+        """
+        if timeout is None:
+            timeout = _TVDBClientBase.Constants.DEFAULT_TIMEOUT
+
+        Log.info("Fetching updates since: %s", since)
+
+        query: dict[str, str | int] = {"since": since}
+
+        if entity_type is not None:
+            query["type"] = entity_type
+
+        with self._recording() as recorder, span("updates", {"libtvdb.since": since}):
+            updates_data = self.get_paged(
+                f"updates?{urllib.parse.urlencode(query)}", timeout=timeout
+            )
+
+            with timing_model_build(recorder), span("deserialize"):
+                return [
+                    deserialize.deserialize(EntityUpdate, update_data, throw_on_unhandled=True)
+                    for update_data in updates_data
+                ]
+
+    def search_remote_id(
+        self, remote_id: str, *, timeout: float | None = None
+    ) -> list[RemoteIDSearchResult]:
+        """Search for the TVDB records matching an ID from another site.
+
+        Args:
+            remote_id: The ID on the remote site (e.g. an IMDb or TMDB ID)
+            timeout: Request timeout in seconds (default: 10.0)
+
+        Returns:
+            List of matching records, empty list if invalid input
+
+        Raises:
+            TVDBException: For API errors
+        """
+        if timeout is None:
+            timeout = _TVDBClientBase.Constants.DEFAULT_TIMEOUT
+
+        if not remote_id:
+            return []
+
+        Log.info("Searching for remote id: %s", remote_id)
+
+        with (
+            self._recording() as recorder,
+            span("search_remote_id", {"libtvdb.remote_id": str(remote_id)}),
+        ):
+            try:
+                results_data = self.get(
+                    f"search/remoteid/{urllib.parse.quote(str(remote_id))}", timeout=timeout
+                )
+            except NotFoundException:
+                return []
+
+            with timing_model_build(recorder), span("deserialize"):
+                results = [
+                    deserialize.deserialize(
+                        RemoteIDSearchResult, result_data, throw_on_unhandled=True
+                    )
+                    for result_data in results_data
+                ]
+
+        for result in results:
+            if result.series is not None:
+                self.remote_id_index.add_show(result.series)
+                self.remote_id_index.add(remote_id, "series", series_id(result.series))
+
+            if result.episode is not None:
+                self.remote_id_index.add_episode(result.episode)
+                self.remote_id_index.add(remote_id, "episode", result.episode.identifier)
+
+        return results
+
+    def resolve_remote_id(
+        self, remote_id: str, *, source_name: str | None = None, timeout: float | None = None
+    ) -> list[RemoteIDTarget]:
+        """Find the TVDB shows and episodes an ID from another site refers to.
+
+        Every show and episode this client deserializes has its remote IDs
+        added to `remote_id_index`, so this is usually answered without a
+        request. The API is only searched for remote IDs that haven't been seen,
+        and a remote ID that wasn't found isn't searched for again until
+        `remote_id_index.miss_ttl` has passed.
+
+        Args:
+            remote_id: The ID on the remote site (e.g. an IMDb or TMDB ID)
+            source_name: Only return matches from this source (e.g. "IMDB")
+            timeout: Request timeout in seconds (default: 10.0)
+
+        Returns:
+            List of matching TVDB records, empty if there are none
+
+        Raises:
+            TVDBException: For API errors
+        """
+        targets = self.remote_id_index.lookup(remote_id, source_name=source_name)
+        known_miss = not targets and self.remote_id_index.is_known_miss(remote_id)
+        self._observe_cache("remote_ids", hit=bool(targets) or known_miss)
+
+        if targets or known_miss:
+            return targets
+
+        self.search_remote_id(remote_id, timeout=timeout)
+        targets = self.remote_id_index.lookup(remote_id, source_name=source_name)
+
+        if not targets:
+            self.remote_id_index.add_miss(remote_id)
+
+        return targets
+
+    def show_with_episodes(
+        self,
+        show_identifier: int,
+        *,
+        max_workers: int | None = None,
+        timeout: float | None = None,
+    ) -> Show:
+        """Get a show along with all of its episodes.
+
+        This asks for the episodes inline with the show, which is a single
+        request. If the API doesn't include them, the episode pages are
+        fetched concurrently instead. The show is the short extended record
+        (see `ShowDetail.WITH_EPISODES`), so characters, artworks and trailers
+        are not included.
+
+        Args:
+            show_identifier: The TVDB ID of the show
+            max_workers: Maximum number of episode pages to fetch at once (default: 8)
+            timeout: Request timeout in seconds (default: 10.0)
+
+        Returns:
+            Show object with its episodes populated
+
+        Raises:
+            NotFoundException: If the show is not found
+            TVDBException: For other API errors
+        """
+        if max_workers is None:
+            max_workers = _TVDBClientBase.Constants.DEFAULT_MAX_WORKERS
+
+        with span("show_with_episodes", {"tvdb.series_id": show_identifier}):
+            show = self.show_info(show_identifier, detail=ShowDetail.WITH_EPISODES, timeout=timeout)
+
+            if show is None:
+                raise NotFoundException(f"Could not find show: {show_identifier}")
+
+            # An empty list means the show has no episodes, not that they weren't inlined
+            if show.episodes is None:
+                Log.debug("No inline episodes for show id: %s, fetching pages", show_identifier)
+                show.episodes = self.episodes_from_show_id(
+                    show_identifier, timeout=timeout, max_workers=max_workers
+                )
+            elif self.mirror is not None:
+                self.mirror.store_episodes(show.episodes, series_id=int(show_identifier))
+
+            return show
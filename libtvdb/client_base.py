@@ -0,0 +1,478 @@
+"""Shared logic and the public interface for the TVDB API clients."""
+
+import contextlib
+import enum
+import json
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING, Any, ClassVar
+
+from libtvdb.compression import accept_encoding_header
+from libtvdb.exceptions import NotFoundException, TVDBException
+from libtvdb.instrumentation import RequestHook, RequestRecorder
+from libtvdb.model import Episode, EpisodeCollection, Show
+from libtvdb.processes import DeserializationPool, build_model
+from libtvdb.remote_ids import RemoteIDIndex
+from libtvdb.transport import RequestsTransport, Response, Transport
+from libtvdb.utilities import Log
+
+if TYPE_CHECKING:
+    from libtvdb.metrics import MetricsRegistry
+    from libtvdb.mirror import Mirror
+
+
+class ShowDetail(enum.Enum):
+    """How much information to request for a show.
+
+    Less detail means a smaller payload to download and deserialize:
+
+    - BASE: The base series record with no nested collections
+    - EXTENDED_SHORT: The extended record without characters, artworks or trailers
+    - EXTENDED: The extended record with every nested collection
+    - WITH_EPISODES: The short extended record with the episodes included inline
+    """
+
+    BASE = "base"
+    EXTENDED_SHORT = "extended_short"
+    EXTENDED = "extended"
+    WITH_EPISODES = "with_episodes"
+
+    def path(self, show_identifier: int | str) -> str:
+        """Get the cheapest endpoint path that serves this level of detail.
+
+        Args:
+            show_identifier: The TVDB ID of the show
+
+        Returns:
+            The API endpoint path
+        """
+        if self == ShowDetail.BASE:
+            return f"series/{show_identifier}"
+
+        if self == ShowDetail.EXTENDED_SHORT:
+            return f"series/{show_identifier}/extended?short=true"
+
+        if self == ShowDetail.WITH_EPISODES:
+            return f"series/{show_identifier}/extended?meta=episodes&short=true"
+
+        return f"series/{show_identifier}/extended"
+
+
+class _TVDBClientBase(ABC):
+    """Base class with shared logic for both sync and async clients."""
+
+    class Constants:
+        """Constants that are used elsewhere in the TVDB client classes."""
+
+        AUTH_TIMEOUT: ClassVar[float] = 3
+        MAX_AUTH_RETRY_COUNT: ClassVar[int] = 3
+        DEFAULT_TIMEOUT: ClassVar[float] = 10.0
+        DEFAULT_MAX_WORKERS: ClassVar[int] = 8
+        # The smallest bulk lookups worth deserializing in worker processes
+        PROCESS_POOL_MIN_SHOWS: ClassVar[int] = 100
+        PROCESS_POOL_MIN_EPISODES: ClassVar[int] = 5000
+        SUCCESS_STATUS_MIN: ClassVar[int] = 200
+        SUCCESS_STATUS_MAX: ClassVar[int] = 300
+
+    _BASE_API: ClassVar[str] = "https://api4.thetvdb.com/v4"
+    base_url: str
+    api_key: str
+    pin: str | None
+    auth_token: str | None
+    mirror: "Mirror | None"
+    remote_id_index: RemoteIDIndex
+    request_hooks: list[RequestHook]
+    metrics: "MetricsRegistry | None"
+    transport: Transport
+    accept_encoding: str
+
+    def __init__(
+        self,
+        *,
+        api_key: str,
+        pin: str | None = None,
+        mirror: "Mirror | None" = None,
+        metrics: "MetricsRegistry | None" = None,
+        base_url: str | None = None,
+        transport: Transport | None = None,
+        accept_encoding: Iterable[str] | None = None,
+    ) -> None:
+        """Create a new client wrapper.
+
+        Args:
+            api_key: The TVDB API key for authentication
+            pin: The TVDB PIN for authentication
+            mirror: Optional local mirror to answer show and episode lookups from
+            metrics: Optional registry to record request and cache metrics in
+            base_url: The root of the API (default: https://api4.thetvdb.com/v4)
+            transport: What to send HTTP requests with (default: `requests`)
+            accept_encoding: The content encodings to accept, most preferred first
+                (default: every encoding that can be decoded, see `available_encodings`)
+
+        Raises:
+            TVDBException: If api_key or pin is None or empty
+            ValueError: If an encoding in accept_encoding can't be decoded
+        """
+
+        if not api_key:
+            raise TVDBException("No API key was supplied")
+
+        self.base_url = (base_url or _TVDBClientBase._BASE_API).rstrip("/")
+        self.transport = transport or RequestsTransport()
+        self.accept_encoding = accept_encoding_header(accept_encoding)
+        self.api_key = api_key
+        self.pin = pin
+        self.auth_token = None
+        self.mirror = mirror
+        self.remote_id_index = RemoteIDIndex()
+        self.request_hooks = []
+        self._recording_state = threading.local()
+        self.metrics = metrics
+
+        if metrics is not None:
+            self.add_request_hook(metrics.observe_request)
+
+    def _expand_url(self, path: str) -> str:
+        """Take the path from a URL and expand it to the full API path.
+
+        Args:
+            path: API endpoint path (e.g., "login", "series/123")
+
+        Returns:
+            Full API URL with base path prepended
+        """
+        return f"{self.base_url}/{path}"
+
+    def _construct_headers(self, *, additional_headers: Any | None = None) -> dict[str, str]:
+        """Construct the headers used for all requests.
+
+        Args:
+            additional_headers: Optional dict of additional headers to include
+
+        Returns:
+            Dictionary of HTTP headers for the request
+        """
+
+        headers = {"Accept": "application/json", "Accept-Encoding": self.accept_encoding}
+
+        if self.auth_token is not None:
+            headers["Authorization"] = f"Bearer {self.auth_token}"
+
+        if additional_headers is None:
+            return headers
+
+        for header_name, header_value in additional_headers.items():
+            headers[header_name] = header_value
+
+        return headers
+
+    def add_request_hook(self, hook: RequestHook) -> None:
+        """Register a function to be called with a `RequestRecord` for every request.
+
+        Hooks are called on the thread that made the client call, once that
+        call has finished. Exceptions raised by a hook are not caught.
+
+        Args:
+            hook: The function to call
+        """
+        self.request_hooks.append(hook)
+
+    def remove_request_hook(self, hook: RequestHook) -> None:
+        """Stop calling a previously registered request hook.
+
+        Args:
+            hook: The function to remove
+
+        Raises:
+            ValueError: If the hook was not registered
+        """
+        self.request_hooks.remove(hook)
+
+    def _observe_cache(self, cache: str, *, hit: bool) -> None:
+        """Count a cache lookup if metrics are being recorded.
+
+        Args:
+            cache: The name of the cache
+            hit: True if the lookup was answered from the cache
+        """
+        if self.metrics is not None:
+            self.metrics.observe_cache(cache, hit=hit)
+
+    @contextlib.contextmanager
+    def _recording(self) -> Iterator[RequestRecorder | None]:
+        """Collect request records for the duration of a client call.
+
+        Nested calls on the same thread share the outermost recorder, so the
+        records are only reported once, when the outermost call finishes.
+        Nothing is recorded (and None is yielded) when there are no hooks.
+        """
+        recorder: RequestRecorder | None = getattr(self._recording_state, "recorder", None)
+
+        if recorder is not None or not self.request_hooks:
+            yield recorder
+            return
+
+        recorder = RequestRecorder(self.request_hooks)
+        self._recording_state.recorder = recorder
+
+        try:
+            yield recorder
+        finally:
+            self._recording_state.recorder = None
+            recorder.emit()
+
+    def _deserialize_show(self, show_data: Any, pool: DeserializationPool | None = None) -> Show:
+        """Deserialize a show from the API, fingerprint it and record its remote IDs.
+
+        The remote IDs of any episodes included inline are recorded too.
+
+        Args:
+            show_data: The show data from the API
+            pool: Worker processes to deserialize in (default: this process)
+
+        Returns:
+            The deserialized show
+        """
+        show = build_model(Show, show_data) if pool is None else pool.deserialize(Show, show_data)
+
+        self.remote_id_index.add_show(show)
+
+        if show.episodes is not None:
+            show.episodes = EpisodeCollection(show.episodes)
+
+            for episode in show.episodes:
+                self.remote_id_index.add_episode(episode)
+
+        return show
+
+    def _deserialize_episode(
+        self, episode_data: Any, pool: DeserializationPool | None = None
+    ) -> Episode:
+        """Deserialize an episode from the API, fingerprint it and record its remote IDs.
+
+        Args:
+            episode_data: The episode data from the API
+            pool: Worker processes to deserialize in (default: this process)
+
+        Returns:
+            The deserialized episode
+        """
+        if pool is None:
+            episode = build_model(Episode, episode_data)
+        else:
+            episode = pool.deserialize(Episode, episode_data)
+
+        self.remote_id_index.add_episode(episode)
+        return episode
+
+    @staticmethod
+    def _check_errors(response: Response) -> None:
+        """Check an API response for errors.
+
+        Args:
+            response: The response from the transport
+
+        Raises:
+            NotFoundException: If the resource is not found
+            TVDBException: For other API errors
+        """
+
+        if (
+            _TVDBClientBase.Constants.SUCCESS_STATUS_MIN
+            <= response.status_code
+            < _TVDBClientBase.Constants.SUCCESS_STATUS_MAX
+        ):
+            return
+
+        Log.error("Bad response code from API: %s", response.status_code)
+
+        # Try and read the JSON. If we don't have it, we return the generic
+        # exception type
+        try:
+            data = response.json()
+        except json.JSONDecodeError as ex:
+            raise TVDBException(f"Could not decode error response: {response.text}") from ex
+
+        # Try and get the error message so we can use it
+        error = data.get("Error")
+
+        # If we don't have it, just return the generic exception type
+        if error is None:
+            raise TVDBException(f"Could not get error information: {response.text}")
+
+        if error == "Resource not found":
+            raise NotFoundException(f"Could not find resource: {response.url}")
+
+        raise TVDBException(f"Unknown error: {response.text}")
+
+    @abstractmethod
+    def search_show(self, show_name: str, *, timeout: float | None = None) -> Any:
+        """Search for shows matching the name supplied.
+
+        Args:
+            show_name: The name of the show to search for
+            timeout: Request timeout in seconds (default: 10.0)
+
+        Returns:
+            List of matching shows, empty list if no matches or invalid input
+        """
+
+    @abstractmethod
+    def show_info(
+        self,
+        show_identifier: int,
+        *,
+        detail: ShowDetail = ShowDetail.EXTENDED,
+        timeout: float | None = None,
+    ) -> Any:
+        """Get the full information for the show with the given identifier.
+
+        Args:
+            show_identifier: The TVDB ID of the show
+            detail: How much information to fetch (default: everything)
+            timeout: Request timeout in seconds (default: 10.0)
+
+        Returns:
+            Show object with detailed information
+
+        Raises:
+            NotFoundException: If the show is not found
+            TVDBException: For other API errors
+        """
+
+    @abstractmethod
+    def episodes_from_show_id(
+        self,
+        show_identifier: int | str,
+        timeout: float | None = None,
+        *,
+        max_workers: int = 1,
+    ) -> Any:
+        """Get the episodes in the given show.
+
+        Args:
+            show_identifier: The TVDB ID of the show
+            timeout: Request timeout in seconds (default: 10.0)
+            max_workers: Maximum number of pages to fetch at once (default: 1)
+
+        Returns:
+            List of episodes for the show
+
+        Raises:
+            NotFoundException: If the show is not found
+            TVDBException: For other API errors
+        """
+
+    @abstractmethod
+    def episodes_from_show(self, show: Show, timeout: float | None = None) -> Any:
+        """Get the episodes in the given show.
+
+        Args:
+            show: The Show object
+            timeout: Request timeout in seconds (default: 10.0)
+
+        Returns:
+            List of episodes for the show
+
+        Raises:
+            ValueError: If the show does not have a tvdb_id
+            NotFoundException: If the show is not found
+            TVDBException: For other API errors
+        """
+
+    @abstractmethod
+    def episode_by_id(self, episode_identifier: int, timeout: float | None = None) -> Any:
+        """Get the episode information from its ID.
+
+        Args:
+            episode_identifier: The TVDB ID of the episode
+            timeout: Request timeout in seconds (default: 10.0)
+
+        Returns:
+            Episode object with detailed information
+
+        Raises:
+            NotFoundException: If the episode is not found
+            TVDBException: For other API errors
+        """
+
+    @abstractmethod
+    def episodes_by_id_many(
+        self,
+        episode_identifiers: Iterable[int],
+        *,
+        max_workers: int | None = None,
+        timeout: float | None = None,
+    ) -> Any:
+        """Get the episode information for many episode IDs concurrently.
+
+        Args:
+            episode_identifiers: The TVDB IDs of the episodes
+            max_workers: Maximum number of concurrent requests (default: 8)
+            timeout: Request timeout in seconds for each request (default: 10.0)
+
+        Returns:
+            Results for each distinct episode ID, in completion order
+        """
+
+    @abstractmethod
+    def updates(
+        self, since: int, *, entity_type: str | None = None, timeout: float | None = None
+    ) -> Any:
+        """Get the records that have changed since the given time.
+
+        Args:
+            since: Unix timestamp to get changes from
+            entity_type: Optional entity type to filter on (e.g. "series", "episodes")
+            timeout: Request timeout in seconds (default: 10.0)
+
+        Returns:
+            List of updates since the given time
+        """
+
+    @abstractmethod
+    def search_remote_id(self, remote_id: str, *, timeout: float | None = None) -> Any:
+        """Search for the TVDB records matching an ID from another site.
+
+        Args:
+            remote_id: The ID on the remote site (e.g. an IMDb or TMDB ID)
+            timeout: Request timeout in seconds (default: 10.0)
+
+        Returns:
+            List of matching records
+        """
+
+    @abstractmethod
+    def resolve_remote_id(
+        self, remote_id: str, *, source_name: str | None = None, timeout: float | None = None
+    ) -> Any:
+        """Find the TVDB shows and episodes an ID from another site refers to.
+
+        Args:
+            remote_id: The ID on the remote site (e.g. an IMDb or TMDB ID)
+            source_name: Only return matches from this source (e.g. "IMDB")
+            timeout: Request timeout in seconds (default: 10.0)
+
+        Returns:
+            List of matching TVDB records
+        """
+
+    @abstractmethod
+    def show_with_episodes(
+        self,
+        show_identifier: int,
+        *,
+        max_workers: int | None = None,
+        timeout: float | None = None,
+    ) -> Any:
+        """Get a show along with all of its episodes.
+
+        Args:
+            show_identifier: The TVDB ID of the show
+            max_workers: Maximum number of episode pages to fetch at once (default: 8)
+            timeout: Request timeout in seconds (default: 10.0)
+
+        Returns:
+            Show object with its episodes populated
+        """
@@ -0,0 +1,100 @@
+"""Negotiating compressed responses and measuring how much they save."""
+
+import functools
+import importlib.util
+import sys
+from collections.abc import Iterable
+from typing import Any
+
+# Every encoding urllib3 (and so requests) can decode, in order of preference,
+# with the modules that provide each one. An empty tuple means it is built in.
+_DECODERS: dict[str, tuple[str, ...]] = {
+    "zstd": ("compression.zstd",) if sys.version_info >= (3, 14) else ("backports.zstd",),
+    "br": ("brotli", "brotlicffi"),
+    "gzip": (),
+    "deflate": (),
+}
+
+
+def _installed(module_name: str) -> bool:
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except ModuleNotFoundError:
+        # The parent package of a dotted name isn't installed
+        return False
+
+
+@functools.cache
+def available_encodings() -> tuple[str, ...]:
+    """Get the content encodings that can be decoded in this environment.
+
+    Brotli and zstd depend on optional packages (`brotli` or `brotlicffi`,
+    and `backports.zstd` before Python 3.14). The modules are looked up
+    rather than imported, so this is cheap to call.
+
+    Returns:
+        The encodings, most preferred first
+    """
+    return tuple(
+        encoding
+        for encoding, modules in _DECODERS.items()
+        if not modules or any(_installed(module) for module in modules)
+    )
+
+
+def accept_encoding_header(encodings: Iterable[str] | None = None) -> str:
+    """Build the Accept-Encoding header for a set of encodings.
+
+    Args:
+        encodings: The encodings to accept, most preferred first (default: all available)
+
+    Returns:
+        The header value. "identity" if no encodings were given.
+
+    Raises:
+        ValueError: If an encoding is unknown or its decoder isn't installed
+    """
+    if encodings is None:
+        return ", ".join(available_encodings())
+
+    requested = [encoding.strip().lower() for encoding in encodings]
+    available = available_encodings()
+
+    for encoding in requested:
+        if encoding not in _DECODERS:
+            raise ValueError(f"Unsupported content encoding: {encoding}")
+        if encoding not in available:
+            raise ValueError(f"The decoder for {encoding} is not installed")
+
+    return ", ".join(requested) if requested else "identity"
+
+
+def encoded_size(response: Any) -> int | None:
+    """Get the number of body bytes a response took on the wire.
+
+    For a compressed response this is the compressed size, while
+    `len(response.content)` is the decompressed size.
+
+    Args:
+        response: A response from a transport
+
+    Returns:
+        The size, or None if the transport doesn't report it
+    """
+    wire_bytes = getattr(response, "wire_bytes", None)
+
+    if isinstance(wire_bytes, int):
+        return wire_bytes
+
+    # A requests response, whose raw urllib3 response counts the bytes it read
+    tell = getattr(getattr(response, "raw", None), "tell", None)
+
+    if not callable(tell):
+        return None
+
+    try:
+        size = tell()
+    except (OSError, ValueError):
+        return None
+
+    return size if isinstance(size, int) else None
@@ -0,0 +1,269 @@
+"""Fingerprints and structural diffs of shows and episodes.
+
+The client sets `fingerprint` on every show and episode it builds, from
+the raw data the API returned for it. Two records with the same
+fingerprint came from identical payloads, so a refresh can be checked for
+changes without comparing any fields. When the fingerprints differ, the
+diff functions report exactly which episodes and fields changed.
+"""
+
+import enum
+import hashlib
+import json
+from collections.abc import Iterable
+from typing import Any
+
+from libtvdb.model import Episode, Show
+from libtvdb.model.serialization import model_fields
+
+# Fields that are never compared: the fingerprint covers the whole record and
+# a show's episodes are compared one by one
+_SKIPPED_FIELDS = frozenset(("fingerprint", "episodes"))
+
+
+def fingerprint(data: Any) -> str:
+    """Compute a stable fingerprint of a payload from the API.
+
+    The data is written as canonical JSON (sorted keys, no whitespace) and
+    hashed, so the result doesn't depend on key order.
+
+    Args:
+        data: The decoded JSON for a record
+
+    Returns:
+        A hex digest that changes whenever any value in the payload changes
+    """
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _comparable(value: Any) -> Any:
+    """Convert a field value to plain data so that nested models compare by content."""
+    if isinstance(value, list):
+        return [_comparable(item) for item in value]
+
+    if isinstance(value, dict):
+        return {key: _comparable(item) for key, item in value.items()}
+
+    if isinstance(value, enum.Enum):
+        return value.value
+
+    if hasattr(value, "__dict__") and type(value).__module__.startswith("libtvdb.model"):
+        return {
+            name: _comparable(getattr(value, name, None))
+            for name in model_fields(type(value))
+            if name not in _SKIPPED_FIELDS
+        }
+
+    return value
+
+
+class FieldChange:
+    """A field that has a different value in the new version of a record."""
+
+    name: str
+    old: Any
+    new: Any
+
+    def __init__(self, name: str, old: Any, new: Any) -> None:
+        self.name = name
+        self.old = old
+        self.new = new
+
+    def __str__(self) -> str:
+        return f"FieldChange<{self.name}>"
+
+    def __repr__(self) -> str:
+        return f"FieldChange<{self.name}: {self.old!r} -> {self.new!r}>"
+
+
+def diff_fields(old: Any, new: Any, *, ignore: Iterable[str] = ()) -> list[FieldChange]:
+    """Compare every field of two versions of a record.
+
+    Nested models and lists are compared by content. The fingerprint and a
+    show's episodes are not compared.
+
+    Args:
+        old: The previous version
+        new: The current version
+        ignore: Names of other fields not to compare (e.g. "last_updated")
+
+    Returns:
+        The fields that changed, in declaration order
+
+    Raises:
+        TypeError: If the records are different types
+    """
+    if type(old) is not type(new):
+        raise TypeError(f"Cannot compare {type(old).__name__} with {type(new).__name__}")
+
+    skipped = _SKIPPED_FIELDS.union(ignore)
+    changes = []
+
+    for name in model_fields(type(new)):
+        if name in skipped:
+            continue
+
+        old_value = getattr(old, name, None)
+        new_value = getattr(new, name, None)
+
+        if _comparable(old_value) != _comparable(new_value):
+            changes.append(FieldChange(name, old_value, new_value))
+
+    return changes
+
+
+def _unchanged(old: Any, new: Any) -> bool:
+    old_fingerprint = getattr(old, "fingerprint", None)
+    return old_fingerprint is not None and old_fingerprint == getattr(new, "fingerprint", None)
+
+
+class EpisodeChange:
+    """An episode that exists in both versions with different fields."""
+
+    old: Episode
+    new: Episode
+    fields: list[FieldChange]
+
+    def __init__(self, old: Episode, new: Episode, fields: list[FieldChange]) -> None:
+        self.old = old
+        self.new = new
+        self.fields = fields
+
+    @property
+    def identifier(self) -> int:
+        """The ID of the episode."""
+        return self.new.identifier
+
+    def __str__(self) -> str:
+        return f"EpisodeChange<{self.identifier}>"
+
+    def __repr__(self) -> str:
+        return f"EpisodeChange<{self.identifier}: {', '.join(c.name for c in self.fields)}>"
+
+
+class EpisodeListDiff:
+    """The differences between two versions of a list of episodes.
+
+    Episodes are matched by ID.
+    """
+
+    added: list[Episode]
+    removed: list[Episode]
+    changed: list[EpisodeChange]
+
+    def __init__(
+        self, added: list[Episode], removed: list[Episode], changed: list[EpisodeChange]
+    ) -> None:
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+
+    @property
+    def has_changes(self) -> bool:
+        """Check if any episode was added, removed or changed."""
+        return bool(self.added or self.removed or self.changed)
+
+    def __str__(self) -> str:
+        return f"EpisodeListDiff<+{len(self.added)} -{len(self.removed)} ~{len(self.changed)}>"
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+def diff_episodes(
+    old: Iterable[Episode], new: Iterable[Episode], *, ignore: Iterable[str] = ()
+) -> EpisodeListDiff:
+    """Compare two versions of a list of episodes.
+
+    Episodes whose fingerprints match are skipped without comparing their
+    fields.
+
+    Args:
+        old: The previous episodes
+        new: The current episodes
+        ignore: Names of fields not to compare
+
+    Returns:
+        The added, removed and changed episodes, each in the order of its list
+    """
+    ignore = tuple(ignore)
+    old_by_id = {episode.identifier: episode for episode in old}
+    new_by_id = {episode.identifier: episode for episode in new}
+    changed = []
+
+    for identifier, new_episode in new_by_id.items():
+        old_episode = old_by_id.get(identifier)
+
+        if old_episode is None or _unchanged(old_episode, new_episode):
+            continue
+
+        fields = diff_fields(old_episode, new_episode, ignore=ignore)
+
+        if fields:
+            changed.append(EpisodeChange(old_episode, new_episode, fields))
+
+    return EpisodeListDiff(
+        added=[episode for key, episode in new_by_id.items() if key not in old_by_id],
+        removed=[episode for key, episode in old_by_id.items() if key not in new_by_id],
+        changed=changed,
+    )
+
+
+class ShowDiff:
+    """The differences between two versions of a show.
+
+    `episodes` is None unless both versions include their episodes.
+    """
+
+    old: Show
+    new: Show
+    fields: list[FieldChange]
+    episodes: EpisodeListDiff | None
+
+    def __init__(
+        self,
+        old: Show,
+        new: Show,
+        fields: list[FieldChange],
+        episodes: EpisodeListDiff | None,
+    ) -> None:
+        self.old = old
+        self.new = new
+        self.fields = fields
+        self.episodes = episodes
+
+    @property
+    def has_changes(self) -> bool:
+        """Check if any field or episode changed."""
+        return bool(self.fields) or (self.episodes is not None and self.episodes.has_changes)
+
+    def __str__(self) -> str:
+        return f"ShowDiff<{self.new.identifier} - {len(self.fields)} fields, {self.episodes}>"
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+def diff_shows(old: Show, new: Show, *, ignore: Iterable[str] = ()) -> ShowDiff:
+    """Compare two versions of a show.
+
+    If the fingerprints match the fields aren't compared. Episodes are
+    compared with `diff_episodes` when both versions have them.
+
+    Args:
+        old: The previous version
+        new: The current version
+        ignore: Names of fields not to compare, on the show and its episodes
+
+    Returns:
+        The differences
+    """
+    ignore = tuple(ignore)
+    fields = [] if _unchanged(old, new) else diff_fields(old, new, ignore=ignore)
+    episodes = None
+
+    if old.episodes is not None and new.episodes is not None:
+        episodes = diff_episodes(old.episodes, new.episodes, ignore=ignore)
+
+    return ShowDiff(old, new, fields, episodes)
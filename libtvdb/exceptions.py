@@ -23,3 +23,19 @@ class TVDBAuthenticationException(TVDBException):
     This can occur due to invalid credentials, network timeouts,
     or server-side authentication issues.
     """
+
+
+class CassetteMissException(TVDBException):
+    """Raised when a request being replayed from a cassette was never recorded.
+
+    This means the code under test makes a request that the cassette was not
+    recorded with, so the cassette needs to be recorded again.
+    """
+
+
+class DownloadException(TVDBException):
+    """Raised when a file such as an artwork image could not be downloaded.
+
+    Anything received before the failure is kept, so that downloading the
+    file again resumes where it stopped.
+    """
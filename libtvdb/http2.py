@@ -0,0 +1,172 @@
+"""An optional HTTP/2 transport built on httpx.
+
+With HTTP/2 every concurrent request to the API shares one connection as a
+separate stream, instead of each worker thread holding its own HTTP/1.1
+connection. This needs `httpx` with its HTTP/2 extra:
+
+    pip install "httpx[http2]"
+
+Servers that don't offer HTTP/2 during the TLS handshake are spoken to over
+HTTP/1.1 on the same client, and if the `h2` package is missing the
+transport uses HTTP/1.1 throughout. `multiplexed_transport` goes one step
+further and falls back to `Urllib3Transport` when httpx isn't installed.
+"""
+
+import importlib.util
+import threading
+from collections.abc import Mapping
+from typing import Any
+
+from libtvdb.transport import Response, Transport, TransportResponse, Urllib3Transport
+from libtvdb.utilities import Log
+
+try:
+    import httpx
+except ImportError:
+    httpx = None  # type: ignore[assignment]
+
+
+def is_available() -> bool:
+    """Check if httpx is installed.
+
+    Returns:
+        True if `HttpxTransport` can be used, False otherwise
+    """
+    return httpx is not None
+
+
+def _h2_installed() -> bool:
+    try:
+        import h2  # noqa: F401 # pylint: disable=import-outside-toplevel,unused-import
+    except ImportError:
+        return False
+    return True
+
+
+def _httpx_accept_encoding(accept_encoding: str) -> str:
+    """Drop zstd from an Accept-Encoding header unless httpx can decode it.
+
+    httpx decodes zstd with the `zstandard` package rather than the modules
+    urllib3 uses, which is what the client's header is based on.
+    """
+    if "zstd" not in accept_encoding or importlib.util.find_spec("zstandard") is not None:
+        return accept_encoding
+
+    codings = [coding.strip() for coding in accept_encoding.split(",")]
+    return ", ".join(coding for coding in codings if coding != "zstd") or "identity"
+
+
+class HttpxTransport(Transport):
+    """Sends requests with an `httpx.Client`, using HTTP/2 where possible.
+
+    The client is safe to share between threads, so the client's concurrent
+    page fetches and bulk lookups are multiplexed over a single connection
+    per host. `http_versions` counts the protocol each response arrived
+    with, to show whether HTTP/2 was actually negotiated.
+    """
+
+    client: "httpx.Client"
+    http2: bool
+    http_versions: dict[str, int]
+
+    def __init__(
+        self,
+        client: "httpx.Client | None" = None,
+        *,
+        http2: bool = True,
+        max_connections: int = 10,
+    ) -> None:
+        """Create a new transport.
+
+        Args:
+            client: The client to send requests with (default: a new client)
+            http2: Offer HTTP/2 when creating a new client. Ignored if `h2` isn't installed.
+            max_connections: The connection limit for a new client
+
+        Raises:
+            ImportError: If httpx isn't installed
+        """
+        if httpx is None:
+            raise ImportError('HttpxTransport requires httpx: pip install "httpx[http2]"')
+
+        if client is None:
+            if http2 and not _h2_installed():
+                Log.warning("The h2 package is not installed, so HTTP/1.1 will be used")
+                http2 = False
+
+            client = httpx.Client(http2=http2, limits=httpx.Limits(max_connections=max_connections))
+
+        self.client = client
+        self.http2 = http2
+        self.http_versions = {}
+        self._lock = threading.Lock()
+
+    @property
+    def timeout_exceptions(self) -> tuple[type[Exception], ...]:
+        """The exceptions `send` raises when a request times out."""
+        return (httpx.TimeoutException, TimeoutError)
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Mapping[str, str],
+        timeout: float,
+        json_body: Any = None,
+    ) -> Response:
+        """Send a request with httpx.
+
+        Args:
+            method: The HTTP method
+            url: The full URL
+            headers: The request headers
+            timeout: Request timeout in seconds
+            json_body: A value to send as the JSON request body, if any
+
+        Returns:
+            The response
+        """
+        request_headers = dict(headers)
+
+        if "Accept-Encoding" in request_headers:
+            request_headers["Accept-Encoding"] = _httpx_accept_encoding(
+                request_headers["Accept-Encoding"]
+            )
+
+        response = self.client.request(
+            method, url, headers=request_headers, json=json_body, timeout=timeout
+        )
+
+        with self._lock:
+            self.http_versions[response.http_version] = (
+                self.http_versions.get(response.http_version, 0) + 1
+            )
+
+        return TransportResponse(
+            response.status_code,
+            response.content,
+            headers=dict(response.headers),
+            url=url,
+            wire_bytes=response.num_bytes_downloaded,
+        )
+
+    def close(self) -> None:
+        """Close the client and its connections."""
+        self.client.close()
+
+
+def multiplexed_transport(*, max_connections: int = 10) -> Transport:
+    """Get the best transport for many concurrent requests.
+
+    Args:
+        max_connections: The connection limit for the transport
+
+    Returns:
+        An `HttpxTransport` if httpx is installed, otherwise a `Urllib3Transport`
+    """
+    if httpx is None:
+        Log.warning("httpx is not installed, so requests will be sent with urllib3")
+        return Urllib3Transport(max_connections=max_connections)
+
+    return HttpxTransport(max_connections=max_connections)
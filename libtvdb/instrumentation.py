@@ -0,0 +1,225 @@
+"""Per-request timing records and the hooks that receive them."""
+
+import contextlib
+import re
+import threading
+import time
+import urllib.parse
+from collections.abc import Callable, Iterator
+from typing import Any
+
+from libtvdb.compression import encoded_size
+
+_ID_SEGMENT = re.compile(r"\d")
+
+
+def endpoint_template(url: str) -> str:
+    """Reduce a request URL to the endpoint it calls.
+
+    The API base, query string and any path segment containing a digit are
+    removed so that requests for different records group together, e.g.
+    "https://api4.thetvdb.com/v4/series/121361/extended?short=true" becomes
+    "series/{id}/extended".
+
+    Args:
+        url: The full or relative request URL
+
+    Returns:
+        The endpoint template
+    """
+    path = urllib.parse.urlsplit(url).path
+    segments = [segment for segment in path.split("/") if segment]
+
+    if "v4" in segments:
+        segments = segments[segments.index("v4") + 1 :]
+
+    return "/".join("{id}" if _ID_SEGMENT.search(segment) else segment for segment in segments)
+
+
+class RequestRecord:
+    """Timing and outcome information for a single HTTP request.
+
+    All durations are in seconds. `auth_wait` is the time spent making sure
+    the client was authenticated before the request was sent, `network` is
+    the time from sending the request to having the full body, and
+    `json_decode` is the time spent decoding that body. `model_build` is the
+    time spent turning the data into model objects; for paginated requests it
+    covers every page and is reported on the final page only. It is None when
+    the data wasn't deserialized by the client (e.g. a direct call to `get`).
+    `retries` is the number of attempts made after the first one.
+
+    `bytes_received` is the size of the decoded response body and
+    `wire_bytes_received` the size it was sent in, which is smaller when the
+    response was compressed with `content_encoding`. The wire size is None
+    if the transport doesn't report it.
+    """
+
+    method: str
+    url: str
+    endpoint: str
+    status: int | None
+    retries: int
+    started_at: float
+    auth_wait: float
+    network: float
+    json_decode: float
+    model_build: float | None
+    bytes_sent: int
+    bytes_received: int | None
+    wire_bytes_received: int | None
+    content_encoding: str | None
+    error: Exception | None
+
+    def __init__(self, method: str, url: str) -> None:
+        self.method = method
+        self.url = url
+        self.endpoint = endpoint_template(url)
+        self.status = None
+        self.retries = 0
+        self.started_at = time.time()
+        self.auth_wait = 0.0
+        self.network = 0.0
+        self.json_decode = 0.0
+        self.model_build = None
+        self.bytes_sent = 0
+        self.bytes_received = None
+        self.wire_bytes_received = None
+        self.content_encoding = None
+        self.error = None
+
+    @property
+    def total(self) -> float:
+        """The total time accounted for by this record."""
+        return self.auth_wait + self.network + self.json_decode + (self.model_build or 0.0)
+
+    @property
+    def compression_ratio(self) -> float | None:
+        """How many times larger the decoded body is than the body on the wire."""
+        if not self.bytes_received or not self.wire_bytes_received:
+            return None
+        return self.bytes_received / self.wire_bytes_received
+
+    def set_response(self, response: Any) -> None:
+        """Fill in the status and sizes from a response.
+
+        Args:
+            response: The response received for this request
+        """
+        self.status = response.status_code
+        self.bytes_received = len(response.content)
+        self.wire_bytes_received = encoded_size(response)
+
+        content_encoding = response.headers.get("Content-Encoding")
+        self.content_encoding = content_encoding if isinstance(content_encoding, str) else None
+
+    def as_dict(self) -> dict[str, object]:
+        """Get the record as a plain dictionary, e.g. for structured logging.
+
+        Returns:
+            The fields of the record
+        """
+        return {
+            "method": self.method,
+            "url": self.url,
+            "endpoint": self.endpoint,
+            "status": self.status,
+            "retries": self.retries,
+            "started_at": self.started_at,
+            "auth_wait": self.auth_wait,
+            "network": self.network,
+            "json_decode": self.json_decode,
+            "model_build": self.model_build,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "wire_bytes_received": self.wire_bytes_received,
+            "content_encoding": self.content_encoding,
+            "error": None if self.error is None else repr(self.error),
+        }
+
+    def __str__(self) -> str:
+        return f"RequestRecord<{self.method} {self.endpoint} - {self.status}>"
+
+    def __repr__(self) -> str:
+        return (
+            f"RequestRecord<{self.method} {self.endpoint} - {self.status} "
+            f"({self.total * 1000:.1f}ms, {self.bytes_received} bytes)>"
+        )
+
+
+RequestHook = Callable[[RequestRecord], None]
+
+
+class RequestRecorder:
+    """Collects the records for one client call and passes them to the hooks at the end.
+
+    Holding the records until the call finishes means the time spent building
+    models from the response can be added to them before they are reported.
+    """
+
+    hooks: list[RequestHook]
+    records: list[RequestRecord]
+
+    def __init__(self, hooks: list[RequestHook]) -> None:
+        self.hooks = list(hooks)
+        self.records = []
+        self._lock = threading.Lock()
+        self._source: RequestRecord | None = None
+
+    def add(self, record: RequestRecord) -> None:
+        """Add a record to be reported when the call finishes.
+
+        Args:
+            record: The record to add
+        """
+        with self._lock:
+            self.records.append(record)
+
+    def set_source(self, url: str) -> None:
+        """Mark the latest request for a URL as the one models are built from next.
+
+        Pages can be fetched concurrently, so the last record added isn't
+        necessarily the last page of the response.
+
+        Args:
+            url: The URL of the request
+        """
+        with self._lock:
+            for record in reversed(self.records):
+                if record.url == url:
+                    self._source = record
+                    return
+
+    @contextlib.contextmanager
+    def model_build(self) -> Iterator[None]:
+        """Time building models from the responses, adding it to the source record."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                if self._source is not None:
+                    self._source.model_build = time.perf_counter() - started
+
+    def emit(self) -> None:
+        """Pass every collected record to every hook."""
+        with self._lock:
+            records, self.records = self.records, []
+
+        for record in records:
+            for hook in self.hooks:
+                hook(record)
+
+
+@contextlib.contextmanager
+def timing_model_build(recorder: RequestRecorder | None) -> Iterator[None]:
+    """Time building models if a recorder is active, otherwise do nothing.
+
+    Args:
+        recorder: The recorder for the current call, if any
+    """
+    if recorder is None:
+        yield
+        return
+
+    with recorder.model_build():
+        yield
@@ -0,0 +1,342 @@
+"""In-process metrics for client requests and cache lookups."""
+
+import bisect
+import threading
+from collections import defaultdict
+from typing import Any, ClassVar
+
+from libtvdb.instrumentation import RequestRecord
+
+LOGIN_ENDPOINT = "login"
+
+
+class Histogram:
+    """A cumulative histogram with fixed bucket upper bounds, as used by Prometheus."""
+
+    bounds: tuple[float, ...]
+    bucket_counts: list[int]
+    count: int
+    total: float
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.bucket_counts = [0] * len(bounds)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add a value to the histogram.
+
+        Args:
+            value: The value to add
+        """
+        position = bisect.bisect_left(self.bounds, value)
+
+        if position < len(self.bucket_counts):
+            self.bucket_counts[position] += 1
+
+        self.count += 1
+        self.total += value
+
+    def cumulative_counts(self) -> list[int]:
+        """Get the number of values less than or equal to each bound.
+
+        Returns:
+            The cumulative count for each bucket, in bound order
+        """
+        counts = []
+        running = 0
+
+        for count in self.bucket_counts:
+            running += count
+            counts.append(running)
+
+        return counts
+
+    def quantile(self, quantile: float) -> float | None:
+        """Estimate a quantile from the buckets.
+
+        The estimate is the upper bound of the bucket the quantile falls in,
+        so it is only as precise as the buckets are.
+
+        Args:
+            quantile: The quantile to estimate, between 0 and 1
+
+        Returns:
+            The estimate, infinity if it is above the largest bound, or None if empty
+        """
+        if self.count == 0:
+            return None
+
+        target = quantile * self.count
+
+        for bound, count in zip(self.bounds, self.cumulative_counts(), strict=True):
+            if count >= target:
+                return bound
+
+        return float("inf")
+
+    def as_dict(self) -> dict[str, Any]:
+        """Get the histogram as a plain dictionary.
+
+        Returns:
+            The count, sum and cumulative bucket counts
+        """
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "buckets": dict(zip(self.bounds, self.cumulative_counts(), strict=True)),
+        }
+
+
+class MetricsRegistry:
+    """Request latency, byte, status, retry, authentication and cache metrics.
+
+    Pass one to `TVDBClient(metrics=...)` and it is updated from every
+    request the client makes, including each page of paginated requests and
+    the login request. The latency histograms only measure time on the
+    network (`RequestRecord.network`). Cache metrics count lookups in the
+    client's mirror ("mirror") and remote ID index ("remote_ids").
+
+    A registry can be shared between clients and is safe to use from
+    multiple threads.
+    """
+
+    DEFAULT_BUCKETS: ClassVar[tuple[float, ...]] = (
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+        2.5,
+        5.0,
+        10.0,
+    )
+
+    buckets: tuple[float, ...]
+
+    def __init__(self, *, buckets: tuple[float, ...] | None = None) -> None:
+        """Create a new registry.
+
+        Args:
+            buckets: Upper bounds in seconds for the latency histograms (default: 5ms to 10s)
+        """
+        self.buckets = tuple(sorted(buckets or MetricsRegistry.DEFAULT_BUCKETS))
+        self._lock = threading.Lock()
+        self._latency: dict[str, Histogram] = {}
+        self._requests: dict[tuple[str, str], int] = defaultdict(int)
+        self._bytes_sent: dict[str, int] = defaultdict(int)
+        self._bytes_received: dict[str, int] = defaultdict(int)
+        self._wire_bytes_received: dict[str, int] = defaultdict(int)
+        self._retries: dict[str, int] = defaultdict(int)
+        self._authentications: dict[str, int] = defaultdict(int)
+        self._cache: dict[tuple[str, str], int] = defaultdict(int)
+
+    def reset(self) -> None:
+        """Clear every metric."""
+        with self._lock:
+            for metric in (
+                self._latency,
+                self._requests,
+                self._bytes_sent,
+                self._bytes_received,
+                self._wire_bytes_received,
+                self._retries,
+                self._authentications,
+                self._cache,
+            ):
+                metric.clear()
+
+    def observe_request(self, record: RequestRecord) -> None:
+        """Update the metrics from a finished request.
+
+        This is a request hook, so it can also be passed to `add_request_hook`.
+
+        Args:
+            record: The record of the request
+        """
+        status = "error" if record.status is None else str(record.status)
+
+        with self._lock:
+            endpoint = record.endpoint
+            histogram = self._latency.get(endpoint)
+
+            if histogram is None:
+                histogram = Histogram(self.buckets)
+                self._latency[endpoint] = histogram
+
+            # Waiting for authentication and building models aren't request latency
+            histogram.observe(record.network)
+            self._requests[(endpoint, status)] += 1
+            self._bytes_sent[endpoint] += record.bytes_sent
+            self._bytes_received[endpoint] += record.bytes_received or 0
+            self._wire_bytes_received[endpoint] += (
+                record.bytes_received or 0
+                if record.wire_bytes_received is None
+                else record.wire_bytes_received
+            )
+            self._retries[endpoint] += record.retries
+
+            if endpoint == LOGIN_ENDPOINT:
+                self._authentications[status] += 1
+
+    def observe_cache(self, cache: str, *, hit: bool) -> None:
+        """Count a cache lookup.
+
+        Args:
+            cache: The name of the cache
+            hit: True if the lookup was answered from the cache
+        """
+        with self._lock:
+            self._cache[(cache, "hit" if hit else "miss")] += 1
+
+    def cache_hit_ratio(self, cache: str) -> float | None:
+        """Get the fraction of lookups answered from a cache.
+
+        Args:
+            cache: The name of the cache
+
+        Returns:
+            The hit ratio, or None if the cache hasn't been used
+        """
+        with self._lock:
+            hits = self._cache.get((cache, "hit"), 0)
+            misses = self._cache.get((cache, "miss"), 0)
+
+        if hits + misses == 0:
+            return None
+
+        return hits / (hits + misses)
+
+    def compression_ratio(self, endpoint: str | None = None) -> float | None:
+        """Get how many times larger response bodies were after decompression.
+
+        Args:
+            endpoint: The endpoint to get the ratio for (default: every endpoint)
+
+        Returns:
+            The ratio, or None if nothing has been received
+        """
+        with self._lock:
+            if endpoint is None:
+                decoded = sum(self._bytes_received.values())
+                wire = sum(self._wire_bytes_received.values())
+            else:
+                decoded = self._bytes_received.get(endpoint, 0)
+                wire = self._wire_bytes_received.get(endpoint, 0)
+
+        if wire == 0:
+            return None
+
+        return decoded / wire
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get a copy of every metric as plain dictionaries.
+
+        Returns:
+            The metrics, keyed by metric and then by endpoint, status or cache
+        """
+        with self._lock:
+            requests: dict[str, dict[str, int]] = defaultdict(dict)
+            for (endpoint, status), count in self._requests.items():
+                requests[endpoint][status] = count
+
+            caches: dict[str, dict[str, int]] = defaultdict(lambda: {"hit": 0, "miss": 0})
+            for (cache, result), count in self._cache.items():
+                caches[cache][result] = count
+
+            return {
+                "latency": {
+                    endpoint: histogram.as_dict() for endpoint, histogram in self._latency.items()
+                },
+                "requests": dict(requests),
+                "bytes_sent": dict(self._bytes_sent),
+                "bytes_received": dict(self._bytes_received),
+                "wire_bytes_received": dict(self._wire_bytes_received),
+                "retries": dict(self._retries),
+                "authentications": dict(self._authentications),
+                "cache": {
+                    cache: {**counts, "ratio": counts["hit"] / (counts["hit"] + counts["miss"])}
+                    for cache, counts in caches.items()
+                },
+            }
+
+    def prometheus_text(self, *, prefix: str = "libtvdb") -> str:
+        """Render the metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix: Prefix for every metric name
+
+        Returns:
+            The metrics, ready to be served from a /metrics endpoint
+        """
+        lines: list[str] = []
+
+        def header(name: str, metric_type: str, description: str) -> None:
+            lines.append(f"# HELP {prefix}_{name} {description}")
+            lines.append(f"# TYPE {prefix}_{name} {metric_type}")
+
+        def sample(name: str, labels: dict[str, str], value: float) -> None:
+            rendered = ",".join(f'{key}="{_escape(label)}"' for key, label in labels.items())
+            lines.append(f"{prefix}_{name}{{{rendered}}} {_format_value(value)}")
+
+        with self._lock:
+            header(
+                "request_duration_seconds", "histogram", "Time each request spent on the network."
+            )
+            for endpoint, histogram in sorted(self._latency.items()):
+                cumulative = histogram.cumulative_counts()
+                for bound, count in zip(histogram.bounds, cumulative, strict=True):
+                    labels = {"endpoint": endpoint, "le": _format_value(bound)}
+                    sample("request_duration_seconds_bucket", labels, count)
+                labels = {"endpoint": endpoint, "le": "+Inf"}
+                sample("request_duration_seconds_bucket", labels, histogram.count)
+                sample("request_duration_seconds_sum", {"endpoint": endpoint}, histogram.total)
+                sample("request_duration_seconds_count", {"endpoint": endpoint}, histogram.count)
+
+            header("requests_total", "counter", "Requests made, by response status.")
+            for (endpoint, status), count in sorted(self._requests.items()):
+                sample("requests_total", {"endpoint": endpoint, "status": status}, count)
+
+            header("request_bytes_total", "counter", "Bytes sent in request bodies.")
+            for endpoint, count in sorted(self._bytes_sent.items()):
+                sample("request_bytes_total", {"endpoint": endpoint}, count)
+
+            header("response_bytes_total", "counter", "Bytes received in response bodies.")
+            for endpoint, count in sorted(self._bytes_received.items()):
+                sample("response_bytes_total", {"endpoint": endpoint}, count)
+
+            header(
+                "response_wire_bytes_total",
+                "counter",
+                "Bytes received in response bodies before decompression.",
+            )
+            for endpoint, count in sorted(self._wire_bytes_received.items()):
+                sample("response_wire_bytes_total", {"endpoint": endpoint}, count)
+
+            header("retries_total", "counter", "Requests retried after the first attempt.")
+            for endpoint, count in sorted(self._retries.items()):
+                sample("retries_total", {"endpoint": endpoint}, count)
+
+            header("authentications_total", "counter", "Logins, by response status.")
+            for status, count in sorted(self._authentications.items()):
+                sample("authentications_total", {"status": status}, count)
+
+            header("cache_lookups_total", "counter", "Cache lookups, by result.")
+            for (cache, result), count in sorted(self._cache.items()):
+                sample("cache_lookups_total", {"cache": cache, "result": result}, count)
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(label: str) -> str:
+    return label.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    return repr(value)
@@ -0,0 +1,509 @@
+"""A local SQLite mirror of records fetched from the API."""
+
+import datetime
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from typing import Any, ClassVar, TypeVar
+
+from libtvdb.model import Character, Company, Episode, SeasonBase, Show
+from libtvdb.model.serialization import Serializable
+from libtvdb.utilities import Log
+
+T = TypeVar("T", bound=Serializable)
+
+# Bumped whenever the tables or the payload format change. Older databases are
+# only a cache of the API, so they are emptied rather than migrated.
+_SCHEMA_VERSION = 2
+
+_TABLES = ("shows", "episodes", "episode_lists", "seasons", "characters", "companies")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS shows (
+    id INTEGER PRIMARY KEY,
+    slug TEXT,
+    stored_at REAL NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS shows_slug ON shows (slug);
+
+CREATE TABLE IF NOT EXISTS episodes (
+    id INTEGER PRIMARY KEY,
+    series_id INTEGER NOT NULL,
+    season_number INTEGER,
+    number INTEGER,
+    absolute_number INTEGER,
+    aired TEXT,
+    stored_at REAL NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS episodes_season_number
+    ON episodes (series_id, season_number, number);
+CREATE INDEX IF NOT EXISTS episodes_absolute_number ON episodes (series_id, absolute_number);
+CREATE INDEX IF NOT EXISTS episodes_aired ON episodes (aired);
+
+CREATE TABLE IF NOT EXISTS episode_lists (
+    series_id INTEGER PRIMARY KEY,
+    stored_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS seasons (
+    id INTEGER PRIMARY KEY,
+    series_id INTEGER,
+    number INTEGER,
+    stored_at REAL NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS seasons_series ON seasons (series_id, number);
+
+CREATE TABLE IF NOT EXISTS characters (
+    id INTEGER PRIMARY KEY,
+    series_id INTEGER,
+    episode_id INTEGER,
+    people_id INTEGER,
+    stored_at REAL NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS characters_series ON characters (series_id);
+CREATE INDEX IF NOT EXISTS characters_people ON characters (people_id);
+
+CREATE TABLE IF NOT EXISTS companies (
+    id INTEGER PRIMARY KEY,
+    slug TEXT,
+    stored_at REAL NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS companies_slug ON companies (slug);
+"""
+
+
+class Mirror:
+    """Persists deserialized records in SQLite so they can be queried offline.
+
+    Records are stored whole, in the models' versioned `to_bytes` format,
+    alongside the columns needed to look them up, so reading one back returns
+    an equal model object to the one that was stored. Rows that can't be
+    decoded are treated as missing. Every row
+    remembers when it was written, and reads can be limited to rows younger
+    than `max_age` seconds.
+
+    The mirror can be shared between threads.
+    """
+
+    DEFAULT_MAX_AGE: ClassVar[float] = 24 * 60 * 60
+
+    path: str
+    max_age: float
+
+    def __init__(self, path: str = ":memory:", *, max_age: float | None = None) -> None:
+        """Open (or create) a mirror database.
+
+        Args:
+            path: Path to the SQLite database file, or ":memory:" for a transient mirror
+            max_age: Seconds a record is considered fresh for (default: 24 hours)
+        """
+        self.path = path
+        self.max_age = Mirror.DEFAULT_MAX_AGE if max_age is None else max_age
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+
+        with self._lock, self._connection:
+            (version,) = self._connection.execute("PRAGMA user_version").fetchone()
+            if version < _SCHEMA_VERSION:
+                for table in _TABLES:
+                    self._connection.execute(f"DROP TABLE IF EXISTS {table}")
+            self._connection.executescript(_SCHEMA)
+            self._connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self) -> "Mirror":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def _oldest_fresh(self, max_age: float | None) -> float:
+        return time.time() - (self.max_age if max_age is None else max_age)
+
+    def _write(self, statement: str, rows: Iterable[tuple[Any, ...]]) -> None:
+        with self._lock, self._connection:
+            self._connection.executemany(statement, rows)
+
+    def _read(self, model_type: type[T], statement: str, parameters: tuple[Any, ...]) -> list[T]:
+        with self._lock:
+            rows = self._connection.execute(statement, parameters).fetchall()
+
+        results = []
+        for (payload,) in rows:
+            try:
+                results.append(model_type.from_bytes(payload))
+            except ValueError as ex:
+                Log.warning(
+                    "Ignoring a mirrored %s that can't be read: %s", model_type.__name__, ex
+                )
+        return results
+
+    def _read_one(self, model: type[T], statement: str, parameters: tuple[Any, ...]) -> T | None:
+        results = self._read(model, statement, parameters)
+        return results[0] if results else None
+
+    # Writing
+
+    def store_show(self, show: Show) -> None:
+        """Store a show, along with any seasons, characters and companies it contains.
+
+        Args:
+            show: The show to store
+        """
+        now = time.time()
+
+        self._write(
+            "INSERT OR REPLACE INTO shows VALUES (?, ?, ?, ?)",
+            [(int(show.identifier), getattr(show, "slug", None), now, show.to_bytes())],
+        )
+
+        self.store_seasons(getattr(show, "seasons", None) or [])
+        self.store_characters(getattr(show, "characters", None) or [])
+
+        companies = list(getattr(show, "companies", None) or [])
+        for network in (
+            getattr(show, "latest_network", None),
+            getattr(show, "original_network", None),
+        ):
+            if network is not None:
+                companies.append(network)
+        self.store_companies(companies)
+
+    def store_episodes(self, episodes: Iterable[Episode], *, series_id: int | None = None) -> None:
+        """Store episodes.
+
+        Args:
+            episodes: The episodes to store
+            series_id: If supplied, `episodes` is the complete list for this show and
+                `episodes_for_show` can be answered from the mirror afterwards
+        """
+        now = time.time()
+
+        self._write(
+            "INSERT OR REPLACE INTO episodes VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    episode.identifier,
+                    episode.series_id,
+                    getattr(episode, "season_number", None),
+                    getattr(episode, "number", None),
+                    getattr(episode, "absolute_number", None),
+                    _date_key(getattr(episode, "aired", None)),
+                    now,
+                    episode.to_bytes(),
+                )
+                for episode in episodes
+            ],
+        )
+
+        if series_id is not None:
+            self._write(
+                "INSERT OR REPLACE INTO episode_lists VALUES (?, ?)", [(int(series_id), now)]
+            )
+
+    def store_seasons(self, seasons: Iterable[SeasonBase]) -> None:
+        """Store seasons.
+
+        Args:
+            seasons: The seasons to store
+        """
+        now = time.time()
+        self._write(
+            "INSERT OR REPLACE INTO seasons VALUES (?, ?, ?, ?, ?)",
+            [
+                (
+                    season.identifier,
+                    getattr(season, "series_id", None),
+                    getattr(season, "number", None),
+                    now,
+                    season.to_bytes(),
+                )
+                for season in seasons
+            ],
+        )
+
+    def store_characters(self, characters: Iterable[Character]) -> None:
+        """Store characters.
+
+        Args:
+            characters: The characters to store
+        """
+        now = time.time()
+        self._write(
+            "INSERT OR REPLACE INTO characters VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    character.identifier,
+                    getattr(character, "series_id", None),
+                    getattr(character, "episode_id", None),
+                    getattr(character, "people_id", None),
+                    now,
+                    character.to_bytes(),
+                )
+                for character in characters
+            ],
+        )
+
+    def store_companies(self, companies: Iterable[Company]) -> None:
+        """Store companies.
+
+        Args:
+            companies: The companies to store
+        """
+        now = time.time()
+        self._write(
+            "INSERT OR REPLACE INTO companies VALUES (?, ?, ?, ?)",
+            [
+                (company.identifier, getattr(company, "slug", None), now, company.to_bytes())
+                for company in companies
+            ],
+        )
+
+    # Deleting
+
+    def delete_show(self, series_id: int | str) -> None:
+        """Remove a show along with its episodes, seasons and characters.
+
+        Args:
+            series_id: The TVDB ID of the show
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM shows WHERE id = ?", (int(series_id),))
+            for table in ("episodes", "episode_lists", "seasons", "characters"):
+                self._connection.execute(
+                    f"DELETE FROM {table} WHERE series_id = ?", (int(series_id),)
+                )
+
+    def delete_episodes(self, episode_ids: Iterable[int]) -> None:
+        """Remove episodes.
+
+        Args:
+            episode_ids: The TVDB IDs of the episodes to remove
+        """
+        self._write(
+            "DELETE FROM episodes WHERE id = ?", [(episode_id,) for episode_id in episode_ids]
+        )
+
+    # Reading
+
+    def show(self, series_id: int | str, *, max_age: float | None = None) -> Show | None:
+        """Get a show by its TVDB ID.
+
+        Args:
+            series_id: The TVDB ID of the show
+            max_age: Override for the mirror's freshness limit in seconds
+
+        Returns:
+            The show, or None if it isn't stored or is stale
+        """
+        return self._read_one(
+            Show,
+            "SELECT payload FROM shows WHERE id = ? AND stored_at >= ?",
+            (int(series_id), self._oldest_fresh(max_age)),
+        )
+
+    def show_by_slug(self, slug: str, *, max_age: float | None = None) -> Show | None:
+        """Get a show by its slug.
+
+        Args:
+            slug: The slug of the show
+            max_age: Override for the mirror's freshness limit in seconds
+
+        Returns:
+            The show, or None if it isn't stored or is stale
+        """
+        return self._read_one(
+            Show,
+            "SELECT payload FROM shows WHERE slug = ? AND stored_at >= ?",
+            (slug, self._oldest_fresh(max_age)),
+        )
+
+    def episode(self, episode_id: int, *, max_age: float | None = None) -> Episode | None:
+        """Get an episode by its TVDB ID.
+
+        Args:
+            episode_id: The TVDB ID of the episode
+            max_age: Override for the mirror's freshness limit in seconds
+
+        Returns:
+            The episode, or None if it isn't stored or is stale
+        """
+        return self._read_one(
+            Episode,
+            "SELECT payload FROM episodes WHERE id = ? AND stored_at >= ?",
+            (episode_id, self._oldest_fresh(max_age)),
+        )
+
+    def episodes_for_show(
+        self, series_id: int | str, *, max_age: float | None = None
+    ) -> list[Episode] | None:
+        """Get every episode of a show.
+
+        This only answers if the complete episode list was stored with
+        `store_episodes(..., series_id=...)` within the freshness limit.
+
+        Args:
+            series_id: The TVDB ID of the show
+            max_age: Override for the mirror's freshness limit in seconds
+
+        Returns:
+            The episodes in season and episode order, or None if not available
+        """
+        oldest = self._oldest_fresh(max_age)
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT stored_at FROM episode_lists WHERE series_id = ?", (int(series_id),)
+            ).fetchone()
+
+        if row is None or row[0] < oldest:
+            return None
+
+        return self._read(
+            Episode,
+            "SELECT payload FROM episodes WHERE series_id = ? AND stored_at >= ? "
+            "ORDER BY season_number, number",
+            (int(series_id), row[0]),
+        )
+
+    def episode_by_number(
+        self,
+        series_id: int | str,
+        season_number: int,
+        number: int,
+        *,
+        max_age: float | None = None,
+    ) -> Episode | None:
+        """Get an episode by its season and episode number.
+
+        Args:
+            series_id: The TVDB ID of the show
+            season_number: The season number
+            number: The episode number within the season
+            max_age: Override for the mirror's freshness limit in seconds
+
+        Returns:
+            The episode, or None if it isn't stored or is stale
+        """
+        return self._read_one(
+            Episode,
+            "SELECT payload FROM episodes WHERE series_id = ? AND season_number = ? "
+            "AND number = ? AND stored_at >= ?",
+            (int(series_id), season_number, number, self._oldest_fresh(max_age)),
+        )
+
+    def episode_by_absolute_number(
+        self, series_id: int | str, absolute_number: int, *, max_age: float | None = None
+    ) -> Episode | None:
+        """Get an episode by its absolute number.
+
+        Args:
+            series_id: The TVDB ID of the show
+            absolute_number: The absolute episode number
+            max_age: Override for the mirror's freshness limit in seconds
+
+        Returns:
+            The episode, or None if it isn't stored or is stale
+        """
+        return self._read_one(
+            Episode,
+            "SELECT payload FROM episodes WHERE series_id = ? AND absolute_number = ? "
+            "AND stored_at >= ?",
+            (int(series_id), absolute_number, self._oldest_fresh(max_age)),
+        )
+
+    def episodes_aired_between(
+        self,
+        start: datetime.date,
+        end: datetime.date,
+        *,
+        series_id: int | str | None = None,
+        max_age: float | None = None,
+    ) -> list[Episode]:
+        """Get the episodes that aired within a date range (inclusive).
+
+        Args:
+            start: The first air date to include
+            end: The last air date to include
+            series_id: Optionally limit the results to a single show
+            max_age: Override for the mirror's freshness limit in seconds
+
+        Returns:
+            The matching episodes in air date order
+        """
+        statement = "SELECT payload FROM episodes WHERE aired BETWEEN ? AND ? AND stored_at >= ?"
+        parameters: tuple[Any, ...] = (
+            _date_key(start),
+            _date_key(end),
+            self._oldest_fresh(max_age),
+        )
+
+        if series_id is not None:
+            statement += " AND series_id = ?"
+            parameters += (int(series_id),)
+
+        return self._read(Episode, statement + " ORDER BY aired, season_number, number", parameters)
+
+    def seasons_for_show(
+        self, series_id: int | str, *, max_age: float | None = None
+    ) -> list[SeasonBase]:
+        """Get the stored seasons of a show.
+
+        Args:
+            series_id: The TVDB ID of the show
+            max_age: Override for the mirror's freshness limit in seconds
+
+        Returns:
+            The seasons in number order
+        """
+        return self._read(
+            SeasonBase,
+            "SELECT payload FROM seasons WHERE series_id = ? AND stored_at >= ? ORDER BY number",
+            (int(series_id), self._oldest_fresh(max_age)),
+        )
+
+    def character(self, character_id: int, *, max_age: float | None = None) -> Character | None:
+        """Get a character by its TVDB ID.
+
+        Args:
+            character_id: The TVDB ID of the character
+            max_age: Override for the mirror's freshness limit in seconds
+
+        Returns:
+            The character, or None if it isn't stored or is stale
+        """
+        return self._read_one(
+            Character,
+            "SELECT payload FROM characters WHERE id = ? AND stored_at >= ?",
+            (character_id, self._oldest_fresh(max_age)),
+        )
+
+    def company(self, company_id: int, *, max_age: float | None = None) -> Company | None:
+        """Get a company by its TVDB ID.
+
+        Args:
+            company_id: The TVDB ID of the company
+            max_age: Override for the mirror's freshness limit in seconds
+
+        Returns:
+            The company, or None if it isn't stored or is stale
+        """
+        return self._read_one(
+            Company,
+            "SELECT payload FROM companies WHERE id = ? AND stored_at >= ?",
+            (company_id, self._oldest_fresh(max_age)),
+        )
+
+
+def _date_key(value: datetime.date | None) -> str | None:
+    return None if value is None else value.isoformat()
@@ -1,27 +1,34 @@
 """All the types that are used in the API."""
 
-from .actor import Actor
-from .alias import Alias
-from .artwork import Artwork
-from .award import AwardBase
-from .character import Character
-from .company import Company, CompanyType
-from .content_rating import ContentRating
-from .episode import Episode
-from .network import NetworkBase
-from .parsers import (
-    date_parser,
-    datetime_parser,
-    optional_empty_str,
-    optional_float,
-    timestamp_parser,
-)
-from .remote_id import RemoteID
-from .season import SeasonBase, SeasonType
-from .show import SeriesAirsDays, Show
-from .status import Status, StatusName
-from .tags import TagOption
-from .trailer import Trailer
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .actor import Actor
+    from .alias import Alias
+    from .artwork import Artwork
+    from .award import AwardBase
+    from .character import Character
+    from .company import Company, CompanyType
+    from .content_rating import ContentRating
+    from .episode import Episode
+    from .episode_collection import EpisodeCollection
+    from .network import NetworkBase
+    from .parsers import (
+        date_parser,
+        datetime_parser,
+        optional_empty_str,
+        optional_float,
+        timestamp_parser,
+    )
+    from .remote_id import RemoteID
+    from .remote_id_search import RemoteIDSearchResult
+    from .season import SeasonBase, SeasonType
+    from .show import SeriesAirsDays, Show
+    from .status import Status, StatusName
+    from .tags import TagOption
+    from .trailer import Trailer
+    from .update import EntityUpdate
 
 __all__ = [
     "Actor",
@@ -32,7 +39,9 @@ __all__ = [
     "Company",
     "CompanyType",
     "ContentRating",
+    "EntityUpdate",
     "Episode",
+    "EpisodeCollection",
     "NetworkBase",
     "date_parser",
     "datetime_parser",
@@ -40,6 +49,7 @@ __all__ = [
     "optional_float",
     "timestamp_parser",
     "RemoteID",
+    "RemoteIDSearchResult",
     "SeasonBase",
     "SeasonType",
     "SeriesAirsDays",
@@ -49,3 +59,49 @@ __all__ = [
     "TagOption",
     "Trailer",
 ]
+
+# Each model module is imported the first time one of its names is used
+_LAZY_IMPORTS = {
+    "Actor": "actor",
+    "Alias": "alias",
+    "Artwork": "artwork",
+    "AwardBase": "award",
+    "Character": "character",
+    "Company": "company",
+    "CompanyType": "company",
+    "ContentRating": "content_rating",
+    "date_parser": "parsers",
+    "datetime_parser": "parsers",
+    "EntityUpdate": "update",
+    "Episode": "episode",
+    "EpisodeCollection": "episode_collection",
+    "NetworkBase": "network",
+    "optional_empty_str": "parsers",
+    "optional_float": "parsers",
+    "RemoteID": "remote_id",
+    "RemoteIDSearchResult": "remote_id_search",
+    "SeasonBase": "season",
+    "SeasonType": "season",
+    "SeriesAirsDays": "show",
+    "Show": "show",
+    "Status": "status",
+    "StatusName": "status",
+    "TagOption": "tags",
+    "timestamp_parser": "parsers",
+    "Trailer": "trailer",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
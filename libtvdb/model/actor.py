@@ -5,6 +5,7 @@ import datetime
 import deserialize
 
 from libtvdb.model.parsers import datetime_parser
+from libtvdb.model.serialization import Serializable
 
 
 @deserialize.key("identifier", "id")
@@ -15,7 +16,7 @@ from libtvdb.model.parsers import datetime_parser
 @deserialize.key("last_updated", "lastUpdated")
 @deserialize.parser("imageAdded", datetime_parser)
 @deserialize.parser("lastUpdated", datetime_parser)
-class Actor:
+class Actor(Serializable):
     """Represents an actor on a show."""
 
     identifier: int
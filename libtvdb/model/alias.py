@@ -1,7 +1,9 @@
 """All the types that are used in the API."""
 
+from libtvdb.model.serialization import Serializable
 
-class Alias:
+
+class Alias(Serializable):
     """Represents an alias of a character."""
 
     language: str
@@ -5,6 +5,7 @@ from typing import Any
 import deserialize
 
 from libtvdb.model.parsers import optional_float
+from libtvdb.model.serialization import Serializable
 from libtvdb.model.tags import TagOption
 
 
@@ -13,7 +14,7 @@ from libtvdb.model.tags import TagOption
 @deserialize.parser("id", str)
 @deserialize.parser("score", optional_float)
 @deserialize.auto_snake()
-class Artwork:
+class Artwork(Serializable):
     """Represents an artwork."""
 
     identifier: str
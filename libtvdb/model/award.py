@@ -2,9 +2,11 @@
 
 import deserialize
 
+from libtvdb.model.serialization import Serializable
+
 
 @deserialize.key("identifier", "id")
-class AwardBase:
+class AwardBase(Serializable):
     """Represents an award of a show."""
 
     identifier: int
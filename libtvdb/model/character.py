@@ -8,6 +8,7 @@ from libtvdb.model.alias import Alias
 from libtvdb.model.parsers import (
     optional_empty_str,
 )
+from libtvdb.model.serialization import Serializable
 
 
 @deserialize.key("identifier", "id")
@@ -15,7 +16,7 @@ from libtvdb.model.parsers import (
 @deserialize.key("person_img_url", "personImgURL")
 @deserialize.parser("url", optional_empty_str)
 @deserialize.auto_snake()
-class Character:
+class Character(Serializable):
     """Represents a character of a show."""
 
     aliases: list[Alias] | None
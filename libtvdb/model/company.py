@@ -7,12 +7,13 @@ import deserialize
 
 from libtvdb.model.alias import Alias
 from libtvdb.model.parsers import date_parser
+from libtvdb.model.serialization import Serializable
 
 
 @deserialize.key("identifier", "id")
 @deserialize.parser("active_date", date_parser)
 @deserialize.auto_snake()
-class CompanyType:
+class CompanyType(Serializable):
     """Represents a company type."""
 
     company_type_id: int
@@ -29,7 +30,7 @@ class CompanyType:
 @deserialize.parser("active_date", date_parser)
 @deserialize.parser("inactive_date", date_parser)
 @deserialize.auto_snake()
-class Company:
+class Company(Serializable):
     """Represents a company."""
 
     aliases: list[Alias] | None
@@ -2,10 +2,12 @@
 
 import deserialize
 
+from libtvdb.model.serialization import Serializable
+
 
 @deserialize.key("identifier", "id")
 @deserialize.auto_snake()
-class ContentRating:
+class ContentRating(Serializable):
     """Represents a content rating of an episode of a show."""
 
     identifier: int
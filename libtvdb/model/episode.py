@@ -13,6 +13,7 @@ from libtvdb.model.network import NetworkBase
 from libtvdb.model.parsers import date_parser, datetime_parser
 from libtvdb.model.remote_id import RemoteID
 from libtvdb.model.season import SeasonBase
+from libtvdb.model.serialization import Serializable
 from libtvdb.model.tags import TagOption
 from libtvdb.model.trailer import Trailer
 
@@ -22,7 +23,7 @@ from libtvdb.model.trailer import Trailer
 @deserialize.parser("aired", date_parser)
 @deserialize.parser("last_updated", datetime_parser)
 @deserialize.parser("year", lambda x: int(x) if x else None)
-class Episode:
+class Episode(Serializable):
     """Represents an episode of a show."""
 
     @deserialize.key("episode_name", "episodeName")
@@ -42,6 +43,7 @@ class Episode:
     companies: list[Any] | None
     content_ratings: list[ContentRating] | None
     finale_type: Any | None
+    fingerprint: str | None  # Set by the client from the raw payload
     identifier: int
     image: str | None
     image_type: int | None
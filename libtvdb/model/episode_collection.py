@@ -0,0 +1,242 @@
+"""All the types that are used in the API."""
+
+import bisect
+import datetime
+import functools
+from collections.abc import Callable, Iterable
+from typing import Any, ClassVar
+
+from libtvdb.model.episode import Episode
+from libtvdb.model.serialization import Serializable
+
+
+def _invalidates_indexes(method: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a list mutation so that it drops any indexes built so far."""
+
+    @functools.wraps(method)
+    def wrapper(self: "EpisodeCollection", *args: Any, **kwargs: Any) -> Any:
+        self.invalidate()
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class EpisodeCollection(list[Episode], Serializable):
+    """A list of episodes with lookup indexes.
+
+    This behaves exactly like a list. Each index is built the first time it
+    is used and then reused until the list is modified.
+    """
+
+    _INDEXES: ClassVar[tuple[str, ...]] = (
+        "_by_number",
+        "_by_absolute_number",
+        "_by_identifier",
+        "by_air_date",
+        "_air_dates",
+        "in_order",
+        "_order_positions",
+        "_airs_before",
+        "_airs_after_season",
+    )
+
+    def __init__(self, episodes: Iterable[Episode] = ()) -> None:
+        super().__init__(episodes)
+
+    def invalidate(self) -> None:
+        """Drop every index so that they are rebuilt on next use."""
+        for name in EpisodeCollection._INDEXES:
+            self.__dict__.pop(name, None)
+
+    append = _invalidates_indexes(list.append)
+    extend = _invalidates_indexes(list.extend)
+    insert = _invalidates_indexes(list.insert)
+    remove = _invalidates_indexes(list.remove)
+    pop = _invalidates_indexes(list.pop)
+    clear = _invalidates_indexes(list.clear)
+    sort = _invalidates_indexes(list.sort)
+    reverse = _invalidates_indexes(list.reverse)
+    __setitem__ = _invalidates_indexes(list.__setitem__)
+    __delitem__ = _invalidates_indexes(list.__delitem__)
+    __iadd__ = _invalidates_indexes(list.__iadd__)
+    __imul__ = _invalidates_indexes(list.__imul__)
+
+    # Indexes
+
+    @functools.cached_property
+    def _by_number(self) -> dict[tuple[int, int], Episode]:
+        return {(episode.season_number, episode.number): episode for episode in self}
+
+    @functools.cached_property
+    def _by_absolute_number(self) -> dict[int, Episode]:
+        index: dict[int, Episode] = {}
+
+        for episode in self:
+            absolute_number = getattr(episode, "absolute_number", None)
+            if absolute_number is not None:
+                index[absolute_number] = episode
+
+        return index
+
+    @functools.cached_property
+    def _by_identifier(self) -> dict[int, Episode]:
+        return {episode.identifier: episode for episode in self}
+
+    @functools.cached_property
+    def by_air_date(self) -> list[Episode]:
+        """The episodes that have an air date, sorted by it.
+
+        Episodes that aired on the same day are in season and episode order.
+        """
+        return sorted(
+            (episode for episode in self if getattr(episode, "aired", None) is not None),
+            key=lambda episode: (episode.aired, episode.season_number, episode.number),
+        )
+
+    @functools.cached_property
+    def _air_dates(self) -> list[datetime.date]:
+        return [episode.aired for episode in self.by_air_date if episode.aired is not None]
+
+    @functools.cached_property
+    def in_order(self) -> list[Episode]:
+        """The episodes sorted by season number, then episode number."""
+        return sorted(self, key=lambda episode: (episode.season_number, episode.number))
+
+    @functools.cached_property
+    def _order_positions(self) -> dict[int, int]:
+        return {episode.identifier: index for index, episode in enumerate(self.in_order)}
+
+    @functools.cached_property
+    def _airs_before(self) -> dict[tuple[int, int | None], list[Episode]]:
+        placements: dict[tuple[int, int | None], list[Episode]] = {}
+
+        for episode in self:
+            season = getattr(episode, "airs_before_season", None)
+            if season is None:
+                continue
+            key = (season, getattr(episode, "airs_before_episode", None))
+            placements.setdefault(key, []).append(episode)
+
+        return placements
+
+    @functools.cached_property
+    def _airs_after_season(self) -> dict[int, list[Episode]]:
+        placements: dict[int, list[Episode]] = {}
+
+        for episode in self:
+            season = getattr(episode, "airs_after_season", None)
+            if season is not None:
+                placements.setdefault(season, []).append(episode)
+
+        return placements
+
+    # Lookups
+
+    def by_number(self, season_number: int, number: int) -> Episode | None:
+        """Get an episode by its season and episode number.
+
+        Args:
+            season_number: The season number
+            number: The episode number within the season
+
+        Returns:
+            The episode, or None if there isn't one
+        """
+        return self._by_number.get((season_number, number))
+
+    def by_absolute_number(self, absolute_number: int) -> Episode | None:
+        """Get an episode by its absolute number.
+
+        Args:
+            absolute_number: The absolute episode number
+
+        Returns:
+            The episode, or None if there isn't one
+        """
+        return self._by_absolute_number.get(absolute_number)
+
+    def by_identifier(self, identifier: int) -> Episode | None:
+        """Get an episode by its TVDB ID.
+
+        Args:
+            identifier: The TVDB ID of the episode
+
+        Returns:
+            The episode, or None if it isn't in this collection
+        """
+        return self._by_identifier.get(identifier)
+
+    def aired_between(self, start: datetime.date, end: datetime.date) -> list[Episode]:
+        """Get the episodes that aired within a date range (inclusive).
+
+        Args:
+            start: The first air date to include
+            end: The last air date to include
+
+        Returns:
+            The matching episodes in air date order
+        """
+        lower = bisect.bisect_left(self._air_dates, start)
+        upper = bisect.bisect_right(self._air_dates, end)
+        return self.by_air_date[lower:upper]
+
+    def airing_before(self, season_number: int, number: int | None = None) -> list[Episode]:
+        """Get the specials placed before a season or episode.
+
+        Args:
+            season_number: The season the specials air before
+            number: The episode the specials air before, or None for the whole season
+
+        Returns:
+            The episodes with matching `airs_before_season`/`airs_before_episode`
+        """
+        return list(self._airs_before.get((season_number, number), []))
+
+    def airing_after_season(self, season_number: int) -> list[Episode]:
+        """Get the specials placed after a season.
+
+        Args:
+            season_number: The season the specials air after
+
+        Returns:
+            The episodes with a matching `airs_after_season`
+        """
+        return list(self._airs_after_season.get(season_number, []))
+
+    def next_episode(self, episode: Episode) -> Episode | None:
+        """Get the episode after this one in season and episode order.
+
+        Args:
+            episode: An episode in this collection
+
+        Returns:
+            The next episode, or None if this is the last one
+
+        Raises:
+            ValueError: If the episode isn't in this collection
+        """
+        position = self._position(episode) + 1
+        return self.in_order[position] if position < len(self.in_order) else None
+
+    def previous_episode(self, episode: Episode) -> Episode | None:
+        """Get the episode before this one in season and episode order.
+
+        Args:
+            episode: An episode in this collection
+
+        Returns:
+            The previous episode, or None if this is the first one
+
+        Raises:
+            ValueError: If the episode isn't in this collection
+        """
+        position = self._position(episode) - 1
+        return self.in_order[position] if position >= 0 else None
+
+    def _position(self, episode: Episode) -> int:
+        position = self._order_positions.get(episode.identifier)
+
+        if position is None:
+            raise ValueError(f"Episode {episode.identifier} is not in this collection")
+
+        return position
@@ -6,13 +6,14 @@ import deserialize
 
 from libtvdb.model.company import CompanyType
 from libtvdb.model.parsers import date_parser
+from libtvdb.model.serialization import Serializable
 
 
 @deserialize.key("identifier", "id")
 @deserialize.parser("active_date", date_parser)
 @deserialize.parser("inactive_date", date_parser)
 @deserialize.auto_snake()
-class NetworkBase:
+class NetworkBase(Serializable):
     """Represents a network."""
 
     abbreviation: str | None
@@ -22,7 +22,7 @@ def date_parser(value: str | None) -> datetime.date | None:
     if value is None:
         return None
 
-    if value in ["", INVALID_DATE_PLACEHOLDER]:
+    if value in ("", INVALID_DATE_PLACEHOLDER):
         return None
 
     return parse_date(value)
@@ -40,7 +40,7 @@ def datetime_parser(value: str | None) -> datetime.datetime | None:
     if value is None:
         return None
 
-    if value in ["", INVALID_DATETIME_PLACEHOLDER]:
+    if value in ("", INVALID_DATETIME_PLACEHOLDER):
         return None
 
     return parse_datetime(value)
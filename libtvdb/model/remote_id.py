@@ -2,11 +2,13 @@
 
 import deserialize
 
+from libtvdb.model.serialization import Serializable
+
 
 @deserialize.key("identifier", "id")
 @deserialize.key("remoteid_type", "type")
 @deserialize.auto_snake()
-class RemoteID:
+class RemoteID(Serializable):
     """Represents a remote ID."""
 
     identifier: str
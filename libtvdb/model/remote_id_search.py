@@ -0,0 +1,27 @@
+"""All the types that are used in the API."""
+
+from typing import Any
+
+import deserialize
+
+from libtvdb.model.episode import Episode
+from libtvdb.model.serialization import Serializable
+from libtvdb.model.show import Show
+
+
+@deserialize.auto_snake()
+class RemoteIDSearchResult(Serializable):
+    """Represents a record matched by a remote ID search."""
+
+    company: dict[str, Any] | None
+    episode: Episode | None
+    movie: dict[str, Any] | None
+    people: dict[str, Any] | None
+    series: Show | None
+
+    def __str__(self) -> str:
+        if self.series is not None:
+            return f"RemoteIDSearchResult<{self.series}>"
+        if self.episode is not None:
+            return f"RemoteIDSearchResult<{self.episode}>"
+        return "RemoteIDSearchResult<other>"
@@ -4,11 +4,13 @@ from typing import Any
 
 import deserialize
 
+from libtvdb.model.serialization import Serializable
+
 
 @deserialize.auto_snake()
 @deserialize.key("identifier", "id")
 @deserialize.key("season_type", "type")
-class SeasonType:
+class SeasonType(Serializable):
     """Represents the type of a season."""
 
     identifier: int
@@ -20,7 +22,7 @@ class SeasonType:
 @deserialize.key("identifier", "id")
 @deserialize.key("season_type", "type")
 @deserialize.auto_snake()
-class SeasonBase:
+class SeasonBase(Serializable):
     """Represents a Season of a show."""
 
     abbreviation: str | None
@@ -0,0 +1,303 @@
+"""A compact binary format for model objects.
+
+Going back through JSON and `deserialize` to cache or send a model is slow,
+because every field has to be checked and parsed again. This format stores
+the already built values instead: each model becomes a tuple of its field
+values, dates and enums are stored in their simplest form, and the result
+is written with `marshal`, which is implemented in C.
+
+The payload starts with a magic number and a format version, followed by a
+table of the model classes it contains and their field names. Fields are
+matched by name when loading, so data written before a field was added or
+removed can still be read, with any missing fields left as None.
+
+Only load payloads that this library wrote. Loading can only create model
+classes from `libtvdb.model`, but `marshal` is not hardened against
+deliberately malformed input.
+"""
+
+import datetime
+import enum
+import importlib
+import marshal
+from collections.abc import Callable
+from typing import Any, Self
+
+MAGIC = b"LTVB"
+VERSION = 1
+
+# marshal's format version 4 has been used since Python 3.4
+_MARSHAL_VERSION = 4
+_MODEL_PACKAGE = "libtvdb.model"
+
+_MODEL = 0
+_DATE = 1
+_DATETIME = 2
+_ENUM = 3
+_LIST_TYPE = 4
+_TUPLE = 5
+_TIME = 6
+
+_PRIMITIVES = frozenset((str, int, float, bool, type(None)))
+_CONTAINERS = frozenset((tuple, list, dict))
+_FIELDS_CACHE: dict[type, tuple[str, ...]] = {}
+
+
+def model_fields(model_type: type) -> tuple[str, ...]:
+    """Get the annotated fields of a model class, including inherited ones.
+
+    Args:
+        model_type: The model class
+
+    Returns:
+        The field names, in the order they are declared
+    """
+    fields = _FIELDS_CACHE.get(model_type)
+
+    if fields is None:
+        names: dict[str, None] = {}
+
+        for klass in reversed(model_type.__mro__):
+            for name, annotation in vars(klass).get("__annotations__", {}).items():
+                if "ClassVar" not in str(annotation):
+                    names[name] = None
+
+        fields = tuple(names)
+        _FIELDS_CACHE[model_type] = fields
+
+    return fields
+
+
+class _Encoder:
+    """Turns a model into values that marshal can write."""
+
+    def __init__(self) -> None:
+        self.types: list[tuple[str, str, tuple[str, ...]]] = []
+        self._type_indexes: dict[type, int] = {}
+        self._encoders: dict[type, Callable[[Any], Any]] = {
+            list: lambda value: [self.encode(item) for item in value],
+            dict: lambda value: {key: self.encode(item) for key, item in value.items()},
+            datetime.date: lambda value: (_DATE, value.toordinal()),
+            datetime.datetime: lambda value: (_DATETIME, value.isoformat()),
+            datetime.time: lambda value: (_TIME, value.isoformat()),
+            tuple: lambda value: (_TUPLE, [self.encode(item) for item in value]),
+        }
+
+    def _type_index(self, value_type: type, fields: tuple[str, ...] = ()) -> int:
+        index = self._type_indexes.get(value_type)
+
+        if index is None:
+            if not value_type.__module__.startswith(_MODEL_PACKAGE):
+                raise TypeError(f"Cannot serialize {value_type.__qualname__}: not a libtvdb model")
+
+            index = len(self.types)
+            self.types.append((value_type.__module__, value_type.__qualname__, fields))
+            self._type_indexes[value_type] = index
+
+        return index
+
+    def encode(self, value: Any) -> Any:
+        """Encode a single value.
+
+        Args:
+            value: The value to encode
+
+        Returns:
+            The encoded value
+
+        Raises:
+            TypeError: If the value can't be serialized
+        """
+        value_type = type(value)
+
+        if value_type in _PRIMITIVES:
+            return value
+
+        encoder = self._encoders.get(value_type)
+
+        if encoder is not None:
+            return encoder(value)
+
+        if isinstance(value, enum.Enum):
+            return (_ENUM, self._type_index(value_type), value.value)
+
+        if isinstance(value, list):
+            return (_LIST_TYPE, self._type_index(value_type), [self.encode(item) for item in value])
+
+        if isinstance(value, (str, int, float)):
+            raise TypeError(f"Cannot serialize a subclass of a built in type: {value_type}")
+
+        fields = model_fields(value_type)
+        index = self._type_index(value_type, fields)
+        encode = self.encode
+        # Most fields are plain values, so skip the call for those
+        items = [getattr(value, name, None) for name in fields]
+        return (
+            _MODEL,
+            index,
+            *[item if type(item) in _PRIMITIVES else encode(item) for item in items],
+        )
+
+
+def _resolve(module_name: str, qualified_name: str) -> type:
+    if module_name != _MODEL_PACKAGE and not module_name.startswith(f"{_MODEL_PACKAGE}."):
+        raise ValueError(f"Refusing to load a type from outside the models: {module_name}")
+
+    value: Any = importlib.import_module(module_name)
+
+    try:
+        for name in qualified_name.split("."):
+            value = getattr(value, name)
+    except AttributeError as ex:
+        raise ValueError(f"Unknown model type: {module_name}.{qualified_name}") from ex
+
+    if not isinstance(value, type):
+        raise ValueError(f"Not a model type: {module_name}.{qualified_name}")
+
+    return value
+
+
+class _Decoder:
+    """Rebuilds models from values read by marshal."""
+
+    def __init__(self, types: list[tuple[str, str, tuple[str, ...]]]) -> None:
+        self.types: list[type] = []
+        self.fields: list[tuple[str, ...]] = []
+        self.missing: list[dict[str, None]] = []
+
+        for module_name, qualified_name, fields in types:
+            value_type = _resolve(module_name, qualified_name)
+            self.types.append(value_type)
+            self.fields.append(fields)
+
+            if issubclass(value_type, (enum.Enum, list)):
+                self.missing.append({})
+            else:
+                self.missing.append(dict.fromkeys(set(model_fields(value_type)) - set(fields)))
+
+        self._decoders: dict[int, Callable[[tuple[Any, ...]], Any]] = {
+            _MODEL: self._model,
+            _DATE: lambda value: datetime.date.fromordinal(value[1]),
+            _DATETIME: lambda value: datetime.datetime.fromisoformat(value[1]),
+            _TIME: lambda value: datetime.time.fromisoformat(value[1]),
+            _ENUM: lambda value: self.types[value[1]](value[2]),
+            _LIST_TYPE: lambda value: self.types[value[1]](self.decode(item) for item in value[2]),
+            _TUPLE: lambda value: tuple(self.decode(item) for item in value[1]),
+        }
+
+    def _model(self, value: tuple[Any, ...]) -> Any:
+        index = value[1]
+        model_type = self.types[index]
+        model = model_type.__new__(model_type)
+        attributes = model.__dict__
+        decode = self.decode
+
+        for name, item in zip(self.fields[index], value[2:], strict=True):
+            attributes[name] = decode(item) if type(item) in _CONTAINERS else item
+
+        attributes.update(self.missing[index])
+        return model
+
+    def decode(self, value: Any) -> Any:
+        """Decode a single value.
+
+        Args:
+            value: The value read by marshal
+
+        Returns:
+            The decoded value
+        """
+        value_type = type(value)
+
+        if value_type is tuple:
+            return self._decoders[value[0]](value)
+
+        if value_type is list:
+            return [self.decode(item) for item in value]
+
+        if value_type is dict:
+            return {key: self.decode(item) for key, item in value.items()}
+
+        return value
+
+
+def dumps(value: Any) -> bytes:
+    """Serialize a model, or a list or dict of models, to bytes.
+
+    Args:
+        value: The value to serialize
+
+    Returns:
+        The serialized value
+
+    Raises:
+        TypeError: If the value contains something other than models and plain data
+    """
+    encoder = _Encoder()
+    root = encoder.encode(value)
+    return MAGIC + bytes([VERSION]) + marshal.dumps((encoder.types, root), _MARSHAL_VERSION)
+
+
+def loads(data: bytes) -> Any:
+    """Load a value serialized with `dumps`.
+
+    Args:
+        data: The serialized value
+
+    Returns:
+        The value
+
+    Raises:
+        ValueError: If the data isn't in this format or was written by a newer version
+    """
+    if len(data) <= len(MAGIC) or data[: len(MAGIC)] != MAGIC:
+        raise ValueError("Not a serialized libtvdb model")
+
+    version = data[len(MAGIC)]
+
+    if version > VERSION:
+        raise ValueError(f"Unsupported serialization version: {version}")
+
+    try:
+        types, root = marshal.loads(data[len(MAGIC) + 1 :])
+    except (EOFError, TypeError, ValueError) as ex:
+        raise ValueError("The serialized data is corrupt") from ex
+
+    decoder = _Decoder(types)
+
+    try:
+        return decoder.decode(root)
+    except (TypeError, IndexError, KeyError) as ex:
+        raise ValueError("The serialized data is corrupt") from ex
+
+
+class Serializable:
+    """Adds `to_bytes` and `from_bytes` to a model class."""
+
+    def to_bytes(self) -> bytes:
+        """Serialize this object in the compact binary format.
+
+        Returns:
+            The serialized object
+        """
+        return dumps(self)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Self:
+        """Load an object written by `to_bytes`.
+
+        Args:
+            data: The serialized object
+
+        Returns:
+            The object
+
+        Raises:
+            ValueError: If the data is invalid or holds a different type of object
+        """
+        value = loads(data)
+
+        if not isinstance(value, cls):
+            raise ValueError(f"Expected a serialized {cls.__name__}, got {type(value).__name__}")
+
+        return value
@@ -9,9 +9,11 @@ import deserialize
 from libtvdb.model.artwork import Artwork
 from libtvdb.model.character import Character
 from libtvdb.model.company import Company
+from libtvdb.model.episode import Episode
 from libtvdb.model.parsers import date_parser, datetime_parser, optional_float
 from libtvdb.model.remote_id import RemoteID
 from libtvdb.model.season import SeasonBase
+from libtvdb.model.serialization import Serializable
 from libtvdb.model.status import Status, StatusName
 from libtvdb.model.trailer import Trailer
 
@@ -28,7 +30,7 @@ def translated_name_parser(value: str | None) -> dict[str, str]:
         return {}
 
 
-class SeriesAirsDays:
+class SeriesAirsDays(Serializable):
     """Represents the days a show airs."""
 
     monday: bool
@@ -42,7 +44,7 @@ class SeriesAirsDays:
 
 @deserialize.key("identifier", "id")
 @deserialize.auto_snake()
-class Genre:
+class Genre(Serializable):
     """Represents a genre."""
 
     identifier: int
@@ -77,7 +79,7 @@ class Genre:
 @deserialize.parser("name_translated", translated_name_parser)
 @deserialize.parser("score", optional_float)
 @deserialize.auto_snake()
-class Show:
+class Show(Serializable):
     """Represents a single show."""
 
     abbreviation: str | None
@@ -92,7 +94,8 @@ class Show:
     content_ratings: list[Any] | None
     country: str | None
     default_season_type: int | None
-    episodes: list[Any] | None
+    episodes: list[Episode] | None
+    fingerprint: str | None  # Set by the client from the raw payload
     first_air_time: datetime.date | None
     first_aired: datetime.date | None
     genres: list[Genre] | None
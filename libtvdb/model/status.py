@@ -4,6 +4,8 @@ import enum
 
 import deserialize
 
+from libtvdb.model.serialization import Serializable
+
 
 class StatusName(enum.Enum):
     """Represents the status of a show."""
@@ -16,7 +18,7 @@ class StatusName(enum.Enum):
 
 @deserialize.key("identifier", "id")
 @deserialize.auto_snake()
-class Status:
+class Status(Serializable):
     """Represents a Status."""
 
     identifier: int
@@ -2,10 +2,12 @@
 
 import deserialize
 
+from libtvdb.model.serialization import Serializable
+
 
 @deserialize.key("identifier", "id")
 @deserialize.auto_snake()
-class TagOption:
+class TagOption(Serializable):
     """Represents a Tag Option."""
 
     help_text: str | None
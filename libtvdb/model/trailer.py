@@ -2,10 +2,12 @@
 
 import deserialize
 
+from libtvdb.model.serialization import Serializable
+
 
 @deserialize.key("identifier", "id")
 @deserialize.auto_snake()
-class Trailer:
+class Trailer(Serializable):
     """Represents a Trailer."""
 
     identifier: int
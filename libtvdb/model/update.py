@@ -0,0 +1,36 @@
+"""All the types that are used in the API."""
+
+import datetime
+
+import deserialize
+
+from libtvdb.model.parsers import timestamp_parser
+from libtvdb.model.serialization import Serializable
+
+
+@deserialize.key("timestamp", "timeStamp")
+@deserialize.parser("timeStamp", timestamp_parser)
+@deserialize.auto_snake()
+class EntityUpdate(Serializable):
+    """Represents a single change record from the updates endpoint."""
+
+    entity_type: str
+    extra_info: str | None
+    merge_to_entity_type: str | None
+    merge_to_id: int | None
+    method: str | None
+    method_int: int | None
+    record_id: int
+    record_type: str | None
+    series_id: int | None
+    timestamp: datetime.datetime
+    user_id: int | None
+
+    def __str__(self) -> str:
+        return f"EntityUpdate<{self.entity_type} {self.record_id} - {self.method}>"
+
+    def __repr__(self) -> str:
+        return (
+            f"EntityUpdate<{self.entity_type} {self.record_id} - {self.method} "
+            f"(series={self.series_id}, at={self.timestamp.isoformat()})>"
+        )
@@ -0,0 +1,118 @@
+"""Deserializing models in worker processes for very large bulk operations.
+
+Building models with `deserialize` is pure Python, so when thousands of
+responses arrive concurrently the threads fetching them end up waiting on
+the GIL. A `DeserializationPool` hands the decoded JSON to a pool of
+processes instead and gets the finished (picklable) models back, so every
+core can be used. The models are fingerprinted there too, so hashing the
+payloads doesn't hold up the calling process either. Starting the processes
+and copying the data between them has a cost, so the pool is only worth it
+for large batches.
+"""
+
+import concurrent.futures
+import multiprocessing
+import os
+from collections.abc import Iterable, Sized
+from typing import Any, TypeVar
+
+import deserialize
+
+from libtvdb.diff import fingerprint
+from libtvdb.model import Episode, Show
+
+M = TypeVar("M", Show, Episode)
+
+
+def build_model(model_type: type[M], data: Any) -> M:
+    """Build a show or episode from API data and fingerprint it.
+
+    A show's inline episodes are fingerprinted from their own data.
+
+    Args:
+        model_type: Show or Episode
+        data: The data from the API
+
+    Returns:
+        The model
+    """
+    model = deserialize.deserialize(model_type, data, throw_on_unhandled=True)
+    model.fingerprint = fingerprint(data)
+
+    if isinstance(model, Show) and model.episodes is not None:
+        for episode, episode_data in zip(model.episodes, data["episodes"], strict=True):
+            episode.fingerprint = fingerprint(episode_data)
+
+    return model
+
+
+def worker_count(items: Iterable[Any], processes: int | None, *, threshold: int) -> int:
+    """Work out how many processes to deserialize a batch with.
+
+    Args:
+        items: The batch. Its size is only checked if it has a length.
+        processes: The number of processes requested: 0 to deserialize in the
+            calling process, or None to decide from the batch size
+        threshold: The smallest batch worth starting processes for
+
+    Returns:
+        The number of processes to use, or 0 to deserialize in-process
+
+    Raises:
+        ValueError: If processes is negative
+    """
+    if processes is not None:
+        if processes < 0:
+            raise ValueError("processes must not be negative")
+        return processes
+
+    cpus = os.cpu_count() or 1
+
+    if cpus < 2 or not isinstance(items, Sized) or len(items) < threshold:
+        return 0
+
+    return cpus
+
+
+class DeserializationPool:
+    """A pool of processes that build models from API data.
+
+    Processes are started with the "spawn" method, as the pool is used
+    alongside the client's fetching threads and forking a threaded process
+    is unsafe. It can be used from any number of threads at once.
+    """
+
+    processes: int
+
+    def __init__(self, processes: int) -> None:
+        """Start a new pool.
+
+        Args:
+            processes: The number of worker processes
+        """
+        self.processes = processes
+        self._executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=processes, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    def deserialize(self, model_type: type[M], data: Any) -> M:
+        """Build and fingerprint a model in a worker process and wait for it.
+
+        Args:
+            model_type: Show or Episode
+            data: The data from the API
+
+        Returns:
+            The model
+        """
+        return self._executor.submit(build_model, model_type, data).result()
+
+    def close(self) -> None:
+        """Wait for outstanding work and stop the worker processes."""
+        self._executor.shutdown()
+
+    def __enter__(self) -> "DeserializationPool":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
@@ -0,0 +1,199 @@
+"""A reverse index from remote IDs (IMDb, TMDB, ...) to TVDB records."""
+
+import threading
+import time
+from collections.abc import Iterable
+
+from libtvdb.model import Episode, RemoteID, Show
+
+
+def series_id(show: Show) -> int:
+    """Get the numeric TVDB ID of a show.
+
+    Search results identify shows as "series-<id>" rather than by the bare ID.
+
+    Args:
+        show: The show
+
+    Returns:
+        The TVDB ID of the show
+    """
+    identifier = str(show.identifier)
+
+    if identifier.isdigit():
+        return int(identifier)
+
+    tvdb_id = getattr(show, "tvdb_id", None)
+
+    if tvdb_id:
+        return int(tvdb_id)
+
+    return int(identifier.rsplit("-", 1)[-1])
+
+
+class RemoteIDTarget:
+    """The TVDB record that a remote ID refers to."""
+
+    entity_type: str
+    tvdb_id: int
+    source_name: str | None
+
+    def __init__(self, entity_type: str, tvdb_id: int, source_name: str | None) -> None:
+        self.entity_type = entity_type
+        self.tvdb_id = tvdb_id
+        self.source_name = source_name
+
+    def __str__(self) -> str:
+        return f"RemoteIDTarget<{self.entity_type} {self.tvdb_id}>"
+
+    def __repr__(self) -> str:
+        return f"RemoteIDTarget<{self.entity_type} {self.tvdb_id} (source={self.source_name})>"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RemoteIDTarget):
+            return NotImplemented
+        return (self.entity_type, self.tvdb_id, self.source_name) == (
+            other.entity_type,
+            other.tvdb_id,
+            other.source_name,
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.entity_type, self.tvdb_id, self.source_name))
+
+
+class RemoteIDIndex:
+    """Maps remote IDs back to the shows and episodes that list them.
+
+    The same remote ID value can appear for different sources (TMDB IDs are
+    plain integers for example), so a lookup can return several targets
+    unless it is narrowed down by source name.
+
+    Remote IDs that the API had no record of can be remembered with
+    `add_miss`, so that repeated lookups of them don't search again until
+    `miss_ttl` has passed.
+    """
+
+    miss_ttl: float
+
+    def __init__(self, *, miss_ttl: float = 60 * 60) -> None:
+        """Create a new, empty index.
+
+        Args:
+            miss_ttl: Seconds to remember that a remote ID wasn't found
+        """
+        self.miss_ttl = miss_ttl
+        self._lock = threading.Lock()
+        self._targets: dict[str, set[RemoteIDTarget]] = {}
+        self._misses: dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._targets)
+
+    def add(
+        self,
+        remote_id: str,
+        entity_type: str,
+        tvdb_id: int,
+        *,
+        source_name: str | None = None,
+    ) -> None:
+        """Record that a remote ID refers to a TVDB record.
+
+        Args:
+            remote_id: The ID in the remote system (e.g. "tt0436992")
+            entity_type: The type of the TVDB record ("series" or "episode")
+            tvdb_id: The TVDB ID of the record
+            source_name: The name of the remote system (e.g. "IMDB")
+        """
+        target = RemoteIDTarget(entity_type, tvdb_id, source_name)
+
+        with self._lock:
+            self._targets.setdefault(str(remote_id), set()).add(target)
+            self._misses.pop(str(remote_id), None)
+
+    def add_miss(self, remote_id: str) -> None:
+        """Record that the API had no record of a remote ID.
+
+        Args:
+            remote_id: The ID in the remote system
+        """
+        with self._lock:
+            self._misses[str(remote_id)] = time.monotonic() + self.miss_ttl
+
+    def is_known_miss(self, remote_id: str) -> bool:
+        """Check if a remote ID was recently found not to exist.
+
+        Args:
+            remote_id: The ID in the remote system
+
+        Returns:
+            True if the API had no record of it within the last `miss_ttl` seconds
+        """
+        with self._lock:
+            expires = self._misses.get(str(remote_id))
+
+            if expires is None:
+                return False
+
+            if expires <= time.monotonic():
+                del self._misses[str(remote_id)]
+                return False
+
+            return True
+
+    def add_remote_ids(
+        self, remote_ids: Iterable[RemoteID] | None, entity_type: str, tvdb_id: int
+    ) -> None:
+        """Record every remote ID listed on a TVDB record.
+
+        Args:
+            remote_ids: The remote IDs of the record
+            entity_type: The type of the TVDB record ("series" or "episode")
+            tvdb_id: The TVDB ID of the record
+        """
+        for remote_id in remote_ids or []:
+            self.add(
+                remote_id.identifier,
+                entity_type,
+                tvdb_id,
+                source_name=getattr(remote_id, "source_name", None),
+            )
+
+    def add_show(self, show: Show) -> None:
+        """Record the remote IDs of a show.
+
+        Args:
+            show: The show to index
+        """
+        self.add_remote_ids(getattr(show, "remote_ids", None), "series", series_id(show))
+
+    def add_episode(self, episode: Episode) -> None:
+        """Record the remote IDs of an episode.
+
+        Args:
+            episode: The episode to index
+        """
+        self.add_remote_ids(getattr(episode, "remote_ids", None), "episode", episode.identifier)
+
+    def lookup(self, remote_id: str, *, source_name: str | None = None) -> list[RemoteIDTarget]:
+        """Find the TVDB records for a remote ID.
+
+        Args:
+            remote_id: The ID in the remote system
+            source_name: Only return targets from this source (case insensitive)
+
+        Returns:
+            The matching targets, empty if the remote ID isn't known
+        """
+        with self._lock:
+            targets = list(self._targets.get(str(remote_id), ()))
+
+        if source_name is not None:
+            targets = [
+                target
+                for target in targets
+                if target.source_name is None or target.source_name.lower() == source_name.lower()
+            ]
+
+        return sorted(targets, key=lambda target: (target.entity_type, target.tvdb_id))
@@ -0,0 +1,527 @@
+"""Scheduling show refreshes by how likely each show is to have changed.
+
+Refreshing every tracked show on one cadence spends most requests on shows
+that finished years ago, while shows with an episode airing tonight wait as
+long as everything else. `next_refresh` picks a time for each show from
+where it is in its run, and `RefreshScheduler` keeps the tracked shows in a
+priority queue ordered by that time, refreshing the most overdue ones first
+without exceeding a request budget.
+"""
+
+import datetime
+import heapq
+import itertools
+import threading
+import time
+from collections.abc import Callable, Iterable
+
+from libtvdb import remote_ids
+from libtvdb.bulk import BulkResult
+from libtvdb.client import ShowDetail, TVDBClient
+from libtvdb.exceptions import NotFoundException
+from libtvdb.model import Show, StatusName
+from libtvdb.utilities import Log
+
+_MINUTE = datetime.timedelta(minutes=1)
+_HOUR = datetime.timedelta(hours=1)
+_DAY = datetime.timedelta(days=1)
+# The due time of a show while it is being refreshed
+_IN_FLIGHT = datetime.datetime.max.replace(tzinfo=datetime.UTC)
+
+
+class RefreshIntervals:
+    """How long to wait between refreshes of a show at each stage of its run."""
+
+    # After an episode airs, to pick up its final details
+    AFTER_AIRING = _HOUR
+    # Shortest gap between refreshes, so an overdue airing isn't polled constantly
+    MINIMUM = 15 * _MINUTE
+    # A show with an episode airing within the next week
+    AIRING_SOON = 6 * _HOUR
+    # A continuing show that aired recently or was edited recently
+    ACTIVE = 12 * _HOUR
+    # Any other continuing or upcoming show
+    CONTINUING = 3 * _DAY
+    # A show whose status is unknown
+    UNKNOWN = 7 * _DAY
+    # An ended show that finished within the last `RECENTLY_ENDED_WINDOW`
+    RECENTLY_ENDED = 7 * _DAY
+    RECENTLY_ENDED_WINDOW = 90 * _DAY
+    # How recently a show must have aired or been edited to count as active
+    RECENTLY_AIRED_WINDOW = 14 * _DAY
+    RECENTLY_EDITED_WINDOW = 7 * _DAY
+    # How far ahead an upcoming episode makes a show count as airing soon
+    AIRING_SOON_WINDOW = 7 * _DAY
+    # An ended show that the API no longer keeps updated
+    ENDED = 30 * _DAY
+    # Retrying a refresh that failed
+    RETRY = 30 * _MINUTE
+
+
+def _utc(value: datetime.datetime) -> datetime.datetime:
+    """The API's timestamps are in UTC but are parsed without a time zone."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=datetime.UTC)
+    return value.astimezone(datetime.UTC)
+
+
+def _air_time(show: Show) -> datetime.time | None:
+    if not show.airs_time_utc:
+        return None
+
+    try:
+        return datetime.time.fromisoformat(show.airs_time_utc)
+    except ValueError:
+        return None
+
+
+def next_airing(show: Show, *, now: datetime.datetime) -> datetime.datetime | None:
+    """Estimate when the next episode of a show airs.
+
+    `next_aired` is used if it is set, otherwise the next of the show's
+    `airs_days` for a continuing show. Without `airs_time_utc` the episode
+    is assumed to air at the end of the day, so that it has aired by then.
+
+    Args:
+        show: The show
+        now: The current time
+
+    Returns:
+        The estimated air time in UTC, or None if nothing is known to be airing
+    """
+    air_time = _air_time(show) or datetime.time(23, 59)
+    air_date = show.next_aired
+
+    if air_date is None:
+        days = show.airs_days
+
+        if _status_name(show) != StatusName.CONTINUING or days is None:
+            return None
+
+        weekdays = [
+            days.monday,
+            days.tuesday,
+            days.wednesday,
+            days.thursday,
+            days.friday,
+            days.saturday,
+            days.sunday,
+        ]
+
+        for offset in range(8):
+            candidate = now.date() + datetime.timedelta(days=offset)
+            airing = datetime.datetime.combine(candidate, air_time, tzinfo=datetime.UTC)
+
+            if weekdays[candidate.weekday()] and airing + RefreshIntervals.AFTER_AIRING > now:
+                return airing
+
+        return None
+
+    return datetime.datetime.combine(air_date, air_time, tzinfo=datetime.UTC)
+
+
+def _status_name(show: Show) -> StatusName:
+    if isinstance(show.status, StatusName):
+        return show.status
+
+    name = getattr(show.status, "name", None)
+    return name if isinstance(name, StatusName) else StatusName.UNKNOWN
+
+
+def next_refresh(show: Show, *, now: datetime.datetime | None = None) -> datetime.datetime:
+    """Work out when a show should next be refreshed.
+
+    Shows with an episode about to air are refreshed shortly after it airs.
+    Continuing shows are refreshed more often if they aired or were edited
+    recently, and ended shows rarely, unless the API still marks them to be
+    kept updated.
+
+    Args:
+        show: The show, as it was last fetched
+        now: The current time (default: now)
+
+    Returns:
+        The time in UTC to refresh the show at
+    """
+    now = _utc(now) if now is not None else datetime.datetime.now(datetime.UTC)
+    status = _status_name(show)
+    # Only a full `Status` says whether the API still keeps the show updated
+    keep_updated = getattr(show.status, "keep_updated", True)
+    today = now.date()
+
+    if status == StatusName.ENDED and not keep_updated:
+        interval = RefreshIntervals.ENDED
+    elif status == StatusName.ENDED:
+        recently_ended = (
+            show.last_aired is not None
+            and today - show.last_aired <= RefreshIntervals.RECENTLY_ENDED_WINDOW
+        )
+        interval = RefreshIntervals.RECENTLY_ENDED if recently_ended else RefreshIntervals.ENDED
+    elif status == StatusName.UNKNOWN:
+        interval = RefreshIntervals.UNKNOWN
+    else:
+        interval = RefreshIntervals.CONTINUING
+        recently_aired = (
+            show.last_aired is not None
+            and today - show.last_aired <= RefreshIntervals.RECENTLY_AIRED_WINDOW
+        )
+        recently_edited = (
+            show.last_updated is not None
+            and now - _utc(show.last_updated) <= RefreshIntervals.RECENTLY_EDITED_WINDOW
+        )
+
+        if recently_aired or recently_edited:
+            interval = RefreshIntervals.ACTIVE
+
+    due = now + interval
+    airing = next_airing(show, now=now)
+
+    if airing is not None and airing - now <= RefreshIntervals.AIRING_SOON_WINDOW:
+        due = min(due, now + RefreshIntervals.AIRING_SOON)
+        due = min(due, airing + RefreshIntervals.AFTER_AIRING)
+
+    return max(due, now + RefreshIntervals.MINIMUM)
+
+
+class RequestBudget:
+    """A token bucket limiting how many requests can be made over time.
+
+    Tokens are added at `rate` per second up to `capacity`, and each request
+    takes one. It is safe to use from multiple threads.
+    """
+
+    rate: float
+    capacity: float
+
+    def __init__(
+        self,
+        rate: float,
+        *,
+        capacity: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create a new budget, starting full.
+
+        Args:
+            rate: Requests allowed per second
+            capacity: The most requests that can be made in a burst (default: one second's worth)
+            clock: The time source, in seconds
+
+        Raises:
+            ValueError: If rate or capacity is not positive
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.rate = rate
+        self.capacity = max(rate, 1.0) if capacity is None else capacity
+
+        if self.capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        current = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (current - self._updated) * self.rate)
+        self._updated = current
+
+    @property
+    def available(self) -> int:
+        """The number of requests that can be made right now."""
+        with self._lock:
+            self._refill()
+            return int(self._tokens)
+
+    def take(self, count: int) -> int:
+        """Take up to `count` requests from the budget.
+
+        Args:
+            count: The number of requests wanted
+
+        Returns:
+            The number of requests granted, which may be fewer than asked for
+        """
+        with self._lock:
+            self._refill()
+            granted = max(0, min(count, int(self._tokens)))
+            self._tokens -= granted
+            return granted
+
+    def refund(self, count: int) -> None:
+        """Return requests that were taken but never made.
+
+        Args:
+            count: The number of requests to return
+        """
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + count)
+
+    def seconds_until_available(self) -> float:
+        """Get how long until at least one request can be made.
+
+        Returns:
+            The wait in seconds, 0 if a request can be made now
+        """
+        with self._lock:
+            self._refill()
+            return max(0.0, (1 - self._tokens) / self.rate)
+
+
+class RefreshScheduler:
+    """Refreshes tracked shows in order of priority within a request budget.
+
+    Newly tracked shows are due immediately. After each refresh the show is
+    rescheduled with `next_refresh`, so how often it is fetched follows its
+    airing schedule. Failed refreshes are retried after
+    `RefreshIntervals.RETRY`, and shows the API no longer has are dropped.
+
+    Refreshes always go to the API, even if the client's mirror has a fresh
+    copy, so each one costs exactly one request from the budget.
+
+    Call `refresh_due` periodically, or `run` to keep refreshing until
+    stopped. The scheduler can be used from multiple threads.
+    """
+
+    client: TVDBClient
+    budget: RequestBudget
+    detail: ShowDetail
+    max_workers: int | None
+    on_refresh: Callable[[Show], None] | None
+
+    def __init__(
+        self,
+        client: TVDBClient,
+        *,
+        budget: RequestBudget,
+        series_ids: Iterable[int] = (),
+        detail: ShowDetail = ShowDetail.EXTENDED,
+        max_workers: int | None = None,
+        on_refresh: Callable[[Show], None] | None = None,
+    ) -> None:
+        """Create a new scheduler.
+
+        Args:
+            client: The client to make requests with
+            budget: The requests the scheduler may make. Share one budget between
+                schedulers (or other work) to limit their combined rate.
+            series_ids: The TVDB IDs of the shows to track
+            detail: How much information to fetch for each show
+            max_workers: Maximum number of concurrent requests
+            on_refresh: Called with each show after it is refreshed
+        """
+        self.client = client
+        self.budget = budget
+        self.detail = detail
+        self.max_workers = max_workers
+        self.on_refresh = on_refresh
+        self._lock = threading.Lock()
+        self._queue: list[tuple[datetime.datetime, int, int]] = []
+        self._due: dict[int, datetime.datetime] = {}
+        self._sequence = itertools.count()
+
+        for series_id in series_ids:
+            self.track(series_id)
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def __contains__(self, series_id: object) -> bool:
+        return series_id in self._due
+
+    def track(self, series_id: int, *, due: datetime.datetime | None = None) -> None:
+        """Start tracking a show, or change when it is next refreshed.
+
+        Args:
+            series_id: The TVDB ID of the show
+            due: When to refresh it (default: as soon as possible)
+        """
+        due = _utc(due) if due is not None else datetime.datetime.min.replace(tzinfo=datetime.UTC)
+
+        with self._lock:
+            self._due[series_id] = due
+            # Any earlier entry for the show is now stale and is skipped when popped
+            heapq.heappush(self._queue, (due, next(self._sequence), series_id))
+
+    def untrack(self, series_id: int) -> None:
+        """Stop tracking a show.
+
+        Args:
+            series_id: The TVDB ID of the show
+        """
+        with self._lock:
+            self._due.pop(series_id, None)
+
+    def schedule(self, show: Show, *, now: datetime.datetime | None = None) -> datetime.datetime:
+        """Track a show that was fetched elsewhere, due at its `next_refresh` time.
+
+        Args:
+            show: The show
+            now: The current time (default: now)
+
+        Returns:
+            When the show will be refreshed
+        """
+        due = next_refresh(show, now=now)
+        self.track(remote_ids.series_id(show), due=due)
+        return due
+
+    def due_at(self, series_id: int) -> datetime.datetime | None:
+        """Get when a show is next due to be refreshed.
+
+        Args:
+            series_id: The TVDB ID of the show
+
+        Returns:
+            The time, or None if the show isn't tracked
+        """
+        return self._due.get(series_id)
+
+    def _discard_stale(self) -> None:
+        """Pop queue entries for shows that were rescheduled or untracked. Call with the lock."""
+        while self._queue:
+            due, _, series_id = self._queue[0]
+
+            if self._due.get(series_id) == due:
+                return
+
+            heapq.heappop(self._queue)
+
+    def next_due(self) -> datetime.datetime | None:
+        """Get the time the most overdue show is due at.
+
+        Returns:
+            The time, or None if nothing is tracked
+        """
+        with self._lock:
+            self._discard_stale()
+            return self._queue[0][0] if self._queue else None
+
+    def _pop_due(self, now: datetime.datetime, limit: int) -> list[tuple[datetime.datetime, int]]:
+        popped: list[tuple[datetime.datetime, int]] = []
+
+        with self._lock:
+            while len(popped) < limit:
+                self._discard_stale()
+
+                if not self._queue or self._queue[0][0] > now:
+                    break
+
+                due, _, series_id = heapq.heappop(self._queue)
+                # Stays tracked, but out of the queue until the refresh finishes
+                self._due[series_id] = _IN_FLIGHT
+                popped.append((due, series_id))
+
+        return popped
+
+    def refresh_due(
+        self,
+        *,
+        now: datetime.datetime | None = None,
+        timeout: float | None = None,
+    ) -> list[BulkResult[int, Show]]:
+        """Refresh the shows that are due, most overdue first, as far as the budget allows.
+
+        Args:
+            now: The current time (default: now)
+            timeout: Request timeout in seconds for each request (default: 10.0)
+
+        Returns:
+            The result of each refresh
+        """
+        now = _utc(now) if now is not None else datetime.datetime.now(datetime.UTC)
+        popped = self._pop_due(now, self.budget.available)
+        # The budget may be shared, so less than was available can be granted
+        granted = self.budget.take(len(popped))
+
+        for due, series_id in popped[granted:]:
+            self.track(series_id, due=due)
+
+        series_ids = [series_id for _, series_id in popped[:granted]]
+
+        if not series_ids:
+            return []
+
+        results: list[BulkResult[int, Show]] = []
+
+        try:
+            for result in self.client.shows_by_id_many(
+                series_ids,
+                detail=self.detail,
+                max_workers=self.max_workers,
+                timeout=timeout,
+                processes=0,
+                refresh=True,
+            ):
+                results.append(result)
+                self._reschedule(result, now=now)
+        finally:
+            # If the lookup itself failed, retry the shows it didn't return a result for
+            # and give back the requests that were never made for them
+            refreshed = {result.identifier for result in results}
+            self.budget.refund(len(series_ids) - len(refreshed))
+
+            for series_id in series_ids:
+                if series_id not in refreshed and self._due.get(series_id) == _IN_FLIGHT:
+                    self.track(series_id, due=now + RefreshIntervals.RETRY)
+
+        return results
+
+    def _reschedule(self, result: BulkResult[int, Show], *, now: datetime.datetime) -> None:
+        if result.identifier not in self._due:
+            return
+
+        if isinstance(result.error, NotFoundException):
+            Log.info("Show %s no longer exists, no longer tracking it", result.identifier)
+            self.untrack(result.identifier)
+            return
+
+        if result.value is None:
+            Log.warning("Failed to refresh show %s: %s", result.identifier, result.error)
+            self.track(result.identifier, due=now + RefreshIntervals.RETRY)
+            return
+
+        self.track(result.identifier, due=next_refresh(result.value, now=now))
+
+        if self.on_refresh is not None:
+            self.on_refresh(result.value)
+
+    def seconds_until_work(self, *, now: datetime.datetime | None = None) -> float | None:
+        """Get how long until `refresh_due` would make a request.
+
+        Args:
+            now: The current time (default: now)
+
+        Returns:
+            The wait in seconds, or None if nothing is tracked
+        """
+        now = _utc(now) if now is not None else datetime.datetime.now(datetime.UTC)
+        due = self.next_due()
+
+        if due is None:
+            return None
+
+        return max((due - now).total_seconds(), self.budget.seconds_until_available())
+
+    def run(
+        self,
+        stop: threading.Event,
+        *,
+        timeout: float | None = None,
+        poll_interval: float = 60.0,
+    ) -> None:
+        """Refresh shows as they become due until `stop` is set.
+
+        Args:
+            stop: Set this to stop the loop
+            timeout: Request timeout in seconds for each request (default: 10.0)
+            poll_interval: The longest time to sleep between checks, in seconds
+        """
+        while not stop.is_set():
+            self.refresh_due(timeout=timeout)
+            wait = self.seconds_until_work()
+            stop.wait(poll_interval if wait is None else min(wait, poll_interval))
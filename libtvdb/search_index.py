@@ -0,0 +1,292 @@
+"""An offline fuzzy search index for show names."""
+
+import itertools
+import re
+import threading
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, ClassVar
+
+from libtvdb.model import Show
+from libtvdb.remote_ids import series_id
+from libtvdb.utilities import Log
+
+if TYPE_CHECKING:
+    from libtvdb.client import TVDBClient
+
+_NON_ALPHANUMERIC = re.compile(r"[^0-9a-z]+")
+_YEAR = re.compile(r"\b(19\d\d|20\d\d)\b")
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a show name for matching.
+
+    Case, punctuation and separators such as dots and underscores are
+    dropped, so "Doctor.Who_2005" becomes "doctor who 2005".
+
+    Args:
+        name: The name to normalize
+
+    Returns:
+        The normalized name
+    """
+    return _NON_ALPHANUMERIC.sub(" ", name.lower()).strip()
+
+
+def trigrams(normalized_name: str) -> set[str]:
+    """Get the set of character trigrams for a normalized name.
+
+    Args:
+        normalized_name: A name that has been through `normalize_name`
+
+    Returns:
+        The trigrams of the padded name
+    """
+    padded = f"  {normalized_name} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchMatch:
+    """A show returned from the search index along with how well it matched."""
+
+    show: Show
+    score: float
+    matched_name: str
+
+    def __init__(self, show: Show, score: float, matched_name: str) -> None:
+        self.show = show
+        self.score = score
+        self.matched_name = matched_name
+
+    def __str__(self) -> str:
+        return f"SearchMatch<{self.show.name} - {self.score:.2f}>"
+
+    def __repr__(self) -> str:
+        return f"SearchMatch<{self.show!r} - {self.score:.2f} ({self.matched_name!r})>"
+
+
+class ShowSearchIndex:
+    """A trigram index over show names, aliases, translations and slugs.
+
+    Each show is indexed under all of its known names. A query is scored
+    against every name that shares at least one trigram with it using the
+    Dice coefficient, and a show's score is the best score of any of its
+    names. A year in the query (e.g. "doctor.who.2005") is matched against
+    `Show.year`, and shows known to be from a different year are penalized.
+
+    Shows are identified by their TVDB ID, so a search result ("series-<id>")
+    and the full record of the same show are one entry.
+    """
+
+    YEAR_PENALTY: ClassVar[float] = 0.1
+    DEFAULT_MIN_CONFIDENCE: ClassVar[float] = 0.75
+
+    def __init__(self, shows: Iterable[Show] = ()) -> None:
+        """Create a new index.
+
+        Args:
+            shows: Shows to add to the index
+        """
+        self._lock = threading.Lock()
+        self._shows: dict[int, Show] = {}
+        self._names: dict[int, tuple[int, str, frozenset[str]]] = {}
+        self._positions = itertools.count()
+        self._show_names: dict[int, list[int]] = {}
+        self._exact: dict[str, set[int]] = defaultdict(set)
+        self._postings: dict[str, set[int]] = defaultdict(set)
+        self.add_many(shows)
+
+    def __len__(self) -> int:
+        return len(self._shows)
+
+    def __contains__(self, show: object) -> bool:
+        return isinstance(show, Show) and series_id(show) in self._shows
+
+    @staticmethod
+    def _names_for(show: Show) -> set[str]:
+        names: set[str] = set()
+
+        def add(name: object) -> None:
+            if isinstance(name, str) and name:
+                names.add(name)
+
+        add(getattr(show, "name", None))
+
+        slug = getattr(show, "slug", None)
+        if slug:
+            add(slug.replace("-", " "))
+
+        for alias in getattr(show, "aliases", None) or []:
+            add(alias.get("name") if isinstance(alias, dict) else alias)
+
+        # The API only gives language codes in `name_translations`, the
+        # translated names themselves are in these dictionaries
+        for translations in (
+            getattr(show, "translations", None),
+            getattr(show, "name_translated", None),
+        ):
+            if isinstance(translations, dict):
+                for translated_name in translations.values():
+                    add(translated_name)
+
+        return names
+
+    def add(self, show: Show) -> None:
+        """Add a show to the index.
+
+        Adding a show that is already indexed replaces it, along with the
+        names it is indexed under.
+
+        Args:
+            show: The show to add
+        """
+        show_id = series_id(show)
+
+        with self._lock:
+            self._remove_names(show_id)
+            self._shows[show_id] = show
+            positions = []
+
+            for name in self._names_for(show):
+                normalized = normalize_name(name)
+                if not normalized:
+                    continue
+
+                position = next(self._positions)
+                grams = frozenset(trigrams(normalized))
+                self._names[position] = (show_id, name, grams)
+                self._exact[normalized].add(position)
+                positions.append(position)
+
+                for gram in grams:
+                    self._postings[gram].add(position)
+
+            self._show_names[show_id] = positions
+
+    def _remove_names(self, show_id: int) -> None:
+        """Remove the names a show is indexed under. Call with the lock."""
+        for position in self._show_names.pop(show_id, ()):
+            _, name, grams = self._names.pop(position)
+            self._discard(self._exact, normalize_name(name), position)
+
+            for gram in grams:
+                self._discard(self._postings, gram, position)
+
+    @staticmethod
+    def _discard(index: dict[str, set[int]], key: str, position: int) -> None:
+        positions = index.get(key)
+
+        if positions is not None:
+            positions.discard(position)
+
+            if not positions:
+                del index[key]
+
+    def add_many(self, shows: Iterable[Show]) -> None:
+        """Add several shows to the index.
+
+        Args:
+            shows: The shows to add
+        """
+        for show in shows:
+            self.add(show)
+
+    def search(self, query: str, *, limit: int = 10) -> list[SearchMatch]:
+        """Find the shows that best match a (possibly noisy) name.
+
+        Args:
+            query: The name to search for
+            limit: Maximum number of matches to return
+
+        Returns:
+            Matches ordered from best to worst
+        """
+        normalized = normalize_name(query)
+
+        if not normalized:
+            return []
+
+        year_match = _YEAR.search(normalized)
+        year = year_match.group(1) if year_match else None
+        queries = [normalized]
+
+        if year is not None:
+            without_year = " ".join(_YEAR.sub(" ", normalized).split())
+            if without_year:
+                queries.append(without_year)
+
+        best: dict[int, tuple[float, str]] = {}
+
+        with self._lock:
+            for candidate in queries:
+                for show_id, score, name in self._score(candidate):
+                    if score > best.get(show_id, (0.0, ""))[0]:
+                        best[show_id] = (score, name)
+
+            matches = []
+            for show_id, (score, name) in best.items():
+                show = self._shows[show_id]
+                show_year = getattr(show, "year", None)
+                if year is not None and show_year and show_year != year:
+                    score *= 1.0 - ShowSearchIndex.YEAR_PENALTY
+                matches.append(SearchMatch(show, score, name))
+
+        matches.sort(key=lambda match: match.score, reverse=True)
+        return matches[:limit]
+
+    def _score(self, normalized: str) -> Iterable[tuple[int, float, str]]:
+        exact = self._exact.get(normalized)
+        if exact:
+            for position in exact:
+                show_id, name, _ = self._names[position]
+                yield show_id, 1.0, name
+            return
+
+        query_grams = trigrams(normalized)
+        shared: dict[int, int] = defaultdict(int)
+
+        for gram in query_grams:
+            for position in self._postings.get(gram, ()):
+                shared[position] += 1
+
+        for position, count in shared.items():
+            show_id, name, grams = self._names[position]
+            yield show_id, 2.0 * count / (len(query_grams) + len(grams)), name
+
+    def search_or_fetch(
+        self,
+        client: "TVDBClient",
+        query: str,
+        *,
+        min_confidence: float | None = None,
+        limit: int = 10,
+        timeout: float | None = None,
+    ) -> list[SearchMatch]:
+        """Search the index, falling back to the API when the best match is weak.
+
+        Shows returned by the API are added to the index, so later lookups for
+        the same name are answered locally.
+
+        Args:
+            client: The client to search with when the local result isn't good enough
+            query: The name to search for
+            min_confidence: Score the best local match must reach to skip the API (default: 0.75)
+            limit: Maximum number of matches to return
+            timeout: Request timeout in seconds for the API search (default: 10.0)
+
+        Returns:
+            Matches ordered from best to worst
+        """
+        if min_confidence is None:
+            min_confidence = ShowSearchIndex.DEFAULT_MIN_CONFIDENCE
+
+        matches = self.search(query, limit=limit)
+
+        if matches and matches[0].score >= min_confidence:
+            return matches
+
+        Log.debug("Low confidence local match for '%s', searching the API", query)
+
+        self.add_many(client.search_show(query, timeout=timeout))
+
+        return self.search(query, limit=limit)
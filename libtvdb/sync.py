@@ -0,0 +1,289 @@
+"""Incremental synchronisation of tracked shows using the updates endpoint."""
+
+import contextlib
+import json
+import os
+import time
+from collections.abc import Iterable
+from typing import Any
+
+from libtvdb.bulk import BulkResult, bounded_map
+from libtvdb.client import TVDBClient
+from libtvdb.exceptions import NotFoundException
+from libtvdb.model import EntityUpdate, Episode, Show
+from libtvdb.utilities import Log
+
+
+class SyncResult:
+    """The records that were refreshed during a single sync."""
+
+    since: int | None
+    high_water_mark: int | None
+    shows: list[Show]
+    episodes: list[Episode]
+    deleted_series_ids: list[int]
+    deleted_episode_ids: list[int]
+    failures: list[BulkResult]
+
+    def __init__(self, since: int | None) -> None:
+        self.since = since
+        self.high_water_mark = since
+        self.shows = []
+        self.episodes = []
+        self.deleted_series_ids = []
+        self.deleted_episode_ids = []
+        self.failures = []
+
+    def __str__(self) -> str:
+        return (
+            f"SyncResult<{len(self.shows)} shows, {len(self.episodes)} episodes, "
+            f"{len(self.failures)} failures>"
+        )
+
+
+class SyncEngine:
+    """Keeps a set of tracked shows up to date by polling for changes.
+
+    The first sync fetches every tracked show in full. After that only the
+    shows and episodes that appear in the updates feed are fetched again,
+    along with any shows that were tracked since the last sync. The timestamp
+    of the newest update that has been processed is persisted to `state_path`
+    so that a new engine picks up where the last one stopped.
+
+    Shows and episodes the API no longer has are reported as deleted, and
+    deleted shows are no longer tracked. If the client has a mirror, refreshed
+    records are written to it and deleted ones are removed from it.
+    """
+
+    client: TVDBClient
+    state_path: str
+    tracked_series: set[int]
+    max_workers: int | None
+
+    def __init__(
+        self,
+        client: TVDBClient,
+        *,
+        state_path: str,
+        series_ids: Iterable[int] = (),
+        max_workers: int | None = None,
+    ) -> None:
+        """Create a new sync engine.
+
+        Args:
+            client: The client to make requests with
+            state_path: Path of the file used to persist the high-water mark
+            series_ids: The TVDB IDs of the shows to keep up to date
+            max_workers: Maximum number of concurrent requests when refetching
+        """
+        self.client = client
+        self.state_path = state_path
+        self.tracked_series = set(series_ids)
+        self.max_workers = max_workers
+        self._new_series: set[int] = set()
+
+    def track(self, series_id: int) -> None:
+        """Start tracking a show.
+
+        A show that wasn't already tracked is fetched in full on the next sync.
+
+        Args:
+            series_id: The TVDB ID of the show
+        """
+        if series_id not in self.tracked_series:
+            self.tracked_series.add(series_id)
+            self._new_series.add(series_id)
+
+    def untrack(self, series_id: int) -> None:
+        """Stop tracking a show.
+
+        Args:
+            series_id: The TVDB ID of the show
+        """
+        self.tracked_series.discard(series_id)
+        self._new_series.discard(series_id)
+
+    def _load_state(self) -> dict[str, Any]:
+        try:
+            with open(self.state_path, encoding="utf-8") as state_file:
+                state: dict[str, Any] = json.load(state_file)
+                return state
+        except FileNotFoundError:
+            return {}
+
+    @property
+    def high_water_mark(self) -> int | None:
+        """The timestamp of the newest processed update, or None if never synced."""
+        since = self._load_state().get("since")
+        return int(since) if since is not None else None
+
+    def _save_state(self, since: int | None) -> None:
+        temporary_path = f"{self.state_path}.tmp"
+
+        with open(temporary_path, "w", encoding="utf-8") as state_file:
+            json.dump({"since": since, "new_series": sorted(self._new_series)}, state_file)
+
+        os.replace(temporary_path, self.state_path)
+
+    def reset(self) -> None:
+        """Forget the high-water mark so that the next sync is a full refresh."""
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.state_path)
+
+    def sync(self, *, timeout: float | None = None) -> SyncResult:
+        """Fetch everything that has changed since the last sync.
+
+        The high-water mark is only advanced if every refetch succeeded, so
+        failed records are retried on the next sync.
+
+        Args:
+            timeout: Request timeout in seconds for each request (default: 10.0)
+
+        Returns:
+            The refreshed records
+
+        Raises:
+            TVDBException: If the updates feed could not be read
+        """
+        state = self._load_state()
+        since = int(state["since"]) if state.get("since") is not None else None
+        result = SyncResult(since)
+        # Shows tracked since the last sync, possibly by an earlier engine
+        self._new_series.update(
+            series_id
+            for series_id in state.get("new_series", [])
+            if series_id in self.tracked_series
+        )
+
+        if since is None:
+            Log.info("No sync state found, fetching %s shows in full", len(self.tracked_series))
+            started = int(time.time())
+            self._refresh_shows(
+                set(self.tracked_series), result, with_episodes=True, timeout=timeout
+            )
+            new_mark: int = started
+        else:
+            updates = self.client.updates(since, timeout=timeout)
+            Log.info("Processing %s updates since %s", len(updates), since)
+            self._apply_updates(updates, result, timeout=timeout)
+            new_mark = max((int(update.timestamp.timestamp()) for update in updates), default=since)
+
+        self._delete_from_mirror(result)
+
+        if result.failures:
+            Log.warning("%s records failed to sync, not advancing state", len(result.failures))
+            self._save_state(since)
+            return result
+
+        self._save_state(new_mark)
+        result.high_water_mark = new_mark
+        return result
+
+    def _apply_updates(
+        self, updates: list[EntityUpdate], result: SyncResult, *, timeout: float | None
+    ) -> None:
+        series_to_refresh: set[int] = set()
+        episodes_to_refresh: set[int] = set()
+        deleted_episodes: set[int] = set()
+
+        for update in updates:
+            if update.entity_type == "series":
+                series_id = update.record_id
+            else:
+                series_id = update.series_id or 0
+
+            if series_id not in self.tracked_series:
+                continue
+
+            if update.entity_type == "episodes":
+                if update.method == "delete":
+                    deleted_episodes.add(update.record_id)
+                else:
+                    episodes_to_refresh.add(update.record_id)
+            elif update.entity_type == "series" and update.method == "delete":
+                result.deleted_series_ids.append(series_id)
+            else:
+                series_to_refresh.add(series_id)
+
+        for series_id in result.deleted_series_ids:
+            self.untrack(series_id)
+
+        new_series = set(self._new_series)
+        series_to_refresh.difference_update(result.deleted_series_ids, new_series)
+        episodes_to_refresh.difference_update(deleted_episodes)
+        result.deleted_episode_ids.extend(sorted(deleted_episodes))
+
+        self._refresh_shows(new_series, result, with_episodes=True, timeout=timeout)
+        self._refresh_shows(series_to_refresh, result, with_episodes=False, timeout=timeout)
+        self._refresh_episodes(episodes_to_refresh, result, timeout=timeout)
+
+    def _delete_from_mirror(self, result: SyncResult) -> None:
+        mirror = self.client.mirror
+        if mirror is None:
+            return
+
+        mirror.delete_episodes(result.deleted_episode_ids)
+        for series_id in result.deleted_series_ids:
+            mirror.delete_show(series_id)
+
+    def _refresh_episodes(
+        self, episode_ids: set[int], result: SyncResult, *, timeout: float | None
+    ) -> None:
+        refreshed: list[Episode] = []
+
+        for episode_result in self.client.episodes_by_id_many(
+            episode_ids, max_workers=self.max_workers, timeout=timeout
+        ):
+            if episode_result.value is not None:
+                refreshed.append(episode_result.value)
+            elif isinstance(episode_result.error, NotFoundException):
+                result.deleted_episode_ids.append(episode_result.identifier)
+            else:
+                result.failures.append(episode_result)
+
+        # Episodes fetched by ID don't go through the mirror, unlike shows
+        if self.client.mirror is not None:
+            self.client.mirror.store_episodes(refreshed)
+        result.episodes.extend(refreshed)
+
+    def _refresh_shows(
+        self,
+        series_ids: set[int],
+        result: SyncResult,
+        *,
+        with_episodes: bool,
+        timeout: float | None,
+    ) -> None:
+        if not series_ids:
+            return
+
+        def fetch(series_id: int) -> tuple[Show | None, list[Episode]]:
+            # The feed says this show changed, so a mirrored copy is out of date
+            show = self.client.show_info(series_id, timeout=timeout, refresh=True)
+            if not with_episodes:
+                return show, []
+            return show, self.client.episodes_from_show_id(series_id, timeout=timeout, refresh=True)
+
+        for show_result in bounded_map(
+            fetch,
+            series_ids,
+            max_workers=self.max_workers or TVDBClient.Constants.DEFAULT_MAX_WORKERS,
+        ):
+            if isinstance(show_result.error, NotFoundException):
+                Log.info("Show %s no longer exists, no longer tracking it", show_result.identifier)
+                result.deleted_series_ids.append(show_result.identifier)
+                self.untrack(show_result.identifier)
+                continue
+
+            if show_result.value is None:
+                result.failures.append(show_result)
+                continue
+
+            # Fetched in full, so no longer waiting for its first sync
+            self._new_series.discard(show_result.identifier)
+            show, episodes = show_result.value
+
+            if show is not None:
+                result.shows.append(show)
+
+            result.episodes.extend(episodes)
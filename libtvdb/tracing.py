@@ -0,0 +1,84 @@
+"""Optional OpenTelemetry tracing for client operations.
+
+If the `opentelemetry-api` package is installed, the client creates a span
+for each public call with child spans for authentication, each page it
+fetches and building the models. Spans go to whatever tracer provider the
+application has configured. Without the package, every helper here is a
+no-op that returns a shared object, so there is nothing to pay for.
+"""
+
+import contextlib
+from collections.abc import Callable, Mapping
+from contextlib import AbstractContextManager
+from typing import Any, TypeVar
+
+try:
+    from opentelemetry import context as otel_context
+    from opentelemetry import trace
+except ImportError:
+    otel_context = None  # type: ignore[assignment]
+    trace = None  # type: ignore[assignment]
+
+T = TypeVar("T")
+
+TRACER_NAME = "libtvdb"
+
+_NO_SPAN: AbstractContextManager[Any] = contextlib.nullcontext()
+_tracer: Any = trace.get_tracer(TRACER_NAME) if trace is not None else None
+
+
+def is_enabled() -> bool:
+    """Check if spans are being created.
+
+    Returns:
+        True if OpenTelemetry is installed, False otherwise
+    """
+    return _tracer is not None
+
+
+def span(
+    name: str, attributes: Mapping[str, str | int | float | bool] | None = None
+) -> AbstractContextManager[Any]:
+    """Start a span as a child of the current one.
+
+    Args:
+        name: The operation name, which is prefixed with "libtvdb."
+        attributes: Attributes to set on the span
+
+    Returns:
+        A context manager that yields the span, or None if tracing isn't available
+    """
+    if _tracer is None:
+        return _NO_SPAN
+
+    started: AbstractContextManager[Any] = _tracer.start_as_current_span(
+        f"libtvdb.{name}", attributes=attributes
+    )
+    return started
+
+
+def propagate(function: Callable[..., T]) -> Callable[..., T]:
+    """Make a function run in the caller's trace context on any thread.
+
+    Work handed to a thread pool would otherwise start new traces rather
+    than appear as children of the span that scheduled it.
+
+    Args:
+        function: The function to wrap
+
+    Returns:
+        The wrapped function, or the function itself if tracing isn't available
+    """
+    if otel_context is None:
+        return function
+
+    parent = otel_context.get_current()
+
+    def wrapper(*args: Any, **kwargs: Any) -> T:
+        token = otel_context.attach(parent)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            otel_context.detach(token)
+
+    return wrapper
@@ -0,0 +1,390 @@
+"""The HTTP layer the client sends its requests through."""
+
+import json
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Mapping
+from typing import TYPE_CHECKING, Any, Protocol
+
+# requests and urllib3 are imported when a transport first uses them, which keeps
+# `import libtvdb` cheap for code that never makes a request
+if TYPE_CHECKING:
+    import requests
+    import urllib3
+
+
+class Response(Protocol):
+    """The parts of an HTTP response the client uses.
+
+    `requests.Response` satisfies this, as does `TransportResponse`.
+    """
+
+    @property
+    def status_code(self) -> int:
+        """The HTTP status code."""
+
+    @property
+    def headers(self) -> Mapping[str, str]:
+        """The response headers."""
+
+    @property
+    def content(self) -> bytes:
+        """The raw response body."""
+
+    @property
+    def text(self) -> str:
+        """The response body decoded as text."""
+
+    @property
+    def url(self) -> str:
+        """The URL that was requested."""
+
+    def json(self) -> Any:
+        """Decode the response body as JSON."""
+
+
+class TransportResponse:
+    """A complete HTTP response held in memory.
+
+    `content` is the decoded body. `wire_bytes` is the size of the body as it
+    was received, which is smaller when the response was compressed.
+    """
+
+    status_code: int
+    headers: dict[str, str]
+    content: bytes
+    url: str
+    wire_bytes: int
+
+    def __init__(
+        self,
+        status_code: int,
+        content: bytes,
+        *,
+        headers: Mapping[str, str] | None = None,
+        url: str = "",
+        wire_bytes: int | None = None,
+    ) -> None:
+        self.status_code = status_code
+        self.content = content
+        self.headers = dict(headers or {})
+        self.url = url
+        self.wire_bytes = len(content) if wire_bytes is None else wire_bytes
+
+    @property
+    def text(self) -> str:
+        """The response body decoded as UTF-8."""
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        """Decode the response body as JSON.
+
+        Returns:
+            The decoded body
+
+        Raises:
+            json.JSONDecodeError: If the body isn't valid JSON
+        """
+        return json.loads(self.content)
+
+    def __str__(self) -> str:
+        return f"TransportResponse<{self.status_code}>"
+
+    def __repr__(self) -> str:
+        return f"TransportResponse<{self.status_code} {self.url} ({len(self.content)} bytes)>"
+
+
+class Transport(ABC):
+    """Sends HTTP requests for the client.
+
+    Implementations should raise one of `timeout_exceptions` when a request
+    times out, so that the client can retry it where appropriate.
+    """
+
+    @property
+    def timeout_exceptions(self) -> tuple[type[Exception], ...]:
+        """The exceptions `send` raises when a request times out."""
+        return (TimeoutError,)
+
+    @abstractmethod
+    def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Mapping[str, str],
+        timeout: float,
+        json_body: Any = None,
+    ) -> Response:
+        """Send a request and wait for the complete response.
+
+        Args:
+            method: The HTTP method
+            url: The full URL
+            headers: The request headers
+            timeout: Request timeout in seconds
+            json_body: A value to send as the JSON request body, if any
+
+        Returns:
+            The response
+        """
+
+    def close(self) -> None:  # noqa: B027
+        """Release any connections held by the transport."""
+
+
+class RequestsTransport(Transport):
+    """Sends requests with the `requests` library.
+
+    Without a session each request uses the module level `requests`
+    functions. Pass a `requests.Session` to reuse its connection pool,
+    adapters and retry configuration.
+    """
+
+    session: "requests.Session | None"
+
+    def __init__(self, session: "requests.Session | None" = None) -> None:
+        """Create a new transport.
+
+        Args:
+            session: The session to send requests with (default: none)
+        """
+        self.session = session
+
+    @property
+    def timeout_exceptions(self) -> tuple[type[Exception], ...]:
+        """The exceptions `send` raises when a request times out."""
+        import requests  # pylint: disable=import-outside-toplevel
+
+        return (requests.exceptions.Timeout, TimeoutError)
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Mapping[str, str],
+        timeout: float,
+        json_body: Any = None,
+    ) -> Response:
+        """Send a request with `requests`.
+
+        Args:
+            method: The HTTP method
+            url: The full URL
+            headers: The request headers
+            timeout: Request timeout in seconds
+            json_body: A value to send as the JSON request body, if any
+
+        Returns:
+            The response
+        """
+        import requests  # pylint: disable=import-outside-toplevel
+
+        if self.session is not None:
+            return self.session.request(
+                method, url, json=json_body, headers=dict(headers), timeout=timeout
+            )
+
+        if method == "GET":
+            return requests.get(url, headers=dict(headers), timeout=timeout)
+
+        if method == "POST":
+            return requests.post(url, json=json_body, headers=dict(headers), timeout=timeout)
+
+        return requests.request(method, url, json=json_body, headers=dict(headers), timeout=timeout)
+
+    def close(self) -> None:
+        """Close the session, if there is one."""
+        if self.session is not None:
+            self.session.close()
+
+
+class Urllib3Transport(Transport):
+    """Sends requests with a `urllib3` connection pool.
+
+    This skips the work `requests` does on top of urllib3 (sessions, hooks,
+    cookie handling), which is noticeable when making many small requests.
+    """
+
+    pool: "urllib3.PoolManager"
+
+    def __init__(
+        self, pool: "urllib3.PoolManager | None" = None, *, max_connections: int = 10
+    ) -> None:
+        """Create a new transport.
+
+        Args:
+            pool: The pool to send requests with (default: a new PoolManager)
+            max_connections: Connections to keep open per host for a new pool
+        """
+        import urllib3  # pylint: disable=import-outside-toplevel
+
+        self.pool = pool or urllib3.PoolManager(maxsize=max_connections)
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Mapping[str, str],
+        timeout: float,
+        json_body: Any = None,
+    ) -> Response:
+        """Send a request with urllib3.
+
+        Args:
+            method: The HTTP method
+            url: The full URL
+            headers: The request headers
+            timeout: Request timeout in seconds
+            json_body: A value to send as the JSON request body, if any
+
+        Returns:
+            The response
+
+        Raises:
+            TimeoutError: If the request timed out
+        """
+        import urllib3  # pylint: disable=import-outside-toplevel
+
+        request_headers = dict(headers)
+        body = None
+
+        if json_body is not None:
+            body = json.dumps(json_body).encode("utf-8")
+            request_headers["Content-Type"] = "application/json"
+
+        try:
+            response = self.pool.request(
+                method,
+                url,
+                headers=request_headers,
+                body=body,
+                timeout=urllib3.Timeout(total=timeout),
+                retries=False,
+            )
+        except urllib3.exceptions.TimeoutError as ex:
+            raise TimeoutError(f"Request timed out: {method} {url}") from ex
+
+        return TransportResponse(
+            response.status,
+            response.data,
+            headers=dict(response.headers),
+            url=url,
+            wire_bytes=response.tell(),
+        )
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        self.pool.clear()
+
+
+FakeHandler = Callable[[str, str, Any], TransportResponse]
+
+
+class FakeTransport(Transport):
+    """An in-memory transport for tests.
+
+    Responses are registered against a method and URL, which may be given
+    relative to `base_url`. A registered response can be a fixed
+    `TransportResponse` or a function that builds one from the method, URL
+    and JSON body. Every request is kept in `requests` so that tests can
+    check what was sent. Logging in succeeds unless a login response is
+    registered, and anything else that wasn't registered gets the API's
+    not found error.
+    """
+
+    base_url: str
+    requests: list[tuple[str, str, dict[str, str], Any]]
+
+    def __init__(self, base_url: str = "https://api4.thetvdb.com/v4") -> None:
+        """Create a new fake transport.
+
+        Args:
+            base_url: The base that relative URLs are resolved against
+        """
+        self.base_url = base_url.rstrip("/")
+        self.requests = []
+        self._responses: dict[tuple[str, str], list[TransportResponse | FakeHandler]] = {}
+        self._lock = threading.Lock()
+
+    def _url(self, url: str) -> str:
+        if "://" in url:
+            return url
+        return f"{self.base_url}/{url.lstrip('/')}"
+
+    def add(
+        self,
+        method: str,
+        url: str,
+        response: TransportResponse | FakeHandler | None = None,
+        *,
+        status_code: int = 200,
+        json_body: Any = None,
+        headers: Mapping[str, str] | None = None,
+    ) -> None:
+        """Register a response.
+
+        Registering several responses for the same request returns them in
+        order, and the last one is repeated once they have all been used.
+
+        Args:
+            method: The HTTP method
+            url: The full URL, or a path relative to `base_url`
+            response: The response, or a function that builds it
+            status_code: The status code when building the response from `json_body`
+            json_body: A value to return as the JSON body when `response` isn't given
+            headers: The headers when building the response from `json_body`
+        """
+        full_url = self._url(url)
+
+        if response is None:
+            response = TransportResponse(
+                status_code,
+                json.dumps(json_body).encode("utf-8"),
+                headers={"Content-Type": "application/json", **(headers or {})},
+                url=full_url,
+            )
+
+        with self._lock:
+            self._responses.setdefault((method, full_url), []).append(response)
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Mapping[str, str],
+        timeout: float,
+        json_body: Any = None,
+    ) -> Response:
+        """Answer a request with a registered response.
+
+        Args:
+            method: The HTTP method
+            url: The full URL
+            headers: The request headers
+            timeout: Request timeout in seconds (ignored)
+            json_body: The JSON request body, if any
+
+        Returns:
+            The registered response
+        """
+        with self._lock:
+            self.requests.append((method, url, dict(headers), json_body))
+            registered = self._responses.get((method, url))
+            response = registered.pop(0) if registered and len(registered) > 1 else None
+
+            if response is None and registered:
+                response = registered[0]
+
+        if response is None:
+            if method == "POST" and url == self._url("login"):
+                return TransportResponse(200, b'{"data": {"token": "fake-token"}}', url=url)
+            return TransportResponse(404, b'{"Error": "Resource not found"}', url=url)
+
+        if isinstance(response, TransportResponse):
+            return response
+
+        return response(method, url, json_body)
@@ -1,8 +1,9 @@
 """Utility classes and methods for working with the TVDB API."""
 
 import datetime
+import functools
 import logging
-from typing import Final
+from typing import ClassVar, Final
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +14,60 @@ INVALID_DATETIME_PLACEHOLDER: Final[str] = "0000-00-00 00:00:00"
 DATE_COMPONENTS_COUNT: Final[int] = 3
 DATETIME_FORMAT_STRING: Final[str] = "%Y-%m-%d %H:%M:%S"
 
+# The API repeats the same handful of dates across every episode of a show,
+# so parsed values are memoized. Dates are immutable so sharing is safe.
+PARSE_CACHE_SIZE: Final[int] = 4096
+ISO_DATE_LENGTH: Final[int] = len("YYYY-MM-DD")
+ISO_DATETIME_LENGTH: Final[int] = len("YYYY-MM-DD HH:MM:SS")
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_date_cached(input_string: str) -> datetime.date:
+    """Parse a date string, using fromisoformat when it is in the canonical form.
+
+    Anything fromisoformat rejects goes through the component based parser,
+    so unusual input gets the same result (or error) as it always has.
+    """
+
+    if len(input_string) == ISO_DATE_LENGTH and input_string[4] == input_string[7] == "-":
+        try:
+            return datetime.date.fromisoformat(input_string)
+        except ValueError:
+            pass
+
+    components = input_string.split("-")
+
+    if len(components) != DATE_COMPONENTS_COUNT:
+        raise ValueError(f"The input string should be of the format {EXPECTED_DATE_FORMAT}.")
+
+    try:
+        year, month, day = (int(component) for component in components)
+    except ValueError as ex:
+        raise ValueError(
+            f"The input string should be of the format {EXPECTED_DATE_FORMAT}, "
+            "where each date component is an integer."
+        ) from ex
+
+    return datetime.date(year=year, month=month, day=day)
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_datetime_cached(input_string: str) -> datetime.datetime:
+    """Parse a datetime string, using fromisoformat when it is in the canonical form."""
+
+    if (
+        len(input_string) == ISO_DATETIME_LENGTH
+        and input_string[4] == input_string[7] == "-"
+        and input_string[10] == " "
+        and input_string[13] == input_string[16] == ":"
+    ):
+        try:
+            return datetime.datetime.fromisoformat(input_string)
+        except ValueError:
+            pass
+
+    return datetime.datetime.strptime(input_string, DATETIME_FORMAT_STRING)
+
 
 def parse_date(input_string: str) -> datetime.date:
     """Parse a date string from the API in YYYY-MM-DD format into a date object.
@@ -30,25 +85,7 @@ def parse_date(input_string: str) -> datetime.date:
     if not input_string:
         raise ValueError("The input string should not be None or empty.")
 
-    components = input_string.split("-")
-
-    if len(components) != DATE_COMPONENTS_COUNT:
-        raise ValueError(f"The input string should be of the format {EXPECTED_DATE_FORMAT}.")
-
-    for component in components:
-        try:
-            _ = int(component)
-        except ValueError as ex:
-            raise ValueError(
-                f"The input string should be of the format {EXPECTED_DATE_FORMAT}, "
-                "where each date component is an integer."
-            ) from ex
-
-    year = int(components[0])
-    month = int(components[1])
-    day = int(components[2])
-
-    return datetime.date(year=year, month=month, day=day)
+    return _parse_date_cached(input_string)
 
 
 def parse_datetime(input_string: str) -> datetime.datetime:
@@ -70,28 +107,50 @@ def parse_datetime(input_string: str) -> datetime.datetime:
     if input_string == INVALID_DATETIME_PLACEHOLDER:
         raise ValueError(f"Invalid date time: {INVALID_DATETIME_PLACEHOLDER}")
 
-    return datetime.datetime.strptime(input_string, DATETIME_FORMAT_STRING)
+    return _parse_datetime_cached(input_string)
 
 
 class Log:
-    """Logging wrapper class for backward compatibility."""
+    """Logging wrapper class for backward compatibility.
+
+    Messages use %-style placeholders and the arguments are only formatted
+    if the record will actually be emitted, so a disabled level costs a
+    single check. Library logging can also be switched off entirely with
+    `Log.disable()`, which skips even that check.
+    """
+
+    enabled: ClassVar[bool] = True
+
+    @staticmethod
+    def disable() -> None:
+        """Turn off all logging from libtvdb."""
+        Log.enabled = False
+
+    @staticmethod
+    def enable() -> None:
+        """Turn logging from libtvdb back on (subject to the logger's level)."""
+        Log.enabled = True
 
     @staticmethod
-    def info(message: str) -> None:
+    def info(message: str, *args: object) -> None:
         """Log an info level log message."""
-        logger.info(message)
+        if Log.enabled and logger.isEnabledFor(logging.INFO):
+            logger.info(message, *args)
 
     @staticmethod
-    def debug(message: str) -> None:
+    def debug(message: str, *args: object) -> None:
         """Log a debug level log message."""
-        logger.debug(message)
+        if Log.enabled and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(message, *args)
 
     @staticmethod
-    def warning(message: str) -> None:
+    def warning(message: str, *args: object) -> None:
         """Log a warning level log message."""
-        logger.warning(message)
+        if Log.enabled and logger.isEnabledFor(logging.WARNING):
+            logger.warning(message, *args)
 
     @staticmethod
-    def error(message: str) -> None:
+    def error(message: str, *args: object) -> None:
         """Log an error level log message."""
-        logger.error(message)
+        if Log.enabled and logger.isEnabledFor(logging.ERROR):
+            logger.error(message, *args)
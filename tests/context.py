@@ -2,6 +2,9 @@
 
 import os
 import sys
+from collections.abc import Iterator
+from typing import Any
+from unittest.mock import Mock
 
 import dotenv
 import pytest
@@ -16,6 +19,7 @@ except (ImportError, Exception):  # pylint: disable=broad-exception-caught
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 # pylint: disable=wrong-import-position
 import libtvdb
+from libtvdb.cassette import CassetteTransport
 
 # pylint: enable=wrong-import-position
 
@@ -36,16 +40,118 @@ def _read_secret(secret_name: str) -> str | None:
     return os.environ.get(secret_name.upper())
 
 
+EPISODES_URL = "https://api4.thetvdb.com/v4/series/1/episodes/default"
+
+
+def episode_data(identifier: int, number: int | None = None) -> dict[str, Any]:
+    """Build the API data for a minimal episode of show 1.
+
+    Args:
+        identifier: The episode ID
+        number: The episode number (default: the ID)
+
+    Returns:
+        The episode as the API returns it
+    """
+    return {
+        "id": identifier,
+        "seriesId": 1,
+        "seasonNumber": 1,
+        "number": identifier if number is None else number,
+        "isMovie": 0,
+        "lastUpdated": "2020-01-01 00:00:00",
+    }
+
+
+def api_response(
+    data: Any, links: dict[str, Any] | None = None, *, status_code: int = 200, size: int = 42
+) -> Mock:
+    """Build a mocked `requests` response with an API body.
+
+    Args:
+        data: The data of the body
+        links: The paging links of the body, if any
+        status_code: The HTTP status code
+        size: The size of the raw body in bytes
+
+    Returns:
+        The response
+    """
+    response = Mock(status_code=status_code, content=b"x" * size, text="error")
+    response.json.return_value = {"data": data, "links": links or {}}
+    return response
+
+
+def episode_page(page: int, page_count: int, total_items: int = 5, page_size: int = 2) -> Mock:
+    """Build a mocked response for one page of show 1's episodes.
+
+    Each page holds two episodes, with IDs `page * 10 + 1` and `page * 10 + 2`.
+
+    Args:
+        page: The page number, from 0
+        page_count: The number of pages, which decides whether there is a next link
+        total_items: The item count the page reports
+        page_size: The page size the page reports
+
+    Returns:
+        The response
+    """
+    has_next = page + 1 < page_count
+    links = {
+        "next": f"{EPISODES_URL}?page={page + 1}" if has_next else None,
+        "total_items": total_items,
+        "page_size": page_size,
+    }
+    episodes = [episode_data(page * 10 + 1), episode_data(page * 10 + 2)]
+    return api_response({"episodes": episodes}, links)
+
+
+def page_number(url: str) -> int:
+    """Get the page number from a paged URL, 0 if it has none."""
+    return int(url.split("page=")[1]) if "page=" in url else 0
+
+
+CASSETTE_PATH = os.path.join(os.path.dirname(__file__), "cassettes", "live_api.json.gz")
+
+
 @pytest.fixture(scope="session")
-def tvdb_client() -> libtvdb.TVDBClient:
-    """Fixture that provides a TVDB client for tests."""
+def tvdb_client() -> Iterator[libtvdb.TVDBClient]:
+    """Fixture that provides a TVDB client for tests.
+
+    With LIBTVDB_RECORD=1 every request is recorded to CASSETTE_PATH. If
+    that cassette exists, requests are replayed from it so the tests run
+    offline and without credentials. LIBTVDB_LIVE=1 forces the live API.
+
+    The cassette has to be recorded with real credentials, so it isn't part of
+    the repository. Without it or credentials, the tests using this fixture
+    are skipped unless the live API was asked for.
+    """
+    recording = os.environ.get("LIBTVDB_RECORD") == "1"
+    live = os.environ.get("LIBTVDB_LIVE") == "1"
+
+    if not recording and not live and os.path.exists(CASSETTE_PATH):
+        yield libtvdb.TVDBClient(
+            api_key="replay", pin="replay", transport=CassetteTransport(CASSETTE_PATH)
+        )
+        return
+
     api_key = _read_secret("libtvdb_api_key")
     pin = _read_secret("libtvdb_pin")
 
+    if not recording and not live and (api_key is None or pin is None):
+        pytest.skip("Needs TVDB credentials or a recorded cassette")
+
     if api_key is None:
         raise Exception("Failed to get API Key")
 
     if pin is None:
         raise Exception("Failed to get PIN")
 
-    return libtvdb.TVDBClient(api_key=api_key, pin=pin)
+    if not recording:
+        yield libtvdb.TVDBClient(api_key=api_key, pin=pin)
+        return
+
+    os.makedirs(os.path.dirname(CASSETTE_PATH), exist_ok=True)
+
+    with CassetteTransport.recording(CASSETTE_PATH) as transport:
+        yield libtvdb.TVDBClient(api_key=api_key, pin=pin, transport=transport)
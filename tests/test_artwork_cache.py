@@ -0,0 +1,237 @@
+"""Tests for downloading artwork into the disk cache."""
+
+import http.server
+import os
+import re
+import threading
+import time
+
+import pytest
+
+from libtvdb.artwork_cache import ArtworkCache, ArtworkDownloader
+from libtvdb.exceptions import DownloadException, NotFoundException
+from libtvdb.model import Artwork
+
+IMAGE = bytes(range(256)) * 40
+
+
+class _ImageServer:
+    """Serves images over HTTP with support for range requests."""
+
+    def __init__(self):
+        self.files = {"/poster.jpg": IMAGE, "/copy.jpg": IMAGE, "/thumb.jpg": IMAGE[:100]}
+        self.requests = []
+        self.truncate_next = False
+        self.ignore_ranges = False
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            """Serves the files, honouring Range headers."""
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                """Send a file, or part of it."""
+                server.requests.append((self.path, self.headers.get("Range")))
+                body = server.files.get(self.path)
+
+                if body is None:
+                    self.send_error(404)
+                    return
+
+                match = re.fullmatch(r"bytes=(\d+)-", self.headers.get("Range") or "")
+
+                if match is not None and not server.ignore_ranges:
+                    start = int(match.group(1))
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+                    body = body[start:]
+                else:
+                    self.send_response(200)
+
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+
+                if server.truncate_next:
+                    server.truncate_next = False
+                    self.wfile.write(body[: len(body) // 2])
+                    self.close_connection = True
+                    return
+
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(
+            target=self.httpd.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+        )
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _artwork(server, identifier, path="/poster.jpg", updated_at=1):
+    artwork = Artwork.__new__(Artwork)
+    artwork.identifier = str(identifier)
+    artwork.image = server.base_url + path
+    artwork.thumbnail = server.base_url + "/thumb.jpg"
+    artwork.updated_at = updated_at
+    return artwork
+
+
+@pytest.fixture(name="server")
+def fixture_server():
+    """Run an image server for the test."""
+    with _ImageServer() as server:
+        yield server
+
+
+def test_download_is_cached(server, tmp_path):
+    """Test that an image is downloaded once and then read from the cache."""
+    cache = ArtworkCache(str(tmp_path))
+
+    with ArtworkDownloader(cache) as downloader:
+        path = downloader.download(_artwork(server, 1))
+        assert downloader.download(_artwork(server, 1)) == path
+        thumbnail_path = downloader.download(_artwork(server, 1), thumbnail=True)
+
+    assert len(server.requests) == 2
+    assert cache.get(_artwork(server, 1)) == IMAGE
+    assert cache.get(_artwork(server, 1), thumbnail=True) == IMAGE[:100]
+    assert thumbnail_path != path
+    assert os.path.basename(path).startswith(os.path.basename(os.path.dirname(path)))
+
+
+def test_updated_artwork_is_downloaded_again(server, tmp_path):
+    """Test that a new updated_at invalidates the cached image, and that contents are shared."""
+    cache = ArtworkCache(str(tmp_path))
+
+    with ArtworkDownloader(cache) as downloader:
+        path = downloader.download(_artwork(server, 1))
+        assert cache.get_path(_artwork(server, 1, updated_at=2)) is None
+        assert downloader.download(_artwork(server, 1, updated_at=2)) == path
+        assert downloader.download(_artwork(server, 2, path="/copy.jpg")) == path
+
+    assert len(server.requests) == 3
+    assert len(os.listdir(os.path.dirname(path))) == 1
+    assert cache.prune() == 0
+
+
+def test_interrupted_download_resumes(server, tmp_path):
+    """Test that a cut off download keeps its data and resumes with a range request."""
+    cache = ArtworkCache(str(tmp_path))
+    artwork = _artwork(server, 1)
+    server.truncate_next = True
+
+    with ArtworkDownloader(cache) as downloader:
+        with pytest.raises(DownloadException):
+            downloader.download(artwork)
+
+        assert os.path.getsize(cache.partial_path(artwork)) == len(IMAGE) // 2
+
+        path = downloader.download(artwork)
+
+    assert server.requests[-1] == ("/poster.jpg", f"bytes={len(IMAGE) // 2}-")
+    assert cache.get(artwork) == IMAGE
+    assert not os.path.exists(cache.partial_path(artwork))
+    assert os.path.exists(path)
+
+
+def test_server_ignoring_ranges(server, tmp_path):
+    """Test that a full response to a range request replaces the partial file."""
+    cache = ArtworkCache(str(tmp_path))
+    artwork = _artwork(server, 1)
+    server.ignore_ranges = True
+
+    with open(cache.partial_path(artwork), "wb") as partial_file:
+        partial_file.write(b"stale")
+
+    with ArtworkDownloader(cache) as downloader:
+        downloader.download(artwork)
+
+    assert server.requests == [("/poster.jpg", "bytes=5-")]
+    assert cache.get(artwork) == IMAGE
+
+
+def test_download_many(server, tmp_path):
+    """Test downloading concurrently, with failures reported per artwork."""
+    cache = ArtworkCache(str(tmp_path))
+    artworks = [_artwork(server, index) for index in range(10)]
+    missing = _artwork(server, 99, path="/missing.jpg")
+
+    with ArtworkDownloader(cache, max_workers=4) as downloader:
+        results = list(downloader.download_many([*artworks, missing, artworks[0]]))
+
+    errors = [result for result in results if not result.ok]
+
+    assert len(results) == 11
+    assert [result.identifier for result in errors] == [missing]
+    assert isinstance(errors[0].error, NotFoundException)
+    assert all(cache.get(artwork) == IMAGE for artwork in artworks)
+
+    with pytest.raises(ValueError):
+        ArtworkDownloader(cache, max_workers=0)
+
+
+def test_prune(server, tmp_path):
+    """Test that pruning removes files no artwork refers to."""
+    cache = ArtworkCache(str(tmp_path))
+
+    with ArtworkDownloader(cache) as downloader:
+        downloader.download(_artwork(server, 1))
+        server.files["/poster.jpg"] = b"new poster"
+        downloader.download(_artwork(server, 1, updated_at=2))
+
+    assert cache.prune() == 1
+    assert cache.get(_artwork(server, 1, updated_at=2)) == b"new poster"
+
+
+def test_prune_removes_abandoned_partial_downloads(tmp_path):
+    """Test that old partial downloads are pruned and recent ones are kept."""
+    cache = ArtworkCache(str(tmp_path))
+    old = os.path.join(cache.path, "partial", "old.part")
+    recent = os.path.join(cache.path, "partial", "recent.part")
+
+    for path in (old, recent):
+        with open(path, "wb") as partial_file:
+            partial_file.write(b"partial")
+
+    os.utime(old, (time.time() - 2 * 24 * 60 * 60,) * 2)
+
+    assert cache.prune() == 1
+    assert os.listdir(os.path.join(cache.path, "partial")) == ["recent.part"]
+    assert cache.prune(partial_max_age=0) == 1
+
+
+def test_download_waits_for_other_process(server, tmp_path):
+    """Test that a download locked by another process is used rather than repeated."""
+    fcntl = pytest.importorskip("fcntl")
+    cache = ArtworkCache(str(tmp_path))
+    artwork = _artwork(server, 1)
+    partial_path = cache.partial_path(artwork)
+    result = []
+
+    with ArtworkDownloader(cache) as downloader:
+        # Stand in for another process by holding the lock on a separate file description
+        with open(partial_path, "wb") as partial_file:
+            fcntl.flock(partial_file.fileno(), fcntl.LOCK_EX)
+            thread = threading.Thread(target=lambda: result.append(downloader.download(artwork)))
+            thread.start()
+            thread.join(0.2)
+            assert thread.is_alive()
+
+            partial_file.write(IMAGE)
+            partial_file.flush()
+            cache.add_file(artwork, partial_path)
+
+        thread.join()
+
+    assert not server.requests
+    assert result == [cache.get_path(artwork)]
+    assert not os.path.exists(partial_path)
@@ -0,0 +1,47 @@
+"""Tests that keep the benchmark fixtures and suite working."""
+
+import deserialize
+
+from benchmarks import suite
+from libtvdb.model import Episode, Show
+
+
+def test_fixtures_deserialize():
+    """Test that the fixtures still match the models."""
+    show = deserialize.deserialize(
+        Show, suite.load_fixture("series_extended.json")["data"], throw_on_unhandled=True
+    )
+    assert show.characters
+
+    for page in suite.episode_pages():
+        for episode_data in page["data"]["episodes"]:
+            deserialize.deserialize(Episode, episode_data, throw_on_unhandled=True)
+
+    for show_data in suite.load_fixture("search_results.json")["data"]:
+        deserialize.deserialize(Show, show_data, throw_on_unhandled=True)
+
+
+def test_get_paged_benchmark_reads_every_page():
+    """Test that the pagination benchmark combines all of the fixture pages."""
+    pages = suite.episode_pages()
+    expected = sum(len(page["data"]["episodes"]) for page in pages)
+
+    assert len(suite.get_paged_benchmark(pages)()) == expected
+
+
+def test_compare_reports_regressions():
+    """Test that only results beyond the tolerance are reported."""
+    baseline = {
+        "fast": {"seconds": 1.0, "peak_bytes": 100},
+        "slow": {"seconds": 1.0, "peak_bytes": 100},
+    }
+    results = {
+        "fast": {"seconds": 1.1, "peak_bytes": 100},
+        "slow": {"seconds": 2.0, "peak_bytes": 300},
+        "new": {"seconds": 5.0, "peak_bytes": 100},
+    }
+
+    regressions = suite.compare(results, baseline, tolerance=0.25)
+
+    assert len(regressions) == 2
+    assert all(regression.startswith("slow:") for regression in regressions)
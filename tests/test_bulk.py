@@ -0,0 +1,98 @@
+"""Tests for bulk lookups."""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from libtvdb import TVDBClient
+from libtvdb.bulk import BulkResult, bounded_map, unique
+from libtvdb.exceptions import NotFoundException
+
+
+def test_unique_preserves_order():
+    """Test that unique drops repeats but keeps first-seen order."""
+    assert list(unique([3, 1, 3, 2, 1])) == [3, 1, 2]
+
+
+def test_bounded_map_captures_errors():
+    """Test that a failing item doesn't stop the other items."""
+
+    def function(value):
+        if value == 2:
+            raise KeyError(value)
+        return value * 10
+
+    results = {
+        result.identifier: result for result in bounded_map(function, [1, 2, 3], max_workers=2)
+    }
+
+    assert results[1].value == 10
+    assert results[3].value == 30
+    assert not results[2].ok
+    assert isinstance(results[2].error, KeyError)
+
+
+def test_bounded_map_limits_concurrency():
+    """Test that no more than max_workers calls run at once."""
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def function(value):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.01)
+        with lock:
+            active -= 1
+        return value
+
+    results = list(bounded_map(function, range(20), max_workers=3))
+
+    assert len(results) == 20
+    assert peak <= 3
+
+
+def test_bounded_map_invalid_workers():
+    """Test that max_workers must be positive."""
+    with pytest.raises(ValueError, match="max_workers"):
+        list(bounded_map(lambda x: x, [1], max_workers=0))
+
+
+def test_bulk_result_repr():
+    """Test BulkResult string representations."""
+    assert "ok" in str(BulkResult(1, value="episode"))
+    assert "failed" in str(BulkResult(1, error=ValueError("bad")))
+    assert "ValueError" in repr(BulkResult(1, error=ValueError("bad")))
+
+
+def test_episodes_by_id_many_deduplicates():
+    """Test that repeated episode IDs are only fetched once."""
+    client = TVDBClient(api_key="test_key", pin="test_pin")
+    client.auth_token = "test_token"
+
+    def fake_episode_by_id(identifier, timeout=None):
+        _ = timeout
+        if identifier == 404:
+            raise NotFoundException("missing")
+        return f"episode-{identifier}"
+
+    with patch.object(client, "episode_by_id", side_effect=fake_episode_by_id) as mock_lookup:
+        results = list(client.episodes_by_id_many([1, 2, 1, 404, 2], max_workers=2))
+
+    assert mock_lookup.call_count == 3
+    values = {result.identifier: result for result in results}
+    assert values[1].value == "episode-1"
+    assert values[2].value == "episode-2"
+    assert isinstance(values[404].error, NotFoundException)
+
+
+def test_episodes_by_id_many_invalid_workers():
+    """Test that an invalid worker count is rejected immediately."""
+    client = TVDBClient(api_key="test_key", pin="test_pin")
+
+    with pytest.raises(ValueError, match="max_workers"):
+        client.episodes_by_id_many([1], max_workers=0)
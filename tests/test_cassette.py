@@ -0,0 +1,88 @@
+"""Tests for recording and replaying requests."""
+
+import gzip
+import json
+import time
+
+import pytest
+
+from benchmarks.mock_server import MockTVDBServer
+from libtvdb import TVDBClient
+from libtvdb.cassette import Cassette, CassetteTransport
+from libtvdb.exceptions import CassetteMissException, NotFoundException
+from libtvdb.transport import TransportResponse
+
+
+def _record(path):
+    with MockTVDBServer(missing_ids={404}) as server:
+        with CassetteTransport.recording(path) as transport:
+            client = TVDBClient(api_key="secret", base_url=server.base_url, transport=transport)
+            show = client.show_info(1234)
+            episodes = client.episodes_from_show_id(1234)
+
+            with pytest.raises(NotFoundException):
+                client.episode_by_id(404)
+
+        return server.base_url, show, episodes
+
+
+def test_record_then_replay_offline(tmp_path):
+    """Test that a recorded session can be replayed once the server is gone."""
+    path = tmp_path / "session.json.gz"
+    base_url, show, episodes = _record(path)
+
+    client = TVDBClient(api_key="other", base_url=base_url, transport=CassetteTransport(path))
+
+    assert client.show_info(1234) == show
+    assert client.episodes_from_show_id(1234) == episodes
+
+    with pytest.raises(NotFoundException):
+        client.episode_by_id(404)
+
+    with pytest.raises(CassetteMissException):
+        client.episode_by_id(1)
+
+
+def test_cassette_contains_no_credentials(tmp_path):
+    """Test that the API key and token are not written to the cassette."""
+    path = tmp_path / "session.json.gz"
+    _record(path)
+
+    with gzip.open(path, "rt", encoding="utf-8") as cassette_file:
+        contents = cassette_file.read()
+
+    assert "secret" not in contents
+    assert "mock-token" not in contents
+    assert json.loads(contents)["version"] == Cassette.VERSION
+
+
+def test_replay_order_and_latency(tmp_path):
+    """Test that repeated requests replay in order and with the requested delay."""
+    cassette = Cassette(tmp_path / "manual.json.gz")
+    url = "https://example.com/v4/episodes/1"
+    cassette.record("GET", url, TransportResponse(500, b"{}"), elapsed=0.0)
+    cassette.record("GET", url, TransportResponse(200, b'{"data": 1}'), elapsed=0.05)
+    cassette.save()
+
+    transport = CassetteTransport(cassette.path, replay_recorded_latency=True)
+    statuses = []
+    started = time.perf_counter()
+
+    for _ in range(3):
+        statuses.append(transport.send("GET", url, headers={}, timeout=1).status_code)
+
+    assert statuses == [500, 200, 200]
+    assert time.perf_counter() - started >= 0.1
+
+
+def test_binary_bodies_round_trip(tmp_path):
+    """Test that bodies that aren't UTF-8 survive a save and load."""
+    cassette = Cassette(tmp_path / "binary.json.gz")
+    cassette.record(
+        "GET", "https://example.com/image", TransportResponse(200, b"\xff\xd8"), elapsed=0
+    )
+    cassette.save()
+
+    interaction = Cassette(cassette.path).interactions[0]
+
+    assert Cassette.response_for(interaction).content == b"\xff\xd8"
@@ -6,8 +6,9 @@ from unittest.mock import Mock, patch
 import pytest
 import requests
 
-from libtvdb import TVDBClient
+from libtvdb import ShowDetail, TVDBClient
 from libtvdb.exceptions import NotFoundException, TVDBAuthenticationException, TVDBException
+from libtvdb.mirror import Mirror
 from libtvdb.model import Show
 from libtvdb.utilities import Log
 
@@ -276,3 +277,70 @@ def test_get_paged_no_links(mock_get):
     result = client.get_paged("/test", timeout=10)
     assert len(result) == 1
     assert result[0]["id"] == 1
+
+
+def test_show_info_detail_paths():
+    """Test that each detail level requests the matching endpoint."""
+    client = TVDBClient(api_key="test_key", pin="test_pin")
+    client.auth_token = "test_token"
+    show_data = {"id": 1, "name": "Test", "slug": "test", "status": "Ended"}
+
+    expected_paths = {
+        ShowDetail.BASE: "series/1",
+        ShowDetail.EXTENDED_SHORT: "series/1/extended?short=true",
+        ShowDetail.EXTENDED: "series/1/extended",
+        ShowDetail.WITH_EPISODES: "series/1/extended?meta=episodes&short=true",
+    }
+
+    for detail, path in expected_paths.items():
+        with patch.object(client, "get", return_value=show_data) as mock_get:
+            show = client.show_info(1, detail=detail)
+
+        assert mock_get.call_args.args[0] == path
+        assert show.name == "Test"
+
+
+def test_show_info_partial_detail_skips_mirror():
+    """Test that partial records are never written to or read from the mirror."""
+    mirror = Mirror()
+    client = TVDBClient(api_key="test_key", pin="test_pin", mirror=mirror)
+    client.auth_token = "test_token"
+    show_data = {"id": 1, "name": "Test", "slug": "test", "status": "Ended"}
+
+    with patch.object(client, "get", return_value=show_data):
+        client.show_info(1, detail=ShowDetail.BASE)
+
+    assert mirror.show(1) is None
+
+
+def test_log_formats_lazily():
+    """Test that arguments are passed through for deferred formatting."""
+    with patch("libtvdb.utilities.logger") as mock_logger:
+        Log.info("GET: %s", "series/1")
+
+        mock_logger.info.assert_called_once_with("GET: %s", "series/1")
+
+
+def test_log_respects_level():
+    """Test that nothing is logged when the level is disabled."""
+    with patch("libtvdb.utilities.logger") as mock_logger:
+        mock_logger.isEnabledFor.return_value = False
+        Log.debug("debug %s", "message")
+
+        mock_logger.debug.assert_not_called()
+
+
+def test_log_disable():
+    """Test that library logging can be switched off entirely."""
+    with patch("libtvdb.utilities.logger") as mock_logger:
+        Log.disable()
+        try:
+            Log.error("error message")
+        finally:
+            Log.enable()
+
+        mock_logger.isEnabledFor.assert_not_called()
+        mock_logger.error.assert_not_called()
+
+        Log.error("error message")
+        mock_logger.error.assert_called_once_with("error message")
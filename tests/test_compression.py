@@ -0,0 +1,112 @@
+"""Tests for compressed response negotiation and size reporting."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from benchmarks.mock_server import MockTVDBServer
+from libtvdb import MetricsRegistry, TVDBClient
+from libtvdb.cassette import Cassette, CassetteTransport
+from libtvdb.compression import accept_encoding_header, available_encodings, encoded_size
+from libtvdb.transport import FakeTransport, TransportResponse, Urllib3Transport
+
+
+def test_available_encodings():
+    """Test that the built in decoders are always available, after any optional ones."""
+    encodings = available_encodings()
+
+    assert encodings[-2:] == ("gzip", "deflate")
+    assert set(encodings) <= {"zstd", "br", "gzip", "deflate"}
+
+
+def test_accept_encoding_header():
+    """Test building the Accept-Encoding header."""
+    assert accept_encoding_header() == ", ".join(available_encodings())
+    assert accept_encoding_header(["GZIP"]) == "gzip"
+    assert accept_encoding_header(["deflate", "gzip"]) == "deflate, gzip"
+    assert accept_encoding_header([]) == "identity"
+
+    with pytest.raises(ValueError):
+        accept_encoding_header(["lzma"])
+
+
+def test_encoded_size():
+    """Test reading the wire size from each kind of response."""
+    assert encoded_size(TransportResponse(200, b"12345")) == 5
+    assert encoded_size(TransportResponse(200, b"12345", wire_bytes=2)) == 2
+
+    requests_response = Mock(spec=["raw"])
+    requests_response.raw.tell.return_value = 3
+    assert encoded_size(requests_response) == 3
+
+    requests_response.raw.tell.side_effect = ValueError
+    assert encoded_size(requests_response) is None
+
+    assert encoded_size(Mock(spec=["content"])) is None
+
+
+def test_client_sends_accept_encoding():
+    """Test that the client asks for the configured encodings."""
+    transport = FakeTransport()
+    client = TVDBClient(api_key="key", transport=transport, accept_encoding=["gzip"])
+    client.authenticate()
+
+    assert transport.requests[0][2]["Accept-Encoding"] == "gzip"
+
+    with pytest.raises(ValueError):
+        TVDBClient(api_key="key", accept_encoding=["lzma"])
+
+
+@pytest.mark.parametrize("transport_type", [None, Urllib3Transport])
+def test_compressed_sizes_are_recorded(transport_type):
+    """Test that compressed and decoded sizes are both reported."""
+    with MockTVDBServer() as server:
+        metrics = MetricsRegistry()
+        client = TVDBClient(
+            api_key="key",
+            base_url=server.base_url,
+            metrics=metrics,
+            transport=transport_type() if transport_type else None,
+        )
+        records = []
+        client.add_request_hook(records.append)
+
+        client.show_info(1234)
+
+    record = records[-1]
+    assert record.content_encoding == "gzip"
+    assert record.wire_bytes_received < record.bytes_received
+    assert record.compression_ratio > 1
+    assert record.as_dict()["wire_bytes_received"] == record.wire_bytes_received
+
+    endpoint = "series/{id}/extended"
+    assert metrics.compression_ratio(endpoint) == pytest.approx(record.compression_ratio)
+    assert metrics.snapshot()["wire_bytes_received"][endpoint] == record.wire_bytes_received
+    assert "libtvdb_response_wire_bytes_total" in metrics.prometheus_text()
+
+
+def test_identity_is_not_compressed():
+    """Test that asking for no encodings gets an uncompressed response."""
+    with MockTVDBServer() as server:
+        client = TVDBClient(api_key="key", base_url=server.base_url, accept_encoding=())
+        records = []
+        client.add_request_hook(records.append)
+
+        client.show_info(1234)
+
+    assert records[-1].content_encoding is None
+    assert records[-1].wire_bytes_received == records[-1].bytes_received
+
+
+def test_cassette_keeps_wire_size(tmp_path):
+    """Test that recorded wire sizes are replayed."""
+    path = tmp_path / "session.json.gz"
+
+    with MockTVDBServer() as server, CassetteTransport.recording(path) as transport:
+        TVDBClient(api_key="key", base_url=server.base_url, transport=transport).show_info(1)
+
+    interaction = Cassette(path).interactions[-1]
+    response = Cassette.response_for(interaction)
+
+    assert "content-encoding" not in interaction["headers"]
+    assert response.wire_bytes == interaction["wire_bytes"] < len(response.content)
@@ -0,0 +1,118 @@
+"""Tests for payload fingerprints and structural diffs."""
+
+import copy
+import json
+
+import pytest
+
+from benchmarks.generate_fixtures import FIXTURES
+from libtvdb import TVDBClient
+from libtvdb.diff import diff_episodes, diff_fields, diff_shows, fingerprint
+from libtvdb.transport import FakeTransport
+
+
+def _fixture(name):
+    with open(FIXTURES / name, encoding="utf-8") as fixture_file:
+        return json.load(fixture_file)["data"]
+
+
+def _client(shows=(), episodes=()):
+    """Get a client that answers with each payload in turn for its show or episode."""
+    transport = FakeTransport()
+
+    for show_data in shows:
+        transport.add("GET", f"series/{show_data['id']}/extended", json_body={"data": show_data})
+
+    for episode_data in episodes:
+        transport.add(
+            "GET", f"episodes/{episode_data['id']}/extended", json_body={"data": episode_data}
+        )
+
+    client = TVDBClient(api_key="key", transport=transport)
+    client.auth_token = "token"
+    return client
+
+
+def test_fingerprint_is_stable():
+    """Test that fingerprints ignore key order and change with any value."""
+    data = {"id": 1, "name": "Show", "aliases": [{"language": "eng", "name": "Alias"}]}
+    reordered = {"aliases": [{"name": "Alias", "language": "eng"}], "name": "Show", "id": 1}
+    changed = copy.deepcopy(data)
+    changed["aliases"][0]["name"] = "Other"
+
+    assert fingerprint(data) == fingerprint(reordered)
+    assert fingerprint(data) != fingerprint(changed)
+    assert len(fingerprint(data)) == 32
+
+
+def test_client_sets_fingerprints():
+    """Test that deserialized shows and their episodes carry the fingerprint of their data."""
+    show_data = _fixture("series_extended.json")
+    show_data["episodes"] = _fixture("episodes_page_0.json")["episodes"][:3]
+    client = _client(shows=[show_data], episodes=show_data["episodes"][:1])
+
+    show = client.show_info(show_data["id"])
+    episode = client.episode_by_id(show_data["episodes"][0]["id"])
+
+    assert show.fingerprint == fingerprint(show_data)
+    assert show.episodes[0].fingerprint == fingerprint(show_data["episodes"][0])
+    assert episode.fingerprint == show.episodes[0].fingerprint
+
+
+def test_diff_shows():
+    """Test reporting changed fields on a show."""
+    old_data = _fixture("series_extended.json")
+    new_data = copy.deepcopy(old_data)
+    new_data["name"] = "Renamed"
+    new_data["aliases"] = new_data["aliases"][1:]
+    client = _client(shows=[old_data, new_data, old_data])
+
+    old = client.show_info(old_data["id"])
+    new = client.show_info(old_data["id"])
+    result = diff_shows(old, new)
+
+    assert result.has_changes
+    assert [change.name for change in result.fields] == ["aliases", "name"]
+    assert result.fields[1].old == old_data["name"]
+    assert result.fields[1].new == "Renamed"
+    assert result.episodes is None
+
+    assert not diff_shows(old, client.show_info(old_data["id"])).has_changes
+    assert diff_shows(old, new, ignore=("name", "aliases")).fields == []
+
+
+def test_diff_episodes():
+    """Test finding added, removed and changed episodes."""
+    old_data = _fixture("episodes_page_0.json")["episodes"][:5]
+    new_data = copy.deepcopy(old_data[1:])
+    new_data[0]["name"] = "New name"
+    new_data.append(_fixture("episodes_page_0.json")["episodes"][5])
+    client = _client(episodes=[*old_data, *new_data])
+
+    old = [client.episode_by_id(episode["id"]) for episode in old_data]
+    new = [client.episode_by_id(episode["id"]) for episode in new_data]
+    result = diff_episodes(old, new)
+
+    assert [episode.identifier for episode in result.added] == [new_data[-1]["id"]]
+    assert [episode.identifier for episode in result.removed] == [old_data[0]["id"]]
+    assert [change.identifier for change in result.changed] == [new_data[0]["id"]]
+    assert [field.name for field in result.changed[0].fields] == ["name"]
+    assert not diff_episodes(old, old).has_changes
+
+
+def test_diff_without_fingerprints():
+    """Test that records built elsewhere are compared field by field."""
+    episode_data = _fixture("episodes_page_0.json")["episodes"][0]
+    show_data = _fixture("series_extended.json")
+    client = _client(shows=[show_data], episodes=[episode_data])
+    old = client.episode_by_id(episode_data["id"])
+    new = copy.deepcopy(old)
+    old.fingerprint = None
+    new.fingerprint = None
+    new.runtime = (old.runtime or 0) + 1
+
+    assert [change.name for change in diff_fields(old, new)] == ["runtime"]
+    assert [change.identifier for change in diff_episodes([old], [new]).changed] == [old.identifier]
+
+    with pytest.raises(TypeError):
+        diff_fields(old, client.show_info(show_data["id"]))
@@ -0,0 +1,98 @@
+"""Tests for the indexed episode collection."""
+
+import datetime
+
+import pytest
+
+from libtvdb.model import Episode, EpisodeCollection
+
+
+def _episode(identifier, season_number, number, aired=None, absolute_number=None, **kwargs):
+    episode = Episode()
+    episode.identifier = identifier
+    episode.season_number = season_number
+    episode.number = number
+    episode.aired = aired
+    episode.absolute_number = absolute_number
+    episode.airs_before_season = kwargs.get("airs_before_season")
+    episode.airs_before_episode = kwargs.get("airs_before_episode")
+    episode.airs_after_season = kwargs.get("airs_after_season")
+    return episode
+
+
+def _collection():
+    return EpisodeCollection(
+        [
+            _episode(3, 2, 1, datetime.date(2021, 1, 1), absolute_number=3),
+            _episode(1, 1, 1, datetime.date(2020, 1, 1), absolute_number=1),
+            _episode(2, 1, 2, datetime.date(2020, 1, 8), absolute_number=2),
+            _episode(4, 0, 1, None, airs_before_season=2, airs_before_episode=1),
+            _episode(5, 0, 2, datetime.date(2021, 6, 1), airs_after_season=2),
+        ]
+    )
+
+
+def test_collection_is_a_list():
+    """Test that the collection can be used anywhere a list is expected."""
+    episodes = _collection()
+
+    assert isinstance(episodes, list)
+    assert len(episodes) == 5
+    assert episodes[0].identifier == 3
+
+
+def test_number_lookups():
+    """Test lookups by season/episode number, absolute number and ID."""
+    episodes = _collection()
+
+    assert episodes.by_number(1, 2).identifier == 2
+    assert episodes.by_number(9, 9) is None
+    assert episodes.by_absolute_number(3).identifier == 3
+    assert episodes.by_identifier(4).season_number == 0
+
+
+def test_air_date_lookups():
+    """Test the sorted air date view and range queries."""
+    episodes = _collection()
+
+    assert [e.identifier for e in episodes.by_air_date] == [1, 2, 3, 5]
+    aired = episodes.aired_between(datetime.date(2020, 1, 1), datetime.date(2020, 12, 31))
+    assert [e.identifier for e in aired] == [1, 2]
+
+
+def test_placement_lookups():
+    """Test the specials placement lookups."""
+    episodes = _collection()
+
+    assert [e.identifier for e in episodes.airing_before(2, 1)] == [4]
+    assert [e.identifier for e in episodes.airing_after_season(2)] == [5]
+    assert not episodes.airing_before(3)
+
+
+def test_navigation():
+    """Test next and previous episode navigation."""
+    episodes = _collection()
+
+    assert episodes.next_episode(episodes.by_identifier(2)).identifier == 3
+    assert episodes.previous_episode(episodes.by_identifier(1)).identifier == 5
+    assert episodes.previous_episode(episodes.by_identifier(4)) is None
+    assert episodes.next_episode(episodes.by_identifier(3)) is None
+
+    with pytest.raises(ValueError, match="not in this collection"):
+        episodes.next_episode(_episode(99, 9, 9))
+
+
+def test_mutation_rebuilds_indexes():
+    """Test that changing the list invalidates the cached indexes."""
+    episodes = _collection()
+    assert episodes.by_number(3, 1) is None
+
+    episodes.append(_episode(6, 3, 1, datetime.date(2022, 1, 1)))
+    assert episodes.by_number(3, 1).identifier == 6
+
+    del episodes[-1]
+    assert episodes.by_number(3, 1) is None
+
+    episodes += [_episode(7, 3, 1)]
+    assert episodes.by_number(3, 1).identifier == 7
+    assert isinstance(episodes, EpisodeCollection)
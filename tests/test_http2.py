@@ -0,0 +1,83 @@
+"""Tests for the optional httpx transport."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from benchmarks.mock_server import MockTVDBServer
+from libtvdb import TVDBClient, http2
+from libtvdb.exceptions import NotFoundException
+from libtvdb.transport import Urllib3Transport
+
+
+def test_falls_back_to_urllib3_without_httpx(monkeypatch):
+    """Test that the multiplexed transport falls back when httpx isn't installed."""
+    monkeypatch.setattr(http2, "httpx", None)
+
+    assert not http2.is_available()
+    assert isinstance(http2.multiplexed_transport(), Urllib3Transport)
+
+    with pytest.raises(ImportError):
+        http2.HttpxTransport()
+
+
+@pytest.mark.parametrize(
+    "accept_encoding,sent",
+    [("zstd, gzip", "gzip"), ("zstd", "identity"), ("gzip, deflate", "gzip, deflate")],
+)
+def test_accept_encoding_without_zstandard(monkeypatch, accept_encoding, sent):
+    """Test that zstd is only offered to httpx when it can decode it."""
+    monkeypatch.setattr(http2.importlib.util, "find_spec", lambda name: None)
+    # Only the supplied client is used, so httpx itself doesn't need to be installed
+    monkeypatch.setattr(http2, "httpx", Mock())
+    client = Mock()
+    client.request.return_value = Mock(
+        status_code=200, content=b"{}", headers={}, http_version="HTTP/2", num_bytes_downloaded=2
+    )
+    transport = http2.HttpxTransport(client)
+
+    response = transport.send(
+        "GET", "https://x/v4/series/1", headers={"Accept-Encoding": accept_encoding}, timeout=1
+    )
+
+    assert client.request.call_args.kwargs["headers"] == {"Accept-Encoding": sent}
+    assert response.status_code == 200
+    assert transport.http_versions == {"HTTP/2": 1}
+
+
+def test_httpx_transport_against_mock_server():
+    """Test a client using the httpx transport from end to end."""
+    httpx = pytest.importorskip("httpx")
+
+    with MockTVDBServer(missing_ids={404}) as server:
+        transport = http2.HttpxTransport()
+        client = TVDBClient(api_key="key", base_url=server.base_url, transport=transport)
+        records = []
+        client.add_request_hook(records.append)
+
+        episodes = list(client.episodes_by_id_many(range(1, 21), max_workers=8))
+        show = client.show_info(1234)
+
+        with pytest.raises(NotFoundException):
+            client.episode_by_id(404)
+
+        transport.close()
+
+    assert all(result.ok for result in episodes)
+    assert show.identifier == "1234"
+    # The mock server is plain HTTP/1.1, so the transport has to fall back
+    assert set(transport.http_versions) == {"HTTP/1.1"}
+    assert sum(transport.http_versions.values()) == len(records)
+    assert records[-2].wire_bytes_received < records[-2].bytes_received
+    assert httpx.TimeoutException in transport.timeout_exceptions
+
+
+def test_http2_disabled_without_h2(monkeypatch):
+    """Test that HTTP/1.1 is used when the h2 package is missing."""
+    pytest.importorskip("httpx")
+    monkeypatch.setattr(http2, "_h2_installed", lambda: False)
+
+    transport = http2.HttpxTransport()
+
+    assert not transport.http2
+    transport.close()
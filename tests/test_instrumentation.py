@@ -0,0 +1,141 @@
+"""Tests for per-request timing hooks."""
+
+from unittest.mock import patch
+
+import pytest
+
+from libtvdb import TVDBClient
+from libtvdb.bulk import BulkResult
+from libtvdb.exceptions import NotFoundException
+from libtvdb.instrumentation import RequestRecord, RequestRecorder, endpoint_template
+from tests.context import EPISODES_URL, api_response, episode_data, episode_page, page_number
+
+
+def _client():
+    client = TVDBClient(api_key="test_key", pin="test_pin")
+    client.auth_token = "test_token"
+    return client
+
+
+@pytest.mark.parametrize(
+    "url,expected",
+    [
+        ("https://api4.thetvdb.com/v4/series/121361/extended?short=true", "series/{id}/extended"),
+        ("https://api4.thetvdb.com/v4/episodes/5", "episodes/{id}"),
+        ("https://api4.thetvdb.com/v4/search/remoteid/tt0436992", "search/remoteid/{id}"),
+        ("https://api4.thetvdb.com/v4/search?type=series&query=Doctor", "search"),
+    ],
+)
+def test_endpoint_template(url, expected):
+    """Test that record IDs and query strings are removed from endpoints."""
+    assert endpoint_template(url) == expected
+
+
+def test_recorder_adds_model_build_to_source_record():
+    """Test that model building is attributed to the record marked as its source."""
+    records = []
+    recorder = RequestRecorder([records.append])
+    first = RequestRecord("GET", "https://api4.thetvdb.com/v4/series/1")
+    second = RequestRecord("GET", "https://api4.thetvdb.com/v4/series/2")
+    recorder.add(first)
+    recorder.add(second)
+    recorder.set_source(first.url)
+
+    with recorder.model_build():
+        pass
+
+    recorder.emit()
+
+    assert records == [first, second]
+    assert first.model_build is not None
+    assert second.model_build is None
+
+
+@patch("requests.get")
+def test_hook_receives_record_for_episode_by_id(mock_get):
+    """Test that a single request produces one complete record."""
+    mock_get.return_value = api_response(episode_data(5))
+    records = []
+    client = _client()
+    client.add_request_hook(records.append)
+
+    client.episode_by_id(5)
+
+    assert len(records) == 1
+    record = records[0]
+    assert record.method == "GET"
+    assert record.endpoint == "episodes/{id}/extended"
+    assert record.status == 200
+    assert record.bytes_received == 42
+    assert record.error is None
+    assert record.model_build is not None
+    assert record.total >= record.network
+
+
+@patch("requests.get")
+def test_hook_receives_record_per_page(mock_get):
+    """Test that every page of a paginated request is recorded."""
+    mock_get.side_effect = [
+        api_response({"episodes": [episode_data(1)]}, {"next": f"{EPISODES_URL}?page=1"}),
+        api_response({"episodes": [episode_data(2)]}, {"next": None}),
+    ]
+    records = []
+    client = _client()
+    client.add_request_hook(records.append)
+
+    client.episodes_from_show_id(1)
+
+    assert [record.url for record in records] == [EPISODES_URL, f"{EPISODES_URL}?page=1"]
+    assert records[0].model_build is None
+    assert records[1].model_build is not None
+
+
+def _map_in_reverse(function, items, **_):
+    """Run concurrent work in reverse, as a thread pool might schedule it."""
+    return [BulkResult(item, value=function(item)) for item in reversed(list(items))]
+
+
+@patch("libtvdb.client.bounded_map", side_effect=_map_in_reverse)
+@patch("requests.get", side_effect=lambda url, **_: episode_page(page_number(url), 3))
+def test_model_build_on_final_concurrent_page(_mock_get, _mock_map):
+    """Test that the final page gets the model build even when it isn't the last one sent."""
+    records = []
+    client = _client()
+    client.add_request_hook(records.append)
+
+    client.episodes_from_show_id(1, max_workers=3)
+
+    built = [record.url for record in records if record.model_build is not None]
+    assert records[-1].url == f"{EPISODES_URL}?page=1"
+    assert built == [f"{EPISODES_URL}?page=2"]
+
+
+@patch("requests.get")
+def test_hook_receives_failed_requests(mock_get):
+    """Test that failed requests are reported along with their error."""
+    mock_get.return_value = api_response(None, status_code=404)
+    mock_get.return_value.json.return_value = {"Error": "Resource not found"}
+    records = []
+    client = _client()
+    client.add_request_hook(records.append)
+
+    with pytest.raises(NotFoundException):
+        client.episode_by_id(5)
+
+    assert len(records) == 1
+    assert records[0].status == 404
+    assert isinstance(records[0].error, NotFoundException)
+
+
+@patch("requests.get")
+def test_removed_hook_is_not_called(mock_get):
+    """Test that hooks can be removed and that nothing is recorded without them."""
+    mock_get.return_value = api_response(episode_data(5))
+    records = []
+    client = _client()
+    client.add_request_hook(records.append)
+    client.remove_request_hook(records.append)
+
+    client.episode_by_id(5)
+
+    assert not records
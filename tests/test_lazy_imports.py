@@ -0,0 +1,64 @@
+"""Tests for the lazily loaded package attributes."""
+
+import subprocess
+import sys
+
+import pytest
+
+import libtvdb
+import libtvdb.model
+from libtvdb.exceptions import NotFoundException
+
+
+def _modules_after(statement: str) -> set[str]:
+    script = f"import sys\n{statement}\nprint('\\n'.join(sys.modules))"
+    output = subprocess.run(
+        [sys.executable, "-c", script], check=True, capture_output=True, text=True
+    ).stdout
+    return set(output.split())
+
+
+def test_import_does_not_load_http_stack():
+    """Test that importing the package doesn't import requests or urllib3."""
+    modules = _modules_after("import libtvdb")
+
+    assert "requests" not in modules
+    assert "urllib3" not in modules
+    assert "libtvdb.client" not in modules
+
+
+def test_client_does_not_load_http_stack_until_used():
+    """Test that creating a client doesn't import requests."""
+    modules = _modules_after("import libtvdb; libtvdb.TVDBClient(api_key='key')")
+
+    assert "libtvdb.client" in modules
+    assert "requests" not in modules
+
+
+def test_public_names_resolve():
+    """Test that every public name can still be imported."""
+    for name in libtvdb.__all__:
+        assert getattr(libtvdb, name).__name__ == name
+
+    for name in libtvdb.model.__all__:
+        assert getattr(libtvdb.model, name).__name__ == name
+
+    assert set(libtvdb.__all__) <= set(dir(libtvdb))
+    assert set(libtvdb.model.__all__) <= set(dir(libtvdb.model))
+
+
+def test_names_from_the_old_client_module():
+    """Test that names importable from the package before the client moved out still are."""
+    assert libtvdb.Show is libtvdb.model.Show
+    assert libtvdb.Episode is libtvdb.model.Episode
+    assert libtvdb.NotFoundException is NotFoundException
+    assert "requests" not in _modules_after("from libtvdb import Show, TVDBException")
+
+
+def test_unknown_name():
+    """Test that unknown names still raise AttributeError."""
+    with pytest.raises(AttributeError):
+        _ = libtvdb.NotAThing  # type: ignore[attr-defined]
+
+    with pytest.raises(AttributeError):
+        _ = libtvdb.model.NotAThing  # type: ignore[attr-defined]
@@ -0,0 +1,106 @@
+"""Tests for the metrics registry."""
+
+from unittest.mock import Mock, patch
+
+from libtvdb import MetricsRegistry, Mirror, TVDBClient
+from libtvdb.instrumentation import RequestRecord
+from libtvdb.metrics import Histogram
+from tests.context import api_response, episode_data
+
+
+def _record(url, status=200, network=0.02, bytes_received=100, retries=0):
+    record = RequestRecord("GET", url)
+    record.status = status
+    record.network = network
+    record.bytes_received = bytes_received
+    record.retries = retries
+    return record
+
+
+def test_histogram_buckets_and_quantile():
+    """Test that values land in the right buckets."""
+    histogram = Histogram((0.1, 1.0))
+
+    for value in (0.05, 0.5, 0.7, 5.0):
+        histogram.observe(value)
+
+    assert histogram.cumulative_counts() == [1, 3]
+    assert histogram.count == 4
+    assert histogram.quantile(0.5) == 1.0
+    assert histogram.quantile(1.0) == float("inf")
+    assert Histogram((1.0,)).quantile(0.5) is None
+
+
+def test_registry_snapshot():
+    """Test that requests are grouped by endpoint and status."""
+    metrics = MetricsRegistry()
+    metrics.observe_request(_record("https://api4.thetvdb.com/v4/episodes/1"))
+    metrics.observe_request(_record("https://api4.thetvdb.com/v4/episodes/2", status=404))
+    metrics.observe_request(_record("https://api4.thetvdb.com/v4/login", retries=2))
+    metrics.observe_cache("mirror", hit=True)
+    metrics.observe_cache("mirror", hit=False)
+    metrics.observe_cache("mirror", hit=True)
+
+    snapshot = metrics.snapshot()
+
+    assert snapshot["requests"]["episodes/{id}"] == {"200": 1, "404": 1}
+    assert snapshot["bytes_received"]["episodes/{id}"] == 200
+    assert snapshot["latency"]["episodes/{id}"]["count"] == 2
+    assert snapshot["retries"]["login"] == 2
+    assert snapshot["authentications"] == {"200": 1}
+    assert snapshot["cache"]["mirror"] == {"hit": 2, "miss": 1, "ratio": 2 / 3}
+    assert metrics.cache_hit_ratio("mirror") == 2 / 3
+    assert metrics.cache_hit_ratio("unused") is None
+
+    metrics.reset()
+
+    assert not metrics.snapshot()["requests"]
+
+
+def test_prometheus_text():
+    """Test the Prometheus text exposition output."""
+    metrics = MetricsRegistry(buckets=(0.01, 0.1))
+    record = _record("https://api4.thetvdb.com/v4/episodes/1", network=0.05)
+    # Only the network time counts towards the latency
+    record.auth_wait = 1.0
+    record.model_build = 1.0
+    metrics.observe_request(record)
+    metrics.observe_cache("remote_ids", hit=False)
+
+    text = metrics.prometheus_text()
+
+    assert "# TYPE libtvdb_request_duration_seconds histogram" in text
+    assert 'libtvdb_request_duration_seconds_bucket{endpoint="episodes/{id}",le="0.01"} 0' in text
+    assert 'libtvdb_request_duration_seconds_bucket{endpoint="episodes/{id}",le="0.1"} 1' in text
+    assert 'libtvdb_request_duration_seconds_bucket{endpoint="episodes/{id}",le="+Inf"} 1' in text
+    assert 'libtvdb_request_duration_seconds_sum{endpoint="episodes/{id}"} 0.05' in text
+    assert 'libtvdb_requests_total{endpoint="episodes/{id}",status="200"} 1' in text
+    assert 'libtvdb_response_bytes_total{endpoint="episodes/{id}"} 100' in text
+    assert 'libtvdb_cache_lookups_total{cache="remote_ids",result="miss"} 1' in text
+    assert text.endswith("\n")
+
+
+@patch("requests.get")
+@patch("requests.post")
+def test_client_records_metrics(mock_post, mock_get):
+    """Test that the client reports logins, requests and mirror lookups."""
+    login = Mock(status_code=200, content=b"{}")
+    login.json.return_value = {"data": {"token": "token"}}
+    mock_post.return_value = login
+    mock_get.return_value = api_response(
+        {"episodes": [episode_data(5, number=1)]}, {"next": None}, size=20
+    )
+    metrics = MetricsRegistry()
+
+    with Mirror() as mirror:
+        client = TVDBClient(api_key="test_key", mirror=mirror, metrics=metrics)
+        client.episodes_from_show_id(1)
+        client.episodes_from_show_id(1)
+
+    snapshot = metrics.snapshot()
+
+    assert snapshot["authentications"] == {"200": 1}
+    assert snapshot["bytes_sent"]["login"] > 0
+    assert snapshot["requests"]["series/{id}/episodes/default"] == {"200": 1}
+    assert snapshot["cache"]["mirror"]["hit"] == 1
+    assert snapshot["cache"]["mirror"]["miss"] == 1
@@ -0,0 +1,173 @@
+"""Tests for the local SQLite mirror."""
+
+import datetime
+import pickle
+import sqlite3
+from unittest.mock import patch
+
+from libtvdb import TVDBClient
+from libtvdb.mirror import Mirror
+from libtvdb.model import Character, Company, Episode, SeasonBase, Show
+
+
+def _show(identifier="100", slug="test-show"):
+    show = Show()
+    show.identifier = identifier
+    show.name = "Test Show"
+    show.slug = slug
+
+    season = SeasonBase()
+    season.identifier = 5
+    season.series_id = int(identifier)
+    season.number = 1
+    show.seasons = [season]
+
+    character = Character()
+    character.identifier = 6
+    character.series_id = int(identifier)
+    show.characters = [character]
+
+    company = Company()
+    company.identifier = 7
+    company.slug = "network"
+    show.companies = [company]
+    return show
+
+
+def _episode(identifier, season_number, number, aired, absolute_number=None):
+    episode = Episode()
+    episode.identifier = identifier
+    episode.series_id = 100
+    episode.season_number = season_number
+    episode.number = number
+    episode.absolute_number = absolute_number
+    episode.aired = aired
+    return episode
+
+
+def test_show_round_trip():
+    """Test that shows and their nested records can be read back."""
+    with Mirror() as mirror:
+        mirror.store_show(_show())
+
+        assert mirror.show(100).slug == "test-show"
+        assert mirror.show("100").name == "Test Show"
+        assert mirror.show_by_slug("test-show").identifier == "100"
+        assert [season.identifier for season in mirror.seasons_for_show(100)] == [5]
+        assert mirror.character(6).identifier == 6
+        assert mirror.company(7).slug == "network"
+        assert mirror.show(101) is None
+
+
+def test_episode_queries():
+    """Test the indexed episode lookups."""
+    episodes = [
+        _episode(1, 1, 2, datetime.date(2020, 1, 8), absolute_number=2),
+        _episode(2, 1, 1, datetime.date(2020, 1, 1), absolute_number=1),
+        _episode(3, 2, 1, datetime.date(2021, 1, 1), absolute_number=3),
+    ]
+
+    with Mirror() as mirror:
+        assert mirror.episodes_for_show(100) is None
+
+        mirror.store_episodes(episodes, series_id=100)
+
+        assert [e.identifier for e in mirror.episodes_for_show(100)] == [2, 1, 3]
+        assert mirror.episode_by_number(100, 2, 1).identifier == 3
+        assert mirror.episode_by_absolute_number(100, 2).identifier == 1
+        assert mirror.episode(2).number == 1
+
+        aired = mirror.episodes_aired_between(
+            datetime.date(2020, 1, 1), datetime.date(2020, 12, 31), series_id=100
+        )
+        assert [e.identifier for e in aired] == [2, 1]
+
+
+def test_stale_records_are_ignored():
+    """Test that records older than max_age are not returned."""
+    with Mirror(max_age=60) as mirror:
+        with patch("libtvdb.mirror.time.time", return_value=1000.0):
+            mirror.store_show(_show())
+
+        with patch("libtvdb.mirror.time.time", return_value=1030.0):
+            assert mirror.show(100) is not None
+
+        with patch("libtvdb.mirror.time.time", return_value=1100.0):
+            assert mirror.show(100) is None
+            assert mirror.show(100, max_age=200) is not None
+
+
+def test_mirror_persists_to_disk(tmp_path):
+    """Test that a file-backed mirror survives reopening."""
+    path = str(tmp_path / "mirror.sqlite")
+
+    with Mirror(path) as mirror:
+        mirror.store_show(_show())
+
+    with Mirror(path) as mirror:
+        assert mirror.show(100).name == "Test Show"
+
+
+def test_unreadable_payloads_are_ignored(tmp_path):
+    """Test that payloads in anything but the model format are treated as missing."""
+    path = str(tmp_path / "mirror.sqlite")
+
+    with Mirror(path) as mirror:
+        mirror.store_show(_show())
+
+    # A pickle that would run code if it were ever unpickled
+    payload = pickle.dumps(pickle.loads)
+    with sqlite3.connect(path) as connection:
+        connection.execute("UPDATE shows SET payload = ?", (payload,))
+
+    with Mirror(path) as mirror:
+        assert mirror.show(100) is None
+        assert mirror.company(7).slug == "network"
+
+
+def test_old_schema_is_emptied(tmp_path):
+    """Test that a database from before the current schema version starts empty."""
+    path = str(tmp_path / "mirror.sqlite")
+
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE shows (id INTEGER PRIMARY KEY, payload BLOB)")
+        connection.execute("INSERT INTO shows VALUES (100, ?)", (pickle.dumps(_show()),))
+
+    with Mirror(path) as mirror:
+        assert mirror.show(100) is None
+        mirror.store_show(_show())
+
+    with Mirror(path) as mirror:
+        assert mirror.show(100).name == "Test Show"
+
+
+def test_client_uses_fresh_mirror():
+    """Test that the client answers from the mirror and fills it on a miss."""
+    mirror = Mirror()
+    client = TVDBClient(api_key="test_key", pin="test_pin", mirror=mirror)
+    client.auth_token = "test_token"
+
+    show_data = {"id": 100, "name": "Test Show", "slug": "test-show", "status": "Continuing"}
+
+    with patch.object(client, "get", return_value=show_data) as mock_get:
+        first = client.show_info(100)
+        second = client.show_info(100)
+
+    assert mock_get.call_count == 1
+    assert first.name == second.name == "Test Show"
+
+    show_data["name"] = "Renamed"
+
+    with patch.object(client, "get", return_value=show_data) as mock_get:
+        assert client.show_info(100, refresh=True).name == "Renamed"
+
+    mock_get.assert_called_once()
+    assert mirror.show(100).name == "Renamed"
+
+    mirror.store_episodes([_episode(1, 1, 1, None)], series_id=100)
+
+    with patch.object(client, "get_paged") as mock_get_paged:
+        episodes = client.episodes_from_show_id(100)
+
+    mock_get_paged.assert_not_called()
+    assert [episode.identifier for episode in episodes] == [1]
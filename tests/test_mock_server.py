@@ -0,0 +1,103 @@
+"""End-to-end tests of the client against the local mock server."""
+
+import pytest
+
+from benchmarks.mock_server import Faults, MockTVDBServer
+from libtvdb import MetricsRegistry, ShowDetail, TVDBClient
+from libtvdb.exceptions import NotFoundException, TVDBException
+
+
+@pytest.fixture(name="server")
+def fixture_server():
+    """Run a mock server for the test."""
+    with MockTVDBServer(missing_ids={404}) as server:
+        yield server
+
+
+def _client(server, **kwargs):
+    return TVDBClient(api_key="test_key", base_url=server.base_url, **kwargs)
+
+
+def test_search_and_show_info(server):
+    """Test searching and fetching a show over HTTP."""
+    client = _client(server)
+
+    shows = client.search_show("Example Series")
+    show = client.show_info(1234)
+
+    assert shows
+    assert all("Example Series" in result.name for result in shows)
+    assert show.identifier == "1234"
+    assert show.characters
+
+
+def test_show_detail_levels(server):
+    """Test that the short record and inline episodes are served as the API does."""
+    client = _client(server)
+
+    short = client.show_info(1234, detail=ShowDetail.EXTENDED_SHORT)
+    show = client.show_with_episodes(1234)
+
+    assert short.characters is None
+    assert short.seasons
+    assert show.artworks is None
+    assert show.episodes
+    assert {episode.series_id for episode in show.episodes} == {1234}
+    # The episodes came inline, so no episode pages were requested
+    assert server.request_count == 3
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_episodes_are_paginated(server, max_workers):
+    """Test that every page of the episode list is combined."""
+    episodes = _client(server).episodes_from_show_id(1234, max_workers=max_workers)
+
+    assert len(episodes) == 288
+    assert len({episode.identifier for episode in episodes}) == 288
+    assert server.request_count == 4
+
+
+def test_episode_by_id_and_missing_ids(server):
+    """Test fetching an episode and the not found error."""
+    client = _client(server)
+
+    assert client.episode_by_id(77).identifier == 77
+
+    with pytest.raises(NotFoundException):
+        client.episode_by_id(404)
+
+
+def test_unauthenticated_requests_are_rejected(server):
+    """Test that the server checks the token."""
+    client = _client(server)
+    client.auth_token = "wrong"
+
+    with pytest.raises(TVDBException):
+        client.episode_by_id(1)
+
+
+def test_injected_errors():
+    """Test that injected server errors reach the client."""
+    with MockTVDBServer(faults=Faults(error_rate=1.0)) as server:
+        client = _client(server)
+        client.auth_token = "mock-token"
+
+        with pytest.raises(TVDBException):
+            client.episode_by_id(1)
+
+        assert server.status_counts == {500: 1}
+
+
+def test_rate_limit():
+    """Test that requests over the rate limit are answered with a 429."""
+    metrics = MetricsRegistry()
+
+    with MockTVDBServer(faults=Faults(rate_limit=1)) as server:
+        client = _client(server, metrics=metrics)
+        client.auth_token = "mock-token"
+        client.episode_by_id(1)
+
+        with pytest.raises(TVDBException):
+            client.episode_by_id(2)
+
+    assert metrics.snapshot()["requests"]["episodes/{id}/extended"] == {"200": 1, "429": 1}
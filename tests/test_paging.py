@@ -0,0 +1,123 @@
+"""Tests for concurrent pagination and combined show and episode loading."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from libtvdb import ShowDetail, TVDBClient
+from libtvdb.exceptions import TVDBException
+from libtvdb.model import Episode
+from tests.context import EPISODES_URL, episode_data, episode_page, page_number
+
+
+def _client():
+    client = TVDBClient(api_key="test_key", pin="test_pin")
+    client.auth_token = "test_token"
+    return client
+
+
+def _fake_get(url, headers=None, timeout=None):
+    _ = headers, timeout
+    return episode_page(page_number(url), 3)
+
+
+@patch("requests.get", side_effect=lambda url, **_: episode_page(page_number(url), 4, 3))
+def test_get_paged_concurrent_follows_next_past_total(mock_get):
+    """Test that pages beyond a miscounted total are still fetched."""
+    results = _client().get_paged(
+        "series/1/episodes/default", timeout=10, key="episodes", max_workers=4
+    )
+
+    assert [result["id"] for result in results] == [1, 2, 11, 12, 21, 22, 31, 32]
+    assert mock_get.call_count == 4
+
+
+@patch("requests.get", side_effect=_fake_get)
+def test_get_paged_concurrent_keeps_page_order(mock_get):
+    """Test that concurrently fetched pages are combined in order."""
+    results = _client().get_paged(
+        "series/1/episodes/default", timeout=10, key="episodes", max_workers=4
+    )
+
+    assert [result["id"] for result in results] == [1, 2, 11, 12, 21, 22]
+    assert mock_get.call_count == 3
+
+
+@patch("requests.get")
+def test_get_paged_concurrent_falls_back_without_counts(mock_get):
+    """Test that pages are walked one by one when the total isn't known."""
+    first = Mock(status_code=200)
+    first.json.return_value = {"data": [{"id": 1}], "links": {"next": f"{EPISODES_URL}?page=1"}}
+    second = Mock(status_code=200)
+    second.json.return_value = {"data": [{"id": 2}], "links": {"next": None}}
+    mock_get.side_effect = [first, second]
+
+    results = _client().get_paged("series/1/episodes/default", timeout=10, max_workers=4)
+
+    assert [result["id"] for result in results] == [1, 2]
+
+
+@patch("requests.get")
+def test_get_paged_concurrent_raises_page_errors(mock_get):
+    """Test that a failing page fails the whole request."""
+    failure = Mock(status_code=500, text="error")
+    failure.json.return_value = {"Error": "Server error"}
+    mock_get.side_effect = lambda url, headers=None, timeout=None: (
+        failure if "page=2" in url else _fake_get(url)
+    )
+
+    with pytest.raises(TVDBException):
+        _client().get_paged("series/1/episodes/default", timeout=10, max_workers=4)
+
+
+def test_show_with_episodes_inline():
+    """Test that inline episodes are deserialized without extra requests."""
+    client = _client()
+    show_data = {
+        "id": 1,
+        "name": "Test",
+        "slug": "test",
+        "status": "Ended",
+        "episodes": [episode_data(1), episode_data(2)],
+    }
+
+    with (
+        patch.object(client, "get", return_value=show_data) as mock_get,
+        patch.object(client, "get_paged") as mock_get_paged,
+    ):
+        show = client.show_with_episodes(1)
+
+    assert mock_get.call_args.args[0] == ShowDetail.WITH_EPISODES.path(1)
+    mock_get_paged.assert_not_called()
+    assert all(isinstance(episode, Episode) for episode in show.episodes)
+    assert [episode.identifier for episode in show.episodes] == [1, 2]
+
+
+def test_show_with_episodes_without_episodes():
+    """Test that an empty inline episode list doesn't fall back to the pages."""
+    client = _client()
+    show_data = {"id": 1, "name": "Test", "slug": "test", "status": "Upcoming", "episodes": []}
+
+    with (
+        patch.object(client, "get", return_value=show_data),
+        patch.object(client, "get_paged") as mock_get_paged,
+    ):
+        show = client.show_with_episodes(1)
+
+    mock_get_paged.assert_not_called()
+    assert not show.episodes
+
+
+def test_show_with_episodes_falls_back_to_pages():
+    """Test that the episode pages are fetched when they aren't inline."""
+    client = _client()
+    show_data = {"id": 1, "name": "Test", "slug": "test", "status": "Ended"}
+
+    with (
+        patch.object(client, "get", return_value=show_data),
+        patch.object(client, "get_paged", return_value=[episode_data(3)]) as mock_get_paged,
+    ):
+        show = client.show_with_episodes(1, max_workers=3)
+
+    assert mock_get_paged.call_args.kwargs["max_workers"] == 3
+    assert [episode.identifier for episode in show.episodes] == [3]
@@ -0,0 +1,81 @@
+"""Tests for deserializing bulk lookups in worker processes."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from benchmarks.generate_fixtures import FIXTURES
+from benchmarks.mock_server import MockTVDBServer
+from libtvdb import TVDBClient
+from libtvdb.diff import fingerprint
+from libtvdb.exceptions import NotFoundException
+from libtvdb.model import Show
+from libtvdb.processes import worker_count
+from libtvdb.transport import FakeTransport
+
+
+def test_worker_count():
+    """Test choosing between in-process and out-of-process deserialization."""
+    assert worker_count([1, 2], 3, threshold=100) == 3
+    assert worker_count(range(1000), 0, threshold=100) == 0
+
+    with pytest.raises(ValueError):
+        worker_count([], -1, threshold=100)
+
+    with patch("libtvdb.processes.os.cpu_count", return_value=4):
+        assert worker_count(range(1000), None, threshold=100) == 4
+        assert worker_count(range(99), None, threshold=100) == 0
+        assert worker_count(iter(range(1000)), None, threshold=100) == 0
+
+    with patch("libtvdb.processes.os.cpu_count", return_value=1):
+        assert worker_count(range(1000), None, threshold=100) == 0
+
+
+def test_pool_builds_models():
+    """Test that a show built in a worker process matches one built here."""
+    with open(FIXTURES / "series_extended.json", encoding="utf-8") as fixture_file:
+        data = json.load(fixture_file)["data"]
+
+    transport = FakeTransport()
+    transport.add("GET", f"series/{data['id']}/extended", json_body={"data": data})
+    client = TVDBClient(api_key="key", transport=transport)
+    client.auth_token = "token"
+
+    (in_processes,) = client.shows_by_id_many([data["id"]], processes=1)
+    (in_process,) = client.shows_by_id_many([data["id"]], processes=0)
+
+    assert in_processes.value == in_process.value
+    assert in_processes.value.fingerprint == fingerprint(data)
+
+
+def test_shows_by_id_many_in_processes():
+    """Test a bulk show lookup that deserializes in a worker process."""
+    with MockTVDBServer(missing_ids={404}) as server:
+        client = TVDBClient(api_key="key", base_url=server.base_url)
+
+        results = {
+            result.identifier: result
+            for result in client.shows_by_id_many([1, 2, 404, 2], processes=1)
+        }
+
+    assert sorted(results) == [1, 2, 404]
+    assert isinstance(results[1].value, Show)
+    assert results[2].value.identifier == "2"
+    assert isinstance(results[404].error, NotFoundException)
+    assert len(client.remote_id_index) > 0
+
+
+def test_episodes_by_id_many_in_processes():
+    """Test a bulk episode lookup that deserializes in a worker process."""
+    with MockTVDBServer() as server:
+        client = TVDBClient(api_key="key", base_url=server.base_url)
+
+        in_processes = list(client.episodes_by_id_many(range(1, 11), processes=1))
+        in_process = list(client.episodes_by_id_many(range(1, 11), processes=0))
+
+    def by_id(results):
+        return {result.identifier: result.value for result in results}
+
+    assert by_id(in_processes) == by_id(in_process)
+    assert len(in_processes) == 10
@@ -0,0 +1,139 @@
+"""Tests for remote ID lookups."""
+
+from unittest.mock import Mock, patch
+
+from libtvdb import TVDBClient
+from libtvdb.exceptions import NotFoundException
+from libtvdb.model import RemoteID
+from libtvdb.remote_ids import RemoteIDIndex, RemoteIDTarget, series_id
+
+SHOW_DATA = {
+    "id": 121361,
+    "name": "Game of Thrones",
+    "slug": "game-of-thrones",
+    "status": "Ended",
+    "remoteIds": [
+        {"id": "tt0944947", "type": 2, "sourceName": "IMDB"},
+        {"id": "1399", "type": 12, "sourceName": "TheMovieDB.com"},
+    ],
+}
+
+
+def _client():
+    client = TVDBClient(api_key="test_key", pin="test_pin")
+    client.auth_token = "test_token"
+    return client
+
+
+def _remote_id(identifier, source_name):
+    remote_id = RemoteID()
+    remote_id.identifier = identifier
+    remote_id.source_name = source_name
+    return remote_id
+
+
+def test_index_lookup_by_source():
+    """Test that lookups can be narrowed down by source name."""
+    index = RemoteIDIndex()
+    index.add_remote_ids([_remote_id("1399", "TheMovieDB.com")], "series", 121361)
+    index.add_remote_ids([_remote_id("1399", "IMDB")], "episode", 5)
+
+    assert len(index.lookup("1399")) == 2
+    assert index.lookup("1399", source_name="themoviedb.com") == [
+        RemoteIDTarget("series", 121361, "TheMovieDB.com")
+    ]
+    assert index.lookup("unknown") == []
+
+
+def test_deserialized_shows_are_indexed():
+    """Test that every show the client deserializes fills the index."""
+    client = _client()
+
+    with patch.object(client, "get", return_value=SHOW_DATA):
+        client.show_info(121361)
+
+    with patch.object(client, "get") as mock_get:
+        targets = client.resolve_remote_id("tt0944947")
+
+    mock_get.assert_not_called()
+    assert targets == [RemoteIDTarget("series", 121361, "IMDB")]
+
+
+def test_resolve_remote_id_searches_api_on_miss():
+    """Test that unknown remote IDs are looked up with the search endpoint."""
+    client = _client()
+    response = [{"series": {key: value for key, value in SHOW_DATA.items() if key != "remoteIds"}}]
+
+    with patch.object(client, "get", return_value=response) as mock_get:
+        targets = client.resolve_remote_id("tt0944947")
+        client.resolve_remote_id("tt0944947")
+
+    mock_get.assert_called_once_with("search/remoteid/tt0944947", timeout=10.0)
+    assert targets == [RemoteIDTarget("series", 121361, None)]
+
+
+def test_remote_id_search_results_are_indexed_by_tvdb_id():
+    """Test that series identified as "series-<id>" in remote ID results index the TVDB ID."""
+    client = _client()
+    series = {key: value for key, value in SHOW_DATA.items() if key != "remoteIds"}
+    series.update({"id": "series-121361", "tvdb_id": "121361"})
+
+    with patch.object(client, "get", return_value=[{"series": series}]):
+        assert client.resolve_remote_id("tt0944947") == [RemoteIDTarget("series", 121361, None)]
+
+
+def test_search_remote_id_not_found():
+    """Test that a missing remote ID gives no results."""
+    client = _client()
+
+    with patch.object(client, "get", side_effect=NotFoundException("missing")):
+        assert not client.search_remote_id("tt0000000")
+        assert not client.resolve_remote_id("tt0000000")
+
+    assert not client.search_remote_id("")
+
+
+def test_resolve_remote_id_caches_misses():
+    """Test that a remote ID the API doesn't know is only searched for once."""
+    client = _client()
+
+    with patch.object(client, "get", side_effect=NotFoundException("missing")) as mock_get:
+        assert not client.resolve_remote_id("tt0000000")
+        assert not client.resolve_remote_id("tt0000000")
+
+    mock_get.assert_called_once()
+
+    client.remote_id_index.miss_ttl = 0
+    client.remote_id_index.add_miss("tt0000001")
+    assert not client.remote_id_index.is_known_miss("tt0000001")
+
+    client.remote_id_index.miss_ttl = 60
+    client.remote_id_index.add_miss("tt0000002")
+    client.remote_id_index.add("tt0000002", "series", 1)
+    assert not client.remote_id_index.is_known_miss("tt0000002")
+
+
+def test_search_results_are_indexed():
+    """Test that search results, identified as "series-<id>", are indexed by TVDB ID."""
+    client = _client()
+    result = {
+        "id": "series-121361",
+        "name": "Game of Thrones",
+        "slug": "game-of-thrones",
+        "status": "Ended",
+        "tvdb_id": "121361",
+        "remote_ids": [{"id": "tt0944947", "type": 2, "sourceName": "IMDB"}],
+    }
+
+    with patch.object(client, "get", return_value=[result]):
+        shows = client.search_show("Game of Thrones")
+
+    assert shows[0].identifier == "series-121361"
+    assert client.remote_id_index.lookup("tt0944947") == [RemoteIDTarget("series", 121361, "IMDB")]
+
+
+def test_series_id_handles_search_identifiers():
+    """Test that search result IDs ("series-<id>") are reduced to the TVDB ID."""
+    assert series_id(Mock(identifier="121361")) == 121361
+    assert series_id(Mock(identifier="series-121361", tvdb_id="121361")) == 121361
+    assert series_id(Mock(identifier="series-121361", tvdb_id=None)) == 121361
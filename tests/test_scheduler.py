@@ -0,0 +1,238 @@
+"""Tests for scheduling show refreshes."""
+
+import datetime
+from unittest.mock import patch
+
+import pytest
+
+from libtvdb import TVDBClient
+from libtvdb.exceptions import NotFoundException, TVDBException
+from libtvdb.mirror import Mirror
+from libtvdb.model import Show, Status, StatusName
+from libtvdb.model.serialization import model_fields
+from libtvdb.model.show import SeriesAirsDays
+from libtvdb.scheduler import (
+    RefreshIntervals,
+    RefreshScheduler,
+    RequestBudget,
+    next_airing,
+    next_refresh,
+)
+from libtvdb.transport import FakeTransport
+
+# A Wednesday
+NOW = datetime.datetime(2024, 5, 1, 12, 0, tzinfo=datetime.UTC)
+
+
+def _show(identifier=1, status=StatusName.CONTINUING, keep_updated=True, **fields):
+    show = Show.__new__(Show)
+
+    for name in model_fields(Show):
+        setattr(show, name, None)
+
+    show.identifier = str(identifier)
+    show.status = Status.__new__(Status)
+    show.status.name = status
+    show.status.keep_updated = keep_updated
+
+    for name, value in fields.items():
+        setattr(show, name, value)
+
+    return show
+
+
+def _client():
+    client = TVDBClient(api_key="key")
+    client.auth_token = "token"
+    return client
+
+
+class _Clock:
+    def __init__(self):
+        self.time = 0.0
+
+    def __call__(self):
+        return self.time
+
+
+def test_ended_shows_are_refreshed_rarely():
+    """Test the intervals for ended shows."""
+    finished = _show(status=StatusName.ENDED, keep_updated=False, last_aired=NOW.date())
+    recently_ended = _show(status=StatusName.ENDED, last_aired=NOW.date())
+    long_ended = _show(status=StatusName.ENDED, last_aired=datetime.date(2010, 1, 1))
+
+    assert next_refresh(finished, now=NOW) == NOW + RefreshIntervals.ENDED
+    assert next_refresh(recently_ended, now=NOW) == NOW + RefreshIntervals.RECENTLY_ENDED
+    assert next_refresh(long_ended, now=NOW) == NOW + RefreshIntervals.ENDED
+
+
+def test_continuing_shows():
+    """Test that recent activity shortens the interval for continuing shows."""
+    quiet = _show(last_aired=datetime.date(2023, 1, 1))
+    aired = _show(last_aired=datetime.date(2024, 4, 28))
+    edited = _show(last_updated=datetime.datetime(2024, 4, 30, 9, 0))
+
+    assert next_refresh(quiet, now=NOW) == NOW + RefreshIntervals.CONTINUING
+    assert next_refresh(aired, now=NOW) == NOW + RefreshIntervals.ACTIVE
+    assert next_refresh(edited, now=NOW) == NOW + RefreshIntervals.ACTIVE
+    assert next_refresh(_show(status=StatusName.UNKNOWN), now=NOW) == NOW + RefreshIntervals.UNKNOWN
+
+
+def test_shows_airing_soon():
+    """Test that a show is refreshed shortly after its next episode airs."""
+    tonight = _show(next_aired=NOW.date(), airs_time_utc="14:30")
+    next_week = _show(next_aired=datetime.date(2024, 5, 5), airs_time_utc="20:00")
+    overdue = _show(next_aired=datetime.date(2024, 4, 30), airs_time_utc="20:00")
+
+    assert next_refresh(tonight, now=NOW) == NOW.replace(hour=15, minute=30)
+    assert next_refresh(next_week, now=NOW) == NOW + RefreshIntervals.AIRING_SOON
+    assert next_refresh(overdue, now=NOW) == NOW + RefreshIntervals.MINIMUM
+
+
+def test_next_airing_from_airs_days():
+    """Test estimating the next airing from the days a show airs."""
+    days = SeriesAirsDays.__new__(SeriesAirsDays)
+    for day in ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"):
+        setattr(days, day, day == "friday")
+
+    show = _show(airs_days=days, airs_time_utc="01:00")
+
+    assert next_airing(show, now=NOW) == datetime.datetime(2024, 5, 3, 1, 0, tzinfo=datetime.UTC)
+    assert next_airing(_show(airs_days=days, status=StatusName.ENDED), now=NOW) is None
+    # Without an air time the episode is assumed to air at the end of the day
+    assert next_airing(_show(next_aired=NOW.date()), now=NOW).time() == datetime.time(23, 59)
+
+
+def test_request_budget():
+    """Test that the budget refills over time up to its capacity."""
+    clock = _Clock()
+    budget = RequestBudget(2.0, capacity=4, clock=clock)
+
+    assert budget.take(10) == 4
+    assert budget.take(1) == 0
+    assert budget.seconds_until_available() == pytest.approx(0.5)
+
+    clock.time = 1.0
+    assert budget.available == 2
+
+    clock.time = 100.0
+    assert budget.take(10) == 4
+
+    with pytest.raises(ValueError):
+        RequestBudget(0)
+
+
+def test_scheduler_refreshes_due_shows_within_budget():
+    """Test that the most overdue shows are refreshed first and the budget is respected."""
+    client = _client()
+    clock = _Clock()
+    scheduler = RefreshScheduler(client, budget=RequestBudget(1.0, capacity=2, clock=clock))
+    scheduler.track(1, due=NOW - datetime.timedelta(hours=1))
+    scheduler.track(2, due=NOW - datetime.timedelta(hours=3))
+    scheduler.track(3, due=NOW - datetime.timedelta(hours=2))
+    scheduler.track(4, due=NOW + datetime.timedelta(hours=1))
+
+    def show_info(identifier, **_):
+        return _show(identifier, status=StatusName.ENDED, keep_updated=False)
+
+    with patch.object(client, "_show_info", side_effect=show_info) as mock_show_info:
+        results = scheduler.refresh_due(now=NOW)
+        assert sorted(result.identifier for result in results) == [2, 3]
+
+        # The budget is spent, so nothing else is refreshed until it refills
+        assert not scheduler.refresh_due(now=NOW)
+
+        clock.time = 1.0
+        assert [result.identifier for result in scheduler.refresh_due(now=NOW)] == [1]
+
+    assert mock_show_info.call_count == 3
+    assert scheduler.due_at(2) == NOW + RefreshIntervals.ENDED
+    assert scheduler.next_due() == NOW + datetime.timedelta(hours=1)
+    assert len(scheduler) == 4
+
+
+def test_scheduler_failures():
+    """Test that failed refreshes are retried and deleted shows are dropped."""
+    client = _client()
+    scheduler = RefreshScheduler(client, budget=RequestBudget(10.0), series_ids=[1, 2])
+
+    def show_info(identifier, **_):
+        if identifier == 1:
+            raise NotFoundException("Gone")
+        raise TVDBException("Server error")
+
+    with patch.object(client, "_show_info", side_effect=show_info):
+        results = scheduler.refresh_due(now=NOW)
+
+    assert len(results) == 2
+    assert 1 not in scheduler
+    assert scheduler.due_at(2) == NOW + RefreshIntervals.RETRY
+
+
+def test_scheduler_retries_after_lookup_error():
+    """Test that shows are rescheduled when the bulk lookup itself fails."""
+    client = _client()
+    budget = RequestBudget(1.0, capacity=2, clock=_Clock())
+    scheduler = RefreshScheduler(client, budget=budget, series_ids=[1, 2])
+
+    with (
+        patch.object(client, "shows_by_id_many", side_effect=RuntimeError("Pool broken")),
+        pytest.raises(RuntimeError),
+    ):
+        scheduler.refresh_due(now=NOW)
+
+    assert scheduler.due_at(1) == NOW + RefreshIntervals.RETRY
+    assert scheduler.due_at(2) == NOW + RefreshIntervals.RETRY
+    assert scheduler.next_due() == NOW + RefreshIntervals.RETRY
+    # No request was made, so the budget is untouched
+    assert budget.available == 2
+
+
+def test_scheduler_bypasses_mirror():
+    """Test that a fresh mirrored copy doesn't stand in for a due refresh."""
+    mirror = Mirror()
+    mirror.store_show(_show(1, name="Old"))
+
+    show_data = {"id": 1, "name": "New", "slug": "new", "status": "Continuing"}
+    transport = FakeTransport()
+    transport.add("GET", "series/1/extended", json_body={"data": show_data})
+    client = TVDBClient(api_key="key", transport=transport, mirror=mirror)
+    client.auth_token = "token"
+
+    budget = RequestBudget(1.0, capacity=1, clock=_Clock())
+    refreshed = []
+    scheduler = RefreshScheduler(client, budget=budget, series_ids=[1], on_refresh=refreshed.append)
+
+    scheduler.refresh_due(now=NOW)
+
+    assert [show.name for show in refreshed] == ["New"]
+    assert len(transport.requests) == 1
+    assert mirror.show(1).name == "New"
+    assert budget.available == 0
+
+
+def test_scheduler_schedule_and_untrack():
+    """Test tracking a show fetched elsewhere and untracking it again."""
+    refreshed = []
+    client = _client()
+    scheduler = RefreshScheduler(client, budget=RequestBudget(10.0), on_refresh=refreshed.append)
+
+    # Search results identify shows as "series-<id>"
+    scheduler.schedule(_show("series-7", status=StatusName.ENDED, tvdb_id="7"), now=NOW)
+    assert scheduler.due_at(7) == NOW + RefreshIntervals.ENDED
+    scheduler.untrack(7)
+
+    due = scheduler.schedule(_show(5, next_aired=NOW.date(), airs_time_utc="13:00"), now=NOW)
+
+    assert due == NOW.replace(hour=14)
+    assert scheduler.seconds_until_work(now=NOW) == pytest.approx(2 * 60 * 60)
+
+    with patch.object(client, "_show_info", side_effect=lambda identifier, **_: _show(identifier)):
+        assert [result.identifier for result in scheduler.refresh_due(now=due)] == [5]
+
+    assert refreshed[0].identifier == "5"
+
+    scheduler.untrack(5)
+
+    assert scheduler.next_due() is None
+    assert scheduler.seconds_until_work(now=NOW) is None
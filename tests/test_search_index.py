@@ -0,0 +1,114 @@
+"""Tests for the offline show search index."""
+
+from unittest.mock import Mock
+
+from libtvdb.model import Show
+from libtvdb.search_index import ShowSearchIndex, normalize_name, trigrams
+
+
+def _show(identifier, name, year=None, aliases=None, translations=None):
+    show = Show()
+    show.identifier = identifier
+    show.name = name
+    show.slug = normalize_name(name).replace(" ", "-")
+    show.year = year
+    show.aliases = aliases
+    show.translations = translations
+    return show
+
+
+def _index():
+    return ShowSearchIndex(
+        [
+            _show("1", "Doctor Who", year="1963"),
+            _show("2", "Doctor Who", year="2005"),
+            _show("3", "The Office", year="2005", aliases=["The Office (US)"]),
+            _show("4", "La Casa de Papel", translations={"eng": "Money Heist"}),
+        ]
+    )
+
+
+def test_normalize_name():
+    """Test that separators and punctuation are dropped."""
+    assert normalize_name("Doctor.Who_2005") == "doctor who 2005"
+    assert normalize_name("  The Office (US)! ") == "the office us"
+
+
+def test_trigrams():
+    """Test trigram extraction includes word boundary padding."""
+    assert trigrams("ab") == {"  a", " ab", "ab "}
+
+
+def test_search_uses_year():
+    """Test that a year in the query picks the matching show."""
+    matches = _index().search("doctor.who.2005")
+
+    assert matches[0].show.identifier == "2"
+    assert matches[0].score == 1.0
+    assert matches[1].show.identifier == "1"
+    assert matches[1].score < 1.0
+
+
+def test_search_exact_and_fuzzy():
+    """Test exact matches score 1 and near misses still rank."""
+    index = _index()
+
+    assert index.search("the office")[0].score == 1.0
+    assert index.search("Docter Who")[0].show.name == "Doctor Who"
+    assert not index.search("")
+    assert not index.search("zzzzzz")
+
+
+def test_search_aliases_and_translations():
+    """Test that aliases and translated names are indexed."""
+    index = _index()
+
+    assert index.search("The Office US")[0].show.identifier == "3"
+    assert index.search("money heist")[0].show.identifier == "4"
+
+
+def test_add_is_idempotent():
+    """Test that re-adding a show doesn't duplicate it."""
+    index = _index()
+    index.add(_show("1", "Doctor Who", year="1963"))
+
+    assert len(index) == 4
+    assert _show("1", "Doctor Who") in index
+    assert len([m for m in index.search("doctor who") if m.show.identifier == "1"]) == 1
+
+
+def test_add_replaces_names():
+    """Test that re-adding a show drops the names it was indexed under before."""
+    index = _index()
+    index.add(_show("4", "Money Heist"))
+
+    assert index.search("money heist")[0].score == 1.0
+    assert all(match.show.identifier != "4" for match in index.search("la casa de papel"))
+
+
+def test_search_results_and_records_are_one_show():
+    """Test that a search result ("series-<id>") and the full record share an entry."""
+    index = _index()
+    result = _show("series-5", "Breaking Bad")
+    result.tvdb_id = "5"
+    index.add(result)
+    index.add(_show("5", "Breaking Bad"))
+
+    assert len(index) == 5
+    assert result in index
+    assert [match.show.identifier for match in index.search("breaking bad")] == ["5"]
+
+
+def test_search_or_fetch():
+    """Test that the API is only used when the local match is weak."""
+    index = _index()
+    client = Mock()
+    client.search_show.return_value = [_show("5", "Breaking Bad", year="2008")]
+
+    assert index.search_or_fetch(client, "doctor who")[0].score == 1.0
+    client.search_show.assert_not_called()
+
+    matches = index.search_or_fetch(client, "breaking bad")
+    client.search_show.assert_called_once_with("breaking bad", timeout=None)
+    assert matches[0].show.identifier == "5"
+    assert "5" in [match.show.identifier for match in index.search("breaking bad")]
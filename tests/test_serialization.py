@@ -0,0 +1,108 @@
+"""Tests for the compact binary model format."""
+
+import datetime
+import json
+import marshal
+
+import deserialize
+import pytest
+
+import libtvdb.model
+from benchmarks.generate_fixtures import FIXTURES
+from libtvdb.model import Episode, EpisodeCollection, Show, StatusName
+from libtvdb.model.serialization import MAGIC, VERSION, Serializable, dumps, loads
+
+
+def _fixture(name):
+    with open(FIXTURES / name, encoding="utf-8") as fixture_file:
+        return json.load(fixture_file)["data"]
+
+
+def _as_data(value):
+    """Convert models to dictionaries so that they can be compared field by field."""
+    if isinstance(value, list):
+        return [type(value).__name__, [_as_data(item) for item in value]]
+    if isinstance(value, dict):
+        return {key: _as_data(item) for key, item in value.items()}
+    if hasattr(value, "__dict__") and not isinstance(value, type):
+        return [type(value).__name__, _as_data(vars(value))]
+    return value
+
+
+def test_show_round_trip():
+    """Test that every field of a full show survives a round trip."""
+    show = deserialize.deserialize(Show, _fixture("series_extended.json"), throw_on_unhandled=True)
+
+    loaded = Show.from_bytes(show.to_bytes())
+
+    assert _as_data(loaded) == _as_data(show)
+    assert isinstance(loaded.status.name, StatusName)
+    assert isinstance(loaded.first_aired, datetime.date)
+    assert isinstance(loaded.last_updated, datetime.datetime)
+
+
+def test_episode_collection_round_trip():
+    """Test that an episode collection keeps its type and indexes."""
+    episodes = EpisodeCollection(
+        deserialize.deserialize(Episode, episode, throw_on_unhandled=True)
+        for episode in _fixture("episodes_page_0.json")["episodes"]
+    )
+
+    loaded = EpisodeCollection.from_bytes(episodes.to_bytes())
+
+    assert isinstance(loaded, EpisodeCollection)
+    assert _as_data(loaded) == _as_data(episodes)
+    assert loaded.by_number(1, 1) == episodes.by_number(1, 1)
+
+
+def test_every_model_is_serializable():
+    """Test that every model class has a working round trip."""
+    for name in libtvdb.model.__all__:
+        model_type = getattr(libtvdb.model, name)
+
+        if not isinstance(model_type, type) or not issubclass(model_type, Serializable):
+            continue
+
+        model = model_type() if issubclass(model_type, list) else model_type.__new__(model_type)
+
+        assert isinstance(model_type.from_bytes(model.to_bytes()), model_type), name
+
+
+def test_plain_values():
+    """Test serializing plain data and containers of models."""
+    value = {"a": [1, 2.5, None, True], "b": (datetime.time(12, 30), StatusName.ENDED)}
+
+    assert loads(dumps(value)) == value
+
+
+def test_missing_fields_are_none():
+    """Test that data written without a field loads with it set to None."""
+    types = [("libtvdb.model.alias", "Alias", ("name",))]
+    payload = MAGIC + bytes([VERSION]) + marshal.dumps((types, (0, 0, "Someone")), 4)
+
+    alias = libtvdb.model.Alias.from_bytes(payload)
+
+    assert alias.name == "Someone"
+    assert alias.language is None
+
+
+def test_invalid_data():
+    """Test that invalid or foreign data is rejected."""
+    with pytest.raises(ValueError, match="Not a serialized"):
+        loads(b"{}")
+
+    with pytest.raises(ValueError, match="version"):
+        loads(MAGIC + bytes([VERSION + 1]))
+
+    with pytest.raises(ValueError, match="corrupt"):
+        loads(MAGIC + bytes([VERSION]) + b"\x00")
+
+    foreign = MAGIC + bytes([VERSION]) + marshal.dumps(([("os", "system", ())], (0, 0)), 4)
+    with pytest.raises(ValueError, match="outside the models"):
+        loads(foreign)
+
+    with pytest.raises(ValueError, match="Expected a serialized Show"):
+        Show.from_bytes(dumps(StatusName.ENDED))
+
+    with pytest.raises(TypeError):
+        dumps(object())
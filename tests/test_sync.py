@@ -0,0 +1,256 @@
+"""Tests for the incremental sync engine."""
+
+import datetime
+from unittest.mock import Mock, patch
+
+from libtvdb import TVDBClient
+from libtvdb.exceptions import NotFoundException
+from libtvdb.mirror import Mirror
+from libtvdb.model import EntityUpdate, Episode, Show
+from libtvdb.sync import SyncEngine
+from libtvdb.transport import FakeTransport
+from tests.context import episode_data
+
+
+def _update(entity_type, record_id, series_id, timestamp, method="update"):
+    update = EntityUpdate()
+    update.entity_type = entity_type
+    update.record_id = record_id
+    update.series_id = series_id
+    update.method = method
+    update.timestamp = datetime.datetime.fromtimestamp(timestamp, tz=datetime.UTC)
+    return update
+
+
+def _mirror_show(mirror, series_id, name, episode_ids):
+    """Store a show and its complete episode list in a mirror."""
+    show = Show()
+    show.identifier = str(series_id)
+    show.name = name
+    mirror.store_show(show)
+
+    episodes = []
+    for episode_id in episode_ids:
+        episode = Episode()
+        episode.identifier = episode_id
+        episode.series_id = series_id
+        episode.number = episode_id
+        episodes.append(episode)
+    mirror.store_episodes(episodes, series_id=series_id)
+
+
+def _client():
+    client = TVDBClient(api_key="test_key", pin="test_pin")
+    client.auth_token = "test_token"
+    return client
+
+
+def test_first_sync_fetches_everything(tmp_path):
+    """Test that the first sync does a full refresh and stores a mark."""
+    client = _client()
+    engine = SyncEngine(client, state_path=str(tmp_path / "state.json"), series_ids=[1, 2])
+
+    with (
+        patch.object(client, "show_info", side_effect=lambda i, **_: f"show-{i}"),
+        patch.object(client, "episodes_from_show_id", side_effect=lambda i, **_: [f"ep-{i}"]),
+        patch.object(client, "updates") as mock_updates,
+    ):
+        result = engine.sync()
+
+    mock_updates.assert_not_called()
+    assert sorted(result.shows) == ["show-1", "show-2"]
+    assert sorted(result.episodes) == ["ep-1", "ep-2"]
+    assert engine.high_water_mark is not None
+
+
+def test_incremental_sync_only_fetches_changes(tmp_path):
+    """Test that only tracked, changed records are refetched."""
+    client = _client()
+    state_path = tmp_path / "state.json"
+    state_path.write_text('{"since": 100}')
+    engine = SyncEngine(client, state_path=str(state_path), series_ids=[1, 2])
+
+    updates = [
+        _update("series", 1, None, 150),
+        _update("episodes", 10, 2, 160),
+        _update("episodes", 11, 2, 170, method="delete"),
+        _update("episodes", 12, 99, 180),
+        _update("artwork", 13, 2, 190),
+    ]
+
+    with (
+        patch.object(client, "updates", return_value=updates) as mock_updates,
+        patch.object(client, "show_info", side_effect=lambda i, **_: f"show-{i}") as mock_show,
+        patch.object(
+            client, "episode_by_id", side_effect=lambda i, timeout=None: f"ep-{i}"
+        ) as mock_episode,
+    ):
+        result = engine.sync()
+
+    mock_updates.assert_called_once_with(100, timeout=None)
+    assert sorted(call.args[0] for call in mock_show.call_args_list) == [1, 2]
+    assert [call.args[0] for call in mock_episode.call_args_list] == [10]
+    assert result.episodes == ["ep-10"]
+    assert result.deleted_episode_ids == [11]
+    assert engine.high_water_mark == 190
+
+
+def test_failures_do_not_advance_mark(tmp_path):
+    """Test that a failed refetch leaves the state untouched for a retry."""
+    client = _client()
+    state_path = tmp_path / "state.json"
+    state_path.write_text('{"since": 100}')
+    engine = SyncEngine(client, state_path=str(state_path), series_ids=[1])
+
+    with (
+        patch.object(client, "updates", return_value=[_update("series", 1, None, 200)]),
+        patch.object(client, "show_info", side_effect=Mock(side_effect=RuntimeError("boom"))),
+    ):
+        result = engine.sync()
+
+    assert len(result.failures) == 1
+    assert engine.high_water_mark == 100
+
+
+def test_reset_forces_full_refresh(tmp_path):
+    """Test that reset removes the persisted state."""
+    state_path = tmp_path / "state.json"
+    state_path.write_text('{"since": 100}')
+    engine = SyncEngine(_client(), state_path=str(state_path))
+
+    engine.reset()
+    engine.reset()
+
+    assert engine.high_water_mark is None
+
+
+def test_updates_builds_query():
+    """Test that the updates call pages through the right endpoint."""
+    client = _client()
+
+    payload = {
+        "entityType": "series",
+        "methodInt": 2,
+        "method": "update",
+        "extraInfo": "",
+        "userId": 1,
+        "recordType": "",
+        "recordId": 5,
+        "timeStamp": 1700000000,
+        "seriesId": 5,
+        "mergeToId": 0,
+        "mergeToEntityType": "",
+    }
+
+    with patch.object(client, "get_paged", return_value=[payload]) as mock_get_paged:
+        updates = client.updates(1699999999, entity_type="series")
+
+    assert mock_get_paged.call_args.args[0] == "updates?since=1699999999&type=series"
+    assert updates[0].record_id == 5
+    assert updates[0].timestamp.year == 2023
+
+
+def test_newly_tracked_shows_are_fetched(tmp_path):
+    """Test that a show tracked after the first sync is fetched in full on the next one."""
+    client = _client()
+    state_path = tmp_path / "state.json"
+    state_path.write_text('{"since": 100}')
+    engine = SyncEngine(client, state_path=str(state_path), series_ids=[1])
+    engine.track(2)
+    engine.track(1)
+
+    with (
+        patch.object(client, "updates", return_value=[]),
+        patch.object(client, "show_info", side_effect=RuntimeError("boom")),
+    ):
+        assert len(engine.sync().failures) == 1
+
+    # A new engine picks up the show that is still waiting for its first fetch
+    engine = SyncEngine(client, state_path=str(state_path), series_ids=[1, 2])
+
+    with (
+        patch.object(client, "updates", return_value=[]),
+        patch.object(client, "show_info", side_effect=lambda i, **_: f"show-{i}"),
+        patch.object(client, "episodes_from_show_id", side_effect=lambda i, **_: [f"ep-{i}"]),
+    ):
+        result = engine.sync()
+        assert not engine.sync().shows
+
+    assert result.shows == ["show-2"]
+    assert result.episodes == ["ep-2"]
+
+
+def test_deleted_records_are_dropped(tmp_path):
+    """Test that records the API no longer has don't hold back the high-water mark."""
+    client = _client()
+    state_path = tmp_path / "state.json"
+    state_path.write_text('{"since": 100}')
+    engine = SyncEngine(client, state_path=str(state_path), series_ids=[1, 2])
+    updates = [_update("series", 1, None, 150), _update("episodes", 10, 2, 160)]
+
+    with (
+        patch.object(client, "updates", return_value=updates),
+        patch.object(client, "show_info", side_effect=NotFoundException("Gone")),
+        patch.object(client, "episode_by_id", side_effect=NotFoundException("Gone")),
+    ):
+        result = engine.sync()
+
+    assert not result.failures
+    assert result.deleted_series_ids == [1]
+    assert result.deleted_episode_ids == [10]
+    assert engine.tracked_series == {2}
+    assert engine.high_water_mark == 160
+
+
+def test_changed_shows_bypass_fresh_mirror(tmp_path):
+    """Test that a show in the updates feed is refetched even if the mirror is fresh."""
+    mirror = Mirror()
+    _mirror_show(mirror, 1, "Old", [])
+    show_data = {"id": 1, "name": "New", "slug": "new", "status": "Continuing"}
+    transport = FakeTransport()
+    transport.add("GET", "series/1/extended", json_body={"data": show_data})
+    client = TVDBClient(api_key="test_key", transport=transport, mirror=mirror)
+    client.auth_token = "test_token"
+
+    state_path = tmp_path / "state.json"
+    state_path.write_text('{"since": 100}')
+    engine = SyncEngine(client, state_path=str(state_path), series_ids=[1])
+
+    with patch.object(client, "updates", return_value=[_update("series", 1, None, 200)]):
+        result = engine.sync()
+
+    assert [show.name for show in result.shows] == ["New"]
+    assert mirror.show(1).name == "New"
+    assert engine.high_water_mark == 200
+
+
+def test_sync_updates_mirror(tmp_path):
+    """Test that refetched episodes are written to the mirror and deleted records removed."""
+    mirror = Mirror()
+    _mirror_show(mirror, 1, "Show", [10, 11])
+    _mirror_show(mirror, 2, "Deleted", [20])
+
+    transport = FakeTransport()
+    transport.add("GET", "episodes/10/extended", json_body={"data": episode_data(10, number=5)})
+    client = TVDBClient(api_key="test_key", transport=transport, mirror=mirror)
+    client.auth_token = "test_token"
+
+    state_path = tmp_path / "state.json"
+    state_path.write_text('{"since": 100}')
+    engine = SyncEngine(client, state_path=str(state_path), series_ids=[1, 2])
+    updates = [
+        _update("episodes", 10, 1, 150),
+        _update("episodes", 11, 1, 160, method="delete"),
+        _update("series", 2, None, 170, method="delete"),
+    ]
+
+    with patch.object(client, "updates", return_value=updates):
+        result = engine.sync()
+
+    assert not result.failures
+    assert mirror.episode(10).number == 5
+    assert mirror.episode(11) is None
+    assert [episode.identifier for episode in mirror.episodes_for_show(1)] == [10]
+    assert mirror.show(2) is None
+    assert mirror.episode(20) is None
+    assert mirror.show(1).name == "Show"
@@ -0,0 +1,86 @@
+"""Tests for the optional tracing spans."""
+
+import contextlib
+from unittest.mock import Mock, patch
+
+import pytest
+
+from libtvdb import TVDBClient, tracing
+from tests.context import api_response, episode_data
+
+
+class FakeTracer:
+    """A tracer that records the spans that are started."""
+
+    def __init__(self):
+        self.spans = []
+
+    @contextlib.contextmanager
+    def start_as_current_span(self, name, attributes=None):
+        """Record a span and yield a mock for attributes set later."""
+        current_span = Mock()
+        self.spans.append((name, dict(attributes or {}), current_span))
+        yield current_span
+
+
+@pytest.fixture(name="tracer")
+def fixture_tracer(monkeypatch):
+    """Route spans to a fake tracer."""
+    tracer = FakeTracer()
+    monkeypatch.setattr(tracing, "_tracer", tracer)
+    return tracer
+
+
+def _client():
+    client = TVDBClient(api_key="test_key", pin="test_pin")
+    client.auth_token = "test_token"
+    return client
+
+
+def test_span_is_shared_no_op_without_tracer(monkeypatch):
+    """Test that spans cost nothing when tracing isn't available."""
+    monkeypatch.setattr(tracing, "_tracer", None)
+
+    assert not tracing.is_enabled()
+    assert tracing.span("first") is tracing.span("second", {"key": 1})
+
+    with tracing.span("test") as current_span:
+        assert current_span is None
+
+
+def test_propagate_without_opentelemetry(monkeypatch):
+    """Test that functions are returned unwrapped without OpenTelemetry."""
+    monkeypatch.setattr(tracing, "otel_context", None)
+
+    def function():
+        return 1
+
+    assert tracing.propagate(function) is function
+
+
+@patch("requests.get")
+def test_episode_by_id_spans(mock_get, tracer):
+    """Test that a call creates a parent span with request and model children."""
+    mock_get.return_value = api_response(episode_data(5, number=1), size=10)
+
+    _client().episode_by_id(5)
+
+    names = [name for name, _, _ in tracer.spans]
+    assert names == ["libtvdb.episode_by_id", "libtvdb.get_page", "libtvdb.deserialize"]
+    assert tracer.spans[0][1] == {"tvdb.episode_id": 5}
+    assert tracer.spans[1][1]["libtvdb.page"] == 0
+    tracer.spans[1][2].set_attribute.assert_any_call("libtvdb.payload_size", 10)
+
+
+@patch("requests.post")
+def test_authenticate_span(mock_post, tracer):
+    """Test that logging in is traced, but an existing session is not."""
+    response = Mock(status_code=200)
+    response.json.return_value = {"data": {"token": "token"}}
+    mock_post.return_value = response
+    client = TVDBClient(api_key="test_key")
+
+    client.authenticate()
+    client.authenticate()
+
+    assert [name for name, _, _ in tracer.spans] == ["libtvdb.authenticate"]
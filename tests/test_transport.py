@@ -0,0 +1,119 @@
+"""Tests for the HTTP transports."""
+
+import pytest
+import requests
+
+from benchmarks.mock_server import Faults, MockTVDBServer
+from libtvdb import TVDBClient
+from libtvdb.exceptions import NotFoundException, TVDBAuthenticationException, TVDBException
+from libtvdb.transport import (
+    FakeTransport,
+    RequestsTransport,
+    TransportResponse,
+    Urllib3Transport,
+)
+from tests.context import episode_data
+
+
+def test_transport_response():
+    """Test the in-memory response."""
+    response = TransportResponse(200, b'{"data": 1}', headers={"A": "b"}, url="https://x")
+
+    assert response.json() == {"data": 1}
+    assert response.text == '{"data": 1}'
+    assert response.headers == {"A": "b"}
+
+
+def test_fake_transport_serves_registered_responses():
+    """Test that a client can run entirely against the fake transport."""
+    transport = FakeTransport()
+    transport.add("GET", "episodes/5/extended", json_body={"data": episode_data(5, number=1)})
+    client = TVDBClient(api_key="test_key", transport=transport)
+
+    episode = client.episode_by_id(5)
+
+    assert episode.identifier == 5
+    assert [(method, url) for method, url, _, _ in transport.requests] == [
+        ("POST", "https://api4.thetvdb.com/v4/login"),
+        ("GET", "https://api4.thetvdb.com/v4/episodes/5/extended"),
+    ]
+    assert transport.requests[0][3] == {"apikey": "test_key"}
+    assert transport.requests[1][2]["Authorization"] == "Bearer fake-token"
+
+    with pytest.raises(NotFoundException):
+        client.episode_by_id(6)
+
+
+def test_fake_transport_sequences_and_handlers():
+    """Test repeated responses and response functions."""
+    transport = FakeTransport()
+    transport.add("GET", "series/1", status_code=500, json_body={"Error": "Internal"})
+    transport.add("GET", "series/1", json_body={"data": {}})
+    transport.add("POST", "login", lambda method, url, body: TransportResponse(401, b"{}"))
+    client = TVDBClient(api_key="test_key", transport=transport)
+
+    with pytest.raises(TVDBAuthenticationException):
+        client.authenticate()
+
+    client.auth_token = "token"
+
+    with pytest.raises(TVDBException):
+        client.get("series/1", timeout=1)
+
+    assert client.get("series/1", timeout=1) == {}
+    assert client.get("series/1", timeout=1) == {}
+
+
+def test_auth_retries_on_transport_timeouts():
+    """Test that a TimeoutError from any transport is retried."""
+    transport = FakeTransport()
+    attempts = []
+
+    def login(_method, _url, body):
+        attempts.append(body)
+        if len(attempts) == 1:
+            raise TimeoutError("timed out")
+        return TransportResponse(200, b'{"data": {"token": "t"}}')
+
+    transport.add("POST", "login", login)
+    client = TVDBClient(api_key="test_key", transport=transport)
+
+    client.authenticate()
+
+    assert client.auth_token == "t"
+    assert len(attempts) == 2
+
+
+@pytest.mark.parametrize(
+    "make_transport",
+    [
+        RequestsTransport,
+        lambda: RequestsTransport(requests.Session()),
+        Urllib3Transport,
+    ],
+    ids=["requests", "requests-session", "urllib3"],
+)
+def test_http_transports_against_mock_server(make_transport):
+    """Test that each HTTP transport works with the client end to end."""
+    transport = make_transport()
+
+    with MockTVDBServer(missing_ids={404}) as server:
+        client = TVDBClient(api_key="test_key", base_url=server.base_url, transport=transport)
+
+        assert len(client.episodes_from_show_id(1, max_workers=2)) == 288
+
+        with pytest.raises(NotFoundException):
+            client.episode_by_id(404)
+
+    transport.close()
+
+
+def test_urllib3_timeout_is_translated():
+    """Test that urllib3 timeouts become TimeoutError."""
+    with MockTVDBServer(faults=Faults(latency=0.5)) as server:
+        transport = Urllib3Transport()
+
+        with pytest.raises(TimeoutError):
+            transport.send("GET", f"{server.base_url}/search", headers={}, timeout=0.05)
+
+        transport.close()
@@ -34,3 +34,35 @@ def test_parse_date():
     for date_string in invalid_test_cases:
         with pytest.raises(ValueError):
             _ = utilities.parse_date(date_string)
+
+
+def test_parse_date_non_canonical():
+    """Test that dates outside the canonical form parse as they always have."""
+    assert utilities.parse_date("2020-1-5") == datetime.date(2020, 1, 5)
+    assert utilities.parse_date("+020-01-05") == datetime.date(20, 1, 5)
+
+    with pytest.raises(ValueError, match="each date component is an integer"):
+        utilities.parse_date("2020-01-0x")
+
+
+def test_parse_datetime_matches_strptime():
+    """Test that the fast datetime path agrees with strptime."""
+    test_cases = [
+        "2020-01-05 10:20:30",
+        "1999-12-31 23:59:59",
+        "2020-1-5 1:2:3",
+    ]
+
+    for datetime_string in test_cases:
+        assert utilities.parse_datetime(datetime_string) == datetime.datetime.strptime(
+            datetime_string, utilities.DATETIME_FORMAT_STRING
+        )
+
+    for datetime_string in ["2020-01-05T10:20:30", "2020-01-05 10:20:3x", "2020-02-30 00:00:00"]:
+        with pytest.raises(ValueError):
+            _ = utilities.parse_datetime(datetime_string)
+
+
+def test_parse_date_returns_cached_value():
+    """Test that repeated dates reuse the same parsed value."""
+    assert utilities.parse_date("2021-06-01") is utilities.parse_date("2021-06-01")